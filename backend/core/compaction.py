@@ -0,0 +1,199 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from core.config import get_int_env
+
+# Separates pages in extracted PDF text so repeated headers and footers can
+# be recognised; compact_text removes it.
+PAGE_BREAK = "\f"
+
+_WHITESPACE = re.compile(r"[ \t\u00a0\u3000]+")
+_TRAILING_PAGE_NUMBER = re.compile(r"\s*(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+_PAGE_NUMBER = re.compile(
+    r"^(?:-\s*)?(?:page\s*|p\.\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?(?:\s*-)?(?:\s*페이지|\s*쪽)?$",
+    re.IGNORECASE,
+)
+# Header/footer candidates are short lines within this many lines of a
+# page's top or bottom; longer repeated lines are content.
+_BOILERPLATE_MAX_CHARS = 80
+_PAGE_EDGE_LINES = 2
+# Identical lines at least this long are duplicates (e.g. a sidebar
+# extracted once per column) wherever they appear.
+_DUPLICATE_MIN_CHARS = 40
+
+
+@dataclass
+class CompactText:
+    text: str
+    original_chars: int
+    tokens: int
+    truncated: bool = False
+
+    @property
+    def ratio(self) -> float:
+        """Compacted size as a fraction of the original."""
+        return len(self.text) / self.original_chars if self.original_chars else 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: about four characters per token
+    for ASCII text, and about 1.5 for other scripts such as Hangul.
+    """
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def _line_key(line: str) -> str:
+    return _TRAILING_PAGE_NUMBER.sub("", line.lower())
+
+
+def _boilerplate_keys(pages: List[List[str]]) -> set:
+    """
+    Short lines at the top or bottom of at least half of the pages (a
+    trailing page number ignored), i.e. running headers and footers.
+    """
+    if len(pages) < 2:
+        return set()
+    counts: Dict[str, int] = {}
+    for lines in pages:
+        lines = [l for l in lines if l]
+        edges = lines[:_PAGE_EDGE_LINES] + lines[-_PAGE_EDGE_LINES:]
+        for key in {_line_key(l) for l in edges if len(l) <= _BOILERPLATE_MAX_CHARS}:
+            if key:  # bare numbers are page numbers or content, never a header
+                counts[key] = counts.get(key, 0) + 1
+    needed = max(2, math.ceil(len(pages) / 2))
+    return {key for key, count in counts.items() if count >= needed}
+
+
+def compact_text(raw_text: str) -> CompactText:
+    """
+    Removes what costs tokens without informing extraction: whitespace
+    runs, blank-line runs, page numbers on a page's first or last line,
+    running headers/footers (kept once) and duplicated lines. Page breaks
+    are dropped.
+    """
+    raw_text = raw_text or ""
+    pages = [
+        [_WHITESPACE.sub(" ", line).strip() for line in page.splitlines()]
+        for page in raw_text.split(PAGE_BREAK)
+    ]
+    boilerplate = _boilerplate_keys(pages)
+
+    out: List[str] = []
+    seen_boilerplate = set()
+    seen_long = set()
+    for lines in pages:
+        filled = [i for i, line in enumerate(lines) if line]
+        edges = {filled[0], filled[-1]} if filled else set()
+        for i, line in enumerate(lines):
+            if not line:
+                if out and out[-1]:
+                    out.append("")
+                continue
+            # A bare number inside a page is content (a score, a count).
+            if i in edges and _PAGE_NUMBER.match(line):
+                continue
+            key = _line_key(line)
+            if key in boilerplate:
+                if key in seen_boilerplate:
+                    continue
+                seen_boilerplate.add(key)
+            if len(line) >= _DUPLICATE_MIN_CHARS:
+                if line in seen_long:
+                    continue
+                seen_long.add(line)
+            if out and out[-1] == line:
+                continue
+            out.append(line)
+
+    text = "\n".join(out).strip()
+    return CompactText(text, len(raw_text), estimate_tokens(text))
+
+
+def _cut_to_tokens(line: str, max_tokens: int) -> str:
+    """The longest prefix of line whose estimated token count fits max_tokens."""
+    budget = float(max_tokens)
+    for i, c in enumerate(line):
+        budget -= 0.25 if c.isascii() else 1 / 1.5
+        if budget < 0:
+            return line[:i]
+    return line
+
+
+def fit_to_budget(compact: CompactText, max_tokens: int) -> CompactText:
+    """
+    Truncates so the text fits max_tokens; resumes and postings lead with
+    what extraction needs most. Cuts at a line boundary, or inside the first
+    line that does not fit when nothing would be kept otherwise (e.g. text
+    without line breaks). 0 means no budget.
+    """
+    if max_tokens <= 0 or compact.tokens <= max_tokens:
+        return compact
+    kept: List[str] = []
+    tokens = 0
+    for line in compact.text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if tokens + cost > max_tokens:
+            if not "".join(kept).strip():
+                kept.append(_cut_to_tokens(line, max_tokens - tokens))
+            break
+        kept.append(line)
+        tokens += cost
+    text = "\n".join(kept).strip()
+    return CompactText(text, compact.original_chars, estimate_tokens(text), truncated=True)
+
+
+class CompactionStats:
+    """Running totals of what compaction saved on prompt inputs."""
+
+    def __init__(self):
+        self.documents = 0
+        self.original_chars = 0
+        self.compact_chars = 0
+        self.tokens = 0
+        self.truncated = 0
+
+    def record(self, compact: CompactText):
+        self.documents += 1
+        self.original_chars += compact.original_chars
+        self.compact_chars += len(compact.text)
+        self.tokens += compact.tokens
+        self.truncated += int(compact.truncated)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "original_chars": self.original_chars,
+            "compact_chars": self.compact_chars,
+            "estimated_tokens": self.tokens,
+            "ratio": round(self.compact_chars / self.original_chars, 4) if self.original_chars else None,
+            "truncated": self.truncated,
+        }
+
+
+_stats: Optional[CompactionStats] = None
+
+
+def get_compaction_stats() -> CompactionStats:
+    global _stats
+    if _stats is None:
+        _stats = CompactionStats()
+    return _stats
+
+
+def _reset_compaction_stats():
+    global _stats
+    _stats = None
+
+
+def prepare_prompt_text(raw_text: str) -> CompactText:
+    """
+    Compacts a document and fits it to LLM_INPUT_TOKEN_BUDGET (estimated
+    tokens, default 8000; 0 disables) before it goes into a prompt. A
+    document can go into several prompts (batch, fallback, repair), so
+    recording it in the stats is left to the caller, once per document.
+    """
+    return fit_to_budget(compact_text(raw_text), get_int_env("LLM_INPUT_TOKEN_BUDGET", 8000))
@@ -0,0 +1,23 @@
+import os
+
+
+def get_int_env(name: str, default: int) -> int:
+    """The integer value of env var name, or default when unset or malformed."""
+    val = os.getenv(name)
+    if not val:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
+def get_float_env(name: str, default: float) -> float:
+    """The float value of env var name, or default when unset or malformed."""
+    val = os.getenv(name)
+    if not val:
+        return default
+    try:
+        return float(val)
+    except ValueError:
+        return default
@@ -1,25 +1,77 @@
 import os
-from supabase import create_client, Client
+from typing import Optional
+
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, acreate_client, create_client
 from dotenv import load_dotenv
 
+from core.config import get_int_env
+
 load_dotenv()
 
 _supabase: Client = None
+_async_supabase: Optional[AsyncClient] = None
+_async_http: Optional[httpx.AsyncClient] = None
+
+def _get_config():
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_KEY")
+
+    if not url or not key:
+        raise RuntimeError("Supabase configuration missing (SUPABASE_URL or SUPABASE_SERVICE_KEY)")
+    return url, key
 
 def get_supabase_client() -> Client:
     global _supabase
     if _supabase is not None:
         return _supabase
     
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_KEY")
-    
-    if not url or not key:
-        raise RuntimeError("Supabase configuration missing (SUPABASE_URL or SUPABASE_SERVICE_KEY)")
-        
+    url, key = _get_config()
     _supabase = create_client(url, key)
     return _supabase
 
 def _reset_supabase_client():
     global _supabase
     _supabase = None
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def build_http_client() -> httpx.AsyncClient:
+    """
+    One pooled HTTP client shared by PostgREST and Storage calls, so requests
+    reuse keep-alive connections (multiplexed over HTTP/2 when h2 is
+    installed) instead of each opening its own.
+    """
+    return httpx.AsyncClient(
+        http2=os.getenv("SUPABASE_HTTP2", "1") != "0" and _http2_available(),
+        limits=httpx.Limits(
+            max_connections=get_int_env("SUPABASE_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=get_int_env("SUPABASE_MAX_KEEPALIVE", 10),
+            keepalive_expiry=float(get_int_env("SUPABASE_KEEPALIVE_SECONDS", 30)),
+        ),
+        timeout=httpx.Timeout(float(get_int_env("SUPABASE_TIMEOUT_SECONDS", 30))),
+        follow_redirects=True,
+    )
+
+async def get_async_supabase_client() -> AsyncClient:
+    global _async_supabase, _async_http
+    if _async_supabase is not None:
+        return _async_supabase
+
+    url, key = _get_config()
+    _async_http = build_http_client()
+    _async_supabase = await acreate_client(
+        url, key, options=AsyncClientOptions(httpx_client=_async_http)
+    )
+    return _async_supabase
+
+async def close_async_supabase_client():
+    global _async_supabase, _async_http
+    http, _async_http, _async_supabase = _async_http, None, None
+    if http is not None:
+        await http.aclose()
@@ -0,0 +1,12 @@
+class FitGapException(Exception):
+    """
+    An error returned to the client as {"success": false, "error": {code, message}}
+    with the given HTTP status. Lives here so core modules can raise it
+    without importing main.
+    """
+
+    def __init__(self, code: str, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
@@ -1,5 +1,9 @@
+import logging
 import os
-from typing import Dict, Any
+import re
+import threading
+import time
+from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 
 import jwt
@@ -12,6 +16,116 @@ GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
 
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _parse_max_age(cache_control: Optional[str], default: int) -> int:
+    match = _MAX_AGE_RE.search(cache_control or "")
+    return int(match.group(1)) if match else default
+
+
+class JwksCache:
+    """
+    In-memory JWKS key set indexed by kid, holding parsed public keys.
+    Keys live for the Cache-Control max-age of the JWKS response. Inside the
+    last refresh_margin seconds a background thread refetches them, and an
+    unknown kid triggers one deduplicated refetch (at most once per
+    min_refetch_interval) to pick up rotated keys.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_max_age: int = 3600,
+        refresh_margin: int = 300,
+        min_refetch_interval: int = 30,
+    ):
+        self.url = url
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self.min_refetch_interval = min_refetch_interval
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._fetched_at = 0.0
+        self._fetch_lock = threading.Lock()
+        self._background_running = False
+
+    def _fetch(self):
+        res = requests.get(self.url, timeout=10)
+        res.raise_for_status()
+        keys = {}
+        for jwk in res.json().get("keys", []):
+            kid = jwk.get("kid")
+            if kid:
+                keys[kid] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        max_age = _parse_max_age(res.headers.get("Cache-Control"), self.default_max_age)
+        now = time.monotonic()
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + max_age
+        self._refresh_at = now + max(max_age - self.refresh_margin, max_age / 2)
+
+    def _refresh(self, needed) -> None:
+        # Only one thread fetches; the others wait and then re-check, so a
+        # burst of logins with a new kid produces a single request.
+        with self._fetch_lock:
+            if not needed():
+                return
+            try:
+                self._fetch()
+            except Exception:
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh failed; serving cached keys", exc_info=True)
+                retry_at = time.monotonic() + self.min_refetch_interval
+                self._expires_at = max(self._expires_at, retry_at)
+                self._refresh_at = max(self._refresh_at, retry_at)
+                self._fetched_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        if self._background_running:
+            return
+        self._background_running = True
+
+        def run():
+            try:
+                self._refresh(lambda: time.monotonic() >= self._refresh_at)
+            except Exception:
+                logger.warning("Background JWKS refresh failed", exc_info=True)
+            finally:
+                self._background_running = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def get_key(self, kid: str):
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._refresh(lambda: time.monotonic() >= self._expires_at)
+        elif now >= self._refresh_at:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._refresh(
+                lambda: kid not in self._keys
+                and time.monotonic() - self._fetched_at >= self.min_refetch_interval
+            )
+            key = self._keys.get(kid)
+        return key
+
+    def clear(self):
+        with self._fetch_lock:
+            self._keys = {}
+            self._expires_at = 0.0
+            self._refresh_at = 0.0
+            self._fetched_at = 0.0
+
+
+_jwks_cache = JwksCache(GOOGLE_JWKS_URL)
+
 
 def build_google_auth_url(state: str) -> str:
     client_id = os.getenv("GOOGLE_CLIENT_ID")
@@ -61,16 +175,10 @@ def verify_google_id_token(id_token: str) -> Dict[str, Any]:
     if not kid:
         raise ValueError("No kid in token header")
 
-    jwks = requests.get(GOOGLE_JWKS_URL, timeout=10).json()
-    key = None
-    for jwk in jwks.get("keys", []):
-        if jwk.get("kid") == kid:
-            key = jwk
-            break
-    if not key:
+    public_key = _jwks_cache.get_key(kid)
+    if public_key is None:
         raise ValueError("No matching JWK")
 
-    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key)
     payload = jwt.decode(
         id_token,
         public_key,
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.config import get_float_env, get_int_env
+from core.errors import FitGapException
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+FailureHandler = Callable[[Dict[str, Any], Exception], Awaitable[None]]
+ErrorCode = Callable[[Exception], str]
+
+
+def error_code(error: Exception) -> str:
+    """
+    What a failed job reports to its owner: a FitGapException's code, else
+    JOB_FAILED. Exception text can carry internals, so it only goes to the log.
+    """
+    if isinstance(error, FitGapException):
+        return error.code
+    return "JOB_FAILED"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    owner: Optional[str]
+    payload: Dict[str, Any]
+    status: str = "queued"
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    version: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class LocalJobQueue:
+    """
+    In-process job queue: an asyncio.Queue drained by a fixed pool of worker
+    tasks, with per-job retries and exponential backoff with jitter.
+    A kind registered with retry_if retries only the errors it accepts, and
+    its on_failure hook runs once when a job of that kind finally fails.
+    A job's error is the code error_code (or the kind's own) gives, never
+    the exception text.
+    Job state lives in memory and is pruned retention_seconds after a job
+    finishes, so a restart loses queued work; callers that need durability
+    should put a broker-backed queue behind the same submit/get interface.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_attempts: int = 3,
+        backoff_seconds: float = 1.0,
+        retention_seconds: float = 3600.0,
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.retention_seconds = retention_seconds
+        self._handlers: Dict[str, JobHandler] = {}
+        self._retry_if: Dict[str, Callable[[Exception], bool]] = {}
+        self._on_failure: Dict[str, FailureHandler] = {}
+        self._error_codes: Dict[str, ErrorCode] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._changed: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(
+        self,
+        kind: str,
+        handler: JobHandler,
+        retry_if: Optional[Callable[[Exception], bool]] = None,
+        on_failure: Optional[FailureHandler] = None,
+        error_code: Optional[ErrorCode] = None,
+    ):
+        self._handlers[kind] = handler
+        self._retry_if.pop(kind, None)
+        self._on_failure.pop(kind, None)
+        self._error_codes.pop(kind, None)
+        if retry_if is not None:
+            self._retry_if[kind] = retry_if
+        if on_failure is not None:
+            self._on_failure[kind] = on_failure
+        if error_code is not None:
+            self._error_codes[kind] = error_code
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def start(self):
+        """
+        Starts the workers on the running event loop. Safe to call repeatedly;
+        workers left on a loop that has since gone away are replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        for job in self._jobs.values():
+            if job.status == "queued":
+                self._queue.put_nowait(job.id)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _notify(self, job: Job, **changes):
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.updated_at = time.time()
+        job.version += 1
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def submit(self, kind: str, payload: Dict[str, Any], owner: Optional[str] = None) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        self.start()
+        self._prune()
+        job = Job(id=str(uuid.uuid4()), kind=kind, owner=owner, payload=payload)
+        self._jobs[job.id] = job
+        await self._queue.put(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait_for_change(self, job: Job, seen_version: int, timeout: float) -> bool:
+        """
+        Waits until the job's version moves past seen_version. Returns False
+        on timeout, which SSE callers use to send keep-alives.
+        """
+        if job.version != seen_version:
+            return True
+        self.start()
+        try:
+            async with self._changed:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: job.version != seen_version), timeout
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _backoff(self, attempt: int) -> float:
+        base = self.backoff_seconds * (2 ** (attempt - 1))
+        return base + random.uniform(0, base / 2)
+
+    def _should_retry(self, job: Job, error: Exception) -> bool:
+        if job.attempts >= self.max_attempts:
+            return False
+        retry_if = self._retry_if.get(job.kind)
+        return retry_if is None or retry_if(error)
+
+    def _error_for(self, job: Job, error: Exception) -> str:
+        return self._error_codes.get(job.kind, error_code)(error)
+
+    async def _fail(self, job: Job, error: Exception):
+        on_failure = self._on_failure.get(job.kind)
+        if on_failure is not None:
+            try:
+                await on_failure(job.payload, error)
+            except Exception:
+                logger.warning("job %s failure handler failed", job.id, exc_info=True)
+        await self._notify(job, status="failed", error=self._error_for(job, error))
+
+    async def _run(self, job: Job):
+        handler = self._handlers[job.kind]
+        while True:
+            await self._notify(job, status="running", attempts=job.attempts + 1)
+            try:
+                result = await handler(job.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("job %s attempt %d failed", job.id, job.attempts, exc_info=True)
+                if not self._should_retry(job, e):
+                    await self._fail(job, e)
+                    return
+                await self._notify(job, status="retrying", error=self._error_for(job, e))
+                await asyncio.sleep(self._backoff(job.attempts))
+                continue
+            await self._notify(job, status="succeeded", result=result, error=None)
+            return
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.updated_at < cutoff]:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": counts,
+        }
+
+
+_job_queue: Optional[LocalJobQueue] = None
+
+
+def get_job_queue() -> LocalJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = LocalJobQueue(
+            workers=get_int_env("JOB_WORKERS", 2),
+            max_attempts=get_int_env("JOB_MAX_ATTEMPTS", 3),
+            backoff_seconds=get_float_env("JOB_BACKOFF_SECONDS", 1.0),
+        )
+    return _job_queue
+
+
+def _reset_job_queue():
+    global _job_queue
+    _job_queue = None
@@ -0,0 +1,80 @@
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Scans a JSON object as it streams in and returns each element of the
+    chosen top-level array fields as soon as the element closes, e.g.
+    {"skills": [{...}, <- emitted here {...}, ...]}. Only bracket depth and
+    string state are tracked, so each character is looked at once; the
+    complete text is kept for the authoritative json.loads at the end.
+    Anything before the opening brace (such as a ```json fence) is skipped.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = set(fields)
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array_field: Optional[str] = None
+        self._item_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Adds a chunk and returns the (field, item) pairs it completed.
+        """
+        items: List[Tuple[str, Any]] = []
+        offset = len(self._text)
+        self._text += chunk
+        text = self._text
+        for i in range(offset, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = json.loads(text[self._string_start:i + 1])
+                    elif self._item_start == self._string_start:
+                        items.append(self._emit(i))
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._start_item(i)
+            elif c in "{[":
+                self._start_item(i)
+                self._depth += 1
+                if c == "[" and self._depth == 2 and self._key in self.fields:
+                    self._array_field = self._key
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._item_start is not None:
+                    items.append(self._emit(i))
+                elif self._depth == 1:
+                    self._array_field = None
+            elif c == ":" and self._depth == 1:
+                self._key = self._last_key
+        return items
+
+    def _start_item(self, i: int):
+        if self._depth == 2 and self._array_field and self._item_start is None:
+            self._item_start = i
+
+    def _emit(self, end: int) -> Tuple[str, Any]:
+        item = json.loads(self._text[self._item_start:end + 1])
+        self._item_start = None
+        return self._array_field, item
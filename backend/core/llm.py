@@ -1,98 +1,617 @@
+import asyncio
 import json
-import os
-from typing import Dict, Any
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional, Type
 from models.resume import ResumeParsedData
 from models.posting import PostingParsedData
-from google import genai
+from core.config import get_float_env, get_int_env
+from core.parse_cache import ParseCache, get_parse_cache, make_cache_key
+from core.json_stream import IncrementalJSONParser
+from core.compaction import CompactText, get_compaction_stats, prepare_prompt_text
+from core.validation import InvalidFieldsError, load_json, merge_repair, parse_document, validate_document
+from core.errors import FitGapException
+from core.resilience import AdaptiveLimiter, CircuitBreaker, TokenBucket, backoff_delay
+from core.llm_backends import LLM_MODEL, LLMBackend, create_backend, get_gemini_client
+from google.genai import errors as genai_errors
+import httpx
+from pydantic import BaseModel
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Initialize Gemini Client
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+
+def __getattr__(name: str):
+    # core.llm.client predates the backends; it is now created on first access.
+    if name == "client":
+        return get_gemini_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Bump when a prompt template changes so cached parses from the old prompt
+# are no longer served.
+RESUME_PROMPT_VERSION = "resume-v2"
+POSTING_PROMPT_VERSION = "posting-v3"
+
+
+class LLMTimeoutError(RuntimeError):
+    """Raised when a model call does not finish within LLM_TIMEOUT_SECONDS."""
+
+
+class LLMUnavailableError(FitGapException):
+    """
+    Raised without calling the model when the circuit breaker is open or no
+    concurrency slot / rate token frees up within LLM_QUEUE_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, message: str):
+        super().__init__("LLM_UNAVAILABLE", message, 503)
+
+
+class _Resilience:
+    """
+    Guards every model call: a circuit breaker to fail fast while Gemini is
+    down, a token bucket for the request quota, an adaptive concurrency
+    limit, and jittered retries of overload errors.
+    """
+
+    def __init__(self):
+        self.limiter = AdaptiveLimiter(
+            max_limit=get_int_env("LLM_MAX_CONCURRENCY", 8),
+            min_limit=get_int_env("LLM_MIN_CONCURRENCY", 1),
+            latency_target=get_float_env("LLM_LATENCY_TARGET_SECONDS", 20.0),
+        )
+        rate_per_minute = get_float_env("LLM_RATE_PER_MINUTE", 0.0)
+        self.bucket = TokenBucket(
+            rate=rate_per_minute / 60,
+            capacity=get_float_env("LLM_RATE_BURST", max(1.0, rate_per_minute / 6)),
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=get_int_env("LLM_BREAKER_FAILURES", 5),
+            reset_seconds=get_float_env("LLM_BREAKER_RESET_SECONDS", 30.0),
+        )
+        self.queue_timeout = get_float_env("LLM_QUEUE_TIMEOUT_SECONDS", 10.0)
+        self.max_retries = get_int_env("LLM_MAX_RETRIES", 2)
+        self.retry_base = get_float_env("LLM_RETRY_BASE_SECONDS", 0.5)
+
+    async def admit(self, deadline: float):
+        """
+        Waits for a rate token and a concurrency slot, then claims the call
+        with the breaker. On return the caller holds a slot and must call
+        finish().
+        """
+        if self.breaker.is_open():
+            raise LLMUnavailableError("LLM is temporarily unavailable; retry later")
+        loop = asyncio.get_running_loop()
+
+        def wait_budget() -> float:
+            left = deadline - loop.time()
+            if left <= 0:
+                raise LLMTimeoutError("LLM call timed out waiting for capacity")
+            return min(self.queue_timeout, left)
+
+        if not await self.bucket.acquire(wait_budget()):
+            raise LLMUnavailableError("LLM request rate limit reached; retry later")
+        if not await self.limiter.acquire(wait_budget()):
+            raise LLMUnavailableError("LLM is overloaded; retry later")
+        if not self.breaker.allow():
+            self.limiter.release()
+            raise LLMUnavailableError("LLM is temporarily unavailable; retry later")
+
+    def finish(self, latency: float, error: Optional[BaseException] = None):
+        self.limiter.release()
+        if error is None:
+            self.limiter.on_success(latency)
+            self.breaker.record_success()
+        elif _is_overload(error):
+            self.limiter.on_overload()
+            self.breaker.record_failure()
+        elif isinstance(error, asyncio.CancelledError):
+            self.breaker.abandon()
+        else:
+            # The model answered (e.g. a 400), so the service itself is up.
+            self.breaker.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.limiter.stats(),
+            "rate_limit": self.bucket.stats(),
+            "circuit": self.breaker.stats(),
+            "max_retries": self.max_retries,
+            "queue_timeout_seconds": self.queue_timeout,
+        }
+
+
+def _is_overload(error: BaseException) -> bool:
+    """Errors that mean Gemini is overloaded or unreachable, which are retried."""
+    if isinstance(error, (LLMTimeoutError, asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(error, genai_errors.APIError):
+        return error.code == 429 or error.code >= 500
+    return False
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Errors a later attempt may get past: overload, timeouts, transport
+    failures and the circuit breaker or queue turning a call away.
+    """
+    return _is_overload(error) or isinstance(error, LLMUnavailableError)
+
+
+def parse_error_code(error: BaseException) -> str:
+    """
+    The code stored when a background parse fails: what went wrong, without
+    the exception text (which can echo prompts or upstream responses).
+    """
+    if isinstance(error, (LLMTimeoutError, asyncio.TimeoutError)):
+        return "ANALYSIS_TIMEOUT"
+    if isinstance(error, FitGapException):
+        return error.code
+    if _is_overload(error):
+        return "LLM_UNAVAILABLE"
+    return "PARSE_FAILED"
+
+
+_backend: Optional[LLMBackend] = None
+
+
+def get_llm_backend() -> LLMBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+def _reset_llm_backend():
+    global _backend, _offline_cache
+    _backend = None
+    _offline_cache = None
+
+
+_offline_cache: Optional[ParseCache] = None
+
+
+def _backend_cache() -> ParseCache:
+    """
+    The parse cache for the current backend. Only Gemini results are real
+    parses, so other backends never use the shared tier; the synthetic
+    backend caches nothing, so a benchmark measures the pipeline rather
+    than cache hits.
+    """
+    global _offline_cache
+    backend = get_llm_backend()
+    if backend.name == "gemini":
+        return get_parse_cache()
+    if _offline_cache is None:
+        base = get_parse_cache()
+        _offline_cache = ParseCache(
+            max_entries=0 if backend.name == "synthetic" else base.max_entries,
+            max_bytes=base.max_bytes,
+            shared=False,
+        )
+    return _offline_cache
+
+
+def _cache_key(kind: str, raw_text: str, prompt_version: str) -> str:
+    backend = get_llm_backend().name
+    model = LLM_MODEL if backend == "gemini" else f"{LLM_MODEL}+{backend}"
+    return make_cache_key(kind, raw_text, prompt_version, model)
+
+
+_resilience: Optional[_Resilience] = None
+
+
+def _get_resilience() -> _Resilience:
+    global _resilience
+    if _resilience is None:
+        _resilience = _Resilience()
+    return _resilience
+
+
+def _reset_llm_limits():
+    global _resilience
+    _resilience = None
+
+
+def llm_stats() -> Dict[str, Any]:
+    return {
+        "model": LLM_MODEL,
+        "backend": get_llm_backend().stats(),
+        **_get_resilience().stats(),
+        "compaction": get_compaction_stats().stats(),
+    }
+
+
+async def generate_json(prompt: str) -> str:
+    """
+    Runs one JSON-mode generation on the configured backend (LLM_BACKEND,
+    see core.llm_backends), behind the resilience guards. Overload errors
+    (429, 5xx, transport errors) are retried up to LLM_MAX_RETRIES times
+    with jittered backoff; everything, including waits for a slot and
+    retries, is bounded by LLM_TIMEOUT_SECONDS. Cancelling the caller
+    cancels the in-flight HTTP request.
+    """
+    timeout = get_float_env("LLM_TIMEOUT_SECONDS", 60.0)
+    guard = _get_resilience()
+    backend = get_llm_backend()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    attempt = 0
+    while True:
+        attempt += 1
+        await guard.admit(deadline)
+        started = loop.time()
+        try:
+            text = await asyncio.wait_for(backend.generate(prompt), timeout=max(0.0, deadline - started))
+        except BaseException as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = LLMTimeoutError(f"LLM call timed out after {timeout:g}s")
+            guard.finish(loop.time() - started, e)
+            if not _is_overload(e) or isinstance(e, LLMTimeoutError) or attempt > guard.max_retries:
+                raise e
+            delay = backoff_delay(attempt, guard.retry_base, cap=10.0)
+            if loop.time() + delay >= deadline:
+                raise e
+            await asyncio.sleep(delay)
+            continue
+        guard.finish(loop.time() - started)
+        return text
+
+async def stream_json(prompt: str) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of generate_json: yields text chunks as the model
+    produces them. Holds a concurrency slot for the whole stream, and
+    LLM_TIMEOUT_SECONDS bounds the stream as a whole. Streams are not
+    retried, since chunks may already have been delivered.
+    """
+    timeout = get_float_env("LLM_TIMEOUT_SECONDS", 60.0)
+    guard = _get_resilience()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    def remaining() -> float:
+        left = deadline - loop.time()
+        if left <= 0:
+            raise LLMTimeoutError(f"LLM call timed out after {timeout:g}s")
+        return left
+
+    await guard.admit(deadline)
+    started = loop.time()
+    error: Optional[BaseException] = None
+    chunks = get_llm_backend().stream(prompt)
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError(f"LLM call timed out after {timeout:g}s")
+            if chunk:
+                yield chunk
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        # Latency here is time to the whole stream, so only errors adjust limits.
+        if error is None:
+            guard.limiter.release()
+            guard.breaker.record_success()
+        elif isinstance(error, GeneratorExit):
+            guard.limiter.release()
+            guard.breaker.abandon()
+        else:
+            guard.finish(loop.time() - started, error)
+        await chunks.aclose()
+
+def _record_compaction(raw_text: str) -> CompactText:
+    """
+    Compacts a document for its prompt and counts it in the compaction stats;
+    call once per parsed document and pass the result to the prompt builder.
+    """
+    compact = prepare_prompt_text(raw_text)
+    get_compaction_stats().record(compact)
+    return compact
+
+# --- Response Repair ---
+
+def generate_repair_prompt(document_type: str, schema: str, raw_text: str, fields: List[str]) -> str:
+    field_schema = json.loads(schema)
+    subset = json.dumps({name: field_schema[name] for name in fields}, ensure_ascii=False)
+    return f"""
+    Extract only the fields below from the following {document_type} text.
+    Return ONLY a valid JSON object with exactly these keys, matching the schema below.
+    
+    Schema:
+    {subset}
+    
+    Text:
+    {prepare_prompt_text(raw_text).text}
+    """
+
+async def _repair(
+    document_type: str, schema: str, raw_text: str, error: InvalidFieldsError
+) -> BaseModel:
+    """
+    Asks the model again for only the fields that failed validation, so a
+    mostly valid answer is kept. One follow-up call; if it still does not
+    validate the error propagates.
+    """
+    logger.info("Repairing %s fields via follow-up call: %s", document_type, error.fields)
+    response_text = await generate_json(generate_repair_prompt(document_type, schema, raw_text, error.fields))
+    return merge_repair(error, response_text)
+
+async def _validated(
+    parse: Callable[[str], BaseModel], document_type: str, schema: str, raw_text: str, response_text: str
+) -> BaseModel:
+    try:
+        return parse(response_text)
+    except InvalidFieldsError as e:
+        return await _repair(document_type, schema, raw_text, e)
 
 # --- Resume Parsing ---
 
-def generate_resume_prompt(raw_text: str) -> str:
+RESUME_SCHEMA = """{
+        "skills": [{ "name": "string", "level": "string", "source": "string" }],
+        "experiences": [{ "title": "string", "duration": "string", "description": "string", "achievements": ["string"] }],
+        "metrics": [{ "value": "string", "context": "string" }],
+        "soft_skills": ["string"],
+        "keywords": ["string"]
+    }"""
+
+def generate_resume_prompt(raw_text: str, compact: Optional[CompactText] = None) -> str:
     return f"""
     Extract structured data from the following resume text. 
     Return ONLY a valid JSON object matching the schema below.
     
     Schema:
-    {{
-        "skills": [{{ "name": "string", "level": "string", "source": "string" }}],
-        "experiences": [{{ "title": "string", "duration": "string", "description": "string", "achievements": ["string"] }}],
-        "metrics": [{{ "value": "string", "context": "string" }}],
-        "soft_skills": ["string"],
-        "keywords": ["string"]
-    }}
+    {RESUME_SCHEMA}
     
     Resume Text:
-    {raw_text}
+    {(compact or prepare_prompt_text(raw_text)).text}
     """
 
 def parse_llm_resume_response(response_text: str) -> ResumeParsedData:
-    clean_text = response_text.strip()
-    if clean_text.startswith("```json"):
-        clean_text = clean_text[7:]
-    if clean_text.endswith("```"):
-        clean_text = clean_text[:-3]
-    
-    data = json.loads(clean_text)
-    return ResumeParsedData(**data)
+    return parse_document(ResumeParsedData, response_text)
 
 async def parse_resume_with_llm(raw_text: str) -> ResumeParsedData:
-    prompt = generate_resume_prompt(raw_text)
-    
-    response = client.models.generate_content(
-        model="gemini-3-flash-preview",
-        contents=prompt,
-        config={
-            "response_mime_type": "application/json",
-        },
+    cache = _backend_cache()
+    key = _cache_key("resume", raw_text, RESUME_PROMPT_VERSION)
+    cached = await cache.get(key)
+    if cached is not None:
+        return ResumeParsedData(**cached)
+
+    prompt = generate_resume_prompt(raw_text, _record_compaction(raw_text))
+    response_text = await generate_json(prompt)
+    parsed = await _validated(parse_llm_resume_response, "resume", RESUME_SCHEMA, raw_text, response_text)
+    await cache.put(
+        key,
+        "resume",
+        parsed.dict(),
+        {"model": LLM_MODEL, "prompt_version": RESUME_PROMPT_VERSION},
     )
-    
-    return parse_llm_resume_response(response.text)
+    return parsed
+
+RESUME_STREAM_FIELDS = ("skills", "experiences", "metrics")
+
+async def stream_resume_with_llm(raw_text: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming parse_resume_with_llm. Yields {"type": "item", "field", "item"}
+    for each skills/experiences/metrics entry as soon as the model closes
+    it, then {"type": "parsed", "parsed": ResumeParsedData}. The final
+    result comes from the full text through parse_llm_resume_response, so
+    it is the same as the non-streaming path; cache hits replay their
+    items at once.
+    """
+    cache = _backend_cache()
+    key = _cache_key("resume", raw_text, RESUME_PROMPT_VERSION)
+    cached = await cache.get(key)
+    if cached is not None:
+        parsed = ResumeParsedData(**cached)
+        data = parsed.dict()
+        for field in RESUME_STREAM_FIELDS:
+            for item in data[field]:
+                yield {"type": "item", "field": field, "item": item}
+        yield {"type": "parsed", "parsed": parsed}
+        return
+
+    prompt = generate_resume_prompt(raw_text, _record_compaction(raw_text))
+    parser = IncrementalJSONParser(RESUME_STREAM_FIELDS)
+    async for text in stream_json(prompt):
+        for field, item in parser.feed(text):
+            yield {"type": "item", "field": field, "item": item}
+
+    parsed = await _validated(parse_llm_resume_response, "resume", RESUME_SCHEMA, raw_text, parser.text)
+    await cache.put(
+        key,
+        "resume",
+        parsed.dict(),
+        {"model": LLM_MODEL, "prompt_version": RESUME_PROMPT_VERSION},
+    )
+    yield {"type": "parsed", "parsed": parsed}
 
 # --- Job Posting Parsing ---
 
-def generate_posting_prompt(raw_text: str) -> str:
+POSTING_SCHEMA = """{
+        "required_skills": [{ "name": "string", "detail": "string", "source": "string" }],
+        "preferred_skills": [{ "name": "string", "detail": "string", "source": "string" }],
+        "responsibilities": ["string"],
+        "required_experience": ["string"],
+        "culture_keywords": ["string"],
+        "job_family": "string (one of: engineering, data, design, product, sales, marketing, operations, other)"
+    }"""
+
+def generate_posting_prompt(raw_text: str, compact: Optional[CompactText] = None) -> str:
     return f"""
     Extract structured data from the following job posting text. 
     Return ONLY a valid JSON object matching the schema below.
     
     Schema:
-    {{
-        "required_skills": [{{ "name": "string", "detail": "string", "source": "string" }}],
-        "preferred_skills": [{{ "name": "string", "detail": "string", "source": "string" }}],
-        "responsibilities": ["string"],
-        "required_experience": ["string"],
-        "culture_keywords": ["string"]
-    }}
+    {POSTING_SCHEMA}
     
     Job Posting Text:
-    {raw_text}
+    {(compact or prepare_prompt_text(raw_text)).text}
     """
 
 def parse_llm_posting_response(response_text: str) -> PostingParsedData:
-    clean_text = response_text.strip()
-    if clean_text.startswith("```json"):
-        clean_text = clean_text[7:]
-    if clean_text.endswith("```"):
-        clean_text = clean_text[:-3]
-    
-    data = json.loads(clean_text)
-    return PostingParsedData(**data)
+    return parse_document(PostingParsedData, response_text)
 
 async def parse_posting_with_llm(raw_text: str) -> PostingParsedData:
-    prompt = generate_posting_prompt(raw_text)
-    
-    response = client.models.generate_content(
-        model="gemini-3-flash-preview",
-        contents=prompt,
-        config={
-            "response_mime_type": "application/json",
-        },
+    cache = _backend_cache()
+    key = _cache_key("posting", raw_text, POSTING_PROMPT_VERSION)
+    cached = await cache.get(key)
+    if cached is not None:
+        return PostingParsedData(**cached)
+
+    prompt = generate_posting_prompt(raw_text, _record_compaction(raw_text))
+    response_text = await generate_json(prompt)
+    parsed = await _validated(
+        parse_llm_posting_response, "job posting", POSTING_SCHEMA, raw_text, response_text
+    )
+    await cache.put(
+        key,
+        "posting",
+        parsed.dict(),
+        {"model": LLM_MODEL, "prompt_version": POSTING_PROMPT_VERSION},
+    )
+    return parsed
+
+# --- Batch Parsing ---
+
+def generate_batch_prompt(
+    document_type: str, schema: str, raw_texts: List[str], compacts: Optional[List[CompactText]] = None
+) -> str:
+    compacts = compacts or [prepare_prompt_text(text) for text in raw_texts]
+    sections = "\n".join(
+        f"=== DOCUMENT {i} ===\n{compact.text}\n=== END DOCUMENT {i} ==="
+        for i, compact in enumerate(compacts, start=1)
     )
+    return f"""
+    Extract structured data from each of the {len(raw_texts)} {document_type} texts below.
+    Return ONLY a valid JSON object of the form {{"documents": [...]}} with exactly
+    one entry per document, in document order, each matching the schema below.
+    
+    Schema:
+    {schema}
     
-    return parse_llm_posting_response(response.text)
+    {sections}
+    """
+
+def split_batch_response(response_text: str, count: int) -> List[Any]:
+    """
+    The per-document entries of a batch response. Raises ValueError when
+    the response is not JSON or does not hold exactly count documents.
+    """
+    data = load_json(response_text)
+    documents = data.get("documents") if isinstance(data, dict) else None
+    if not isinstance(documents, list) or len(documents) != count:
+        raise ValueError(f"Expected {count} documents in batch response")
+    return documents
+
+def _batches(raw_texts: List[str]) -> List[List[str]]:
+    """
+    Groups texts into requests of at most LLM_BATCH_SIZE documents and about
+    LLM_BATCH_MAX_CHARS characters.
+    """
+    size = max(1, get_int_env("LLM_BATCH_SIZE", 8))
+    max_chars = get_int_env("LLM_BATCH_MAX_CHARS", 60000)
+    batches: List[List[str]] = []
+    chars = 0
+    for text in raw_texts:
+        if batches and len(batches[-1]) < size and chars + len(text) <= max_chars:
+            batches[-1].append(text)
+            chars += len(text)
+        else:
+            batches.append([text])
+            chars = len(text)
+    return batches
+
+def _falls_back(error: BaseException) -> bool:
+    """
+    Batch failures that are retried document by document: an unusable
+    answer, a timeout or unavailability (smaller prompts may still get
+    through), or a 4xx rejection of the combined prompt (e.g. too long).
+    """
+    if isinstance(error, (ValueError, LLMTimeoutError, LLMUnavailableError)):
+        return True
+    return isinstance(error, genai_errors.APIError) and 400 <= error.code < 500
+
+async def _parse_many(
+    kind: str,
+    raw_texts: List[str],
+    prompt_version: str,
+    document_type: str,
+    schema: str,
+    model: Type[BaseModel],
+    parse_one: Callable[[str], Awaitable[BaseModel]],
+) -> List[BaseModel]:
+    cache = _backend_cache()
+    parsed: Dict[str, BaseModel] = {}
+    for text in dict.fromkeys(raw_texts):
+        cached = await cache.get(_cache_key(kind, text, prompt_version))
+        if cached is not None:
+            parsed[text] = model(**cached)
+    pending = [text for text in dict.fromkeys(raw_texts) if text not in parsed]
+
+    async def run(batch: List[str]):
+        if len(batch) == 1:
+            parsed[batch[0]] = await parse_one(batch[0])
+            return
+        compacts = [prepare_prompt_text(text) for text in batch]
+        try:
+            documents = split_batch_response(
+                await generate_json(generate_batch_prompt(document_type, schema, batch, compacts)), len(batch)
+            )
+        except Exception as e:
+            if not _falls_back(e):
+                raise
+            documents = [None] * len(batch)
+        retry = []
+        for text, compact, document in zip(batch, compacts, documents):
+            try:
+                try:
+                    result = validate_document(model, document)
+                except InvalidFieldsError as e:
+                    result = await _repair(document_type, schema, text, e)
+            except Exception as e:
+                if not _falls_back(e):
+                    raise
+                retry.append(text)
+                continue
+            parsed[text] = result
+            # Documents retried below are counted by parse_one.
+            get_compaction_stats().record(compact)
+            await cache.put(
+                _cache_key(kind, text, prompt_version),
+                kind,
+                result.dict(),
+                {"model": LLM_MODEL, "prompt_version": prompt_version},
+            )
+        # Documents the batch answer got wrong are retried one by one.
+        for text, result in zip(retry, await asyncio.gather(*(parse_one(t) for t in retry))):
+            parsed[text] = result
+
+    await asyncio.gather(*(run(batch) for batch in _batches(pending)))
+    return [parsed[text] for text in raw_texts]
+
+async def parse_resumes_with_llm(raw_texts: List[str]) -> List[ResumeParsedData]:
+    """
+    Parses many resumes with as few model calls as possible: cache hits and
+    duplicate texts are skipped and the rest are packed several per request.
+    Results are in input order and equal to parse_resume_with_llm's.
+    """
+    return await _parse_many(
+        "resume", raw_texts, RESUME_PROMPT_VERSION, "resume", RESUME_SCHEMA,
+        ResumeParsedData, parse_resume_with_llm,
+    )
+
+async def parse_postings_with_llm(raw_texts: List[str]) -> List[PostingParsedData]:
+    """
+    Batch counterpart of parse_posting_with_llm; see parse_resumes_with_llm.
+    """
+    return await _parse_many(
+        "posting", raw_texts, POSTING_PROMPT_VERSION, "job posting", POSTING_SCHEMA,
+        PostingParsedData, parse_posting_with_llm,
+    )
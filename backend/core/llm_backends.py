@@ -0,0 +1,273 @@
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from google import genai
+from google.genai import errors as genai_errors
+
+from core.config import get_float_env
+
+LLM_MODEL = "gemini-3-flash-preview"
+
+_JSON_CONFIG = {"response_mime_type": "application/json"}
+
+
+class LLMBackend(abc.ABC):
+    """
+    Where JSON-mode generations are sent. generate_json and stream_json in
+    core.llm wrap a backend with the concurrency, rate and timeout guards,
+    so every backend is exercised through the same pipeline.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    async def generate(self, prompt: str) -> str:
+        """The model's full JSON response text for prompt."""
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        yield await self.generate(prompt)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name}
+
+
+_gemini_client = None
+
+
+def get_gemini_client():
+    """
+    The google-genai client, created on first use so importing the app (and
+    running the other backends) needs no GEMINI_API_KEY.
+    """
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    return _gemini_client
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    async def generate(self, prompt: str) -> str:
+        response = await get_gemini_client().aio.models.generate_content(
+            model=LLM_MODEL, contents=prompt, config=_JSON_CONFIG
+        )
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        stream = await get_gemini_client().aio.models.generate_content_stream(
+            model=LLM_MODEL, contents=prompt, config=_JSON_CONFIG
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class RecordingNotFoundError(LookupError):
+    """Raised in replay mode for a prompt that was never recorded."""
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Stores responses as one JSON file per prompt hash under directory.
+    In "record" mode calls go to inner and are saved; in "replay" mode they
+    are answered from disk only, so a recorded run repeats exactly and
+    offline. Streams replay as the same chunks they were recorded in.
+    """
+
+    def __init__(self, directory: str, mode: str, inner: Optional[LLMBackend] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.inner = inner or GeminiBackend()
+        self.name = mode
+        self._stats = {"hits": 0, "recorded": 0, "misses": 0}
+
+    def _path(self, prompt: str) -> str:
+        return os.path.join(self.directory, f"{prompt_hash(prompt)}.json")
+
+    def _load(self, prompt: str) -> List[str]:
+        try:
+            with open(self._path(prompt), encoding="utf-8") as f:
+                chunks = json.load(f)["chunks"]
+        except FileNotFoundError:
+            self._stats["misses"] += 1
+            raise RecordingNotFoundError(f"No recording for prompt {prompt_hash(prompt)[:16]}")
+        self._stats["hits"] += 1
+        return chunks
+
+    def _save(self, prompt: str, chunks: List[str]):
+        os.makedirs(self.directory, exist_ok=True)
+        record = {"prompt_hash": prompt_hash(prompt), "model": LLM_MODEL, "chunks": chunks}
+        with open(self._path(prompt), "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        self._stats["recorded"] += 1
+
+    async def generate(self, prompt: str) -> str:
+        if self.mode == "replay":
+            return "".join(self._load(prompt))
+        text = await self.inner.generate(prompt)
+        self._save(prompt, [text])
+        return text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        if self.mode == "replay":
+            for chunk in self._load(prompt):
+                yield chunk
+            return
+        chunks = []
+        async for chunk in self.inner.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        self._save(prompt, chunks)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "directory": self.directory, **self._stats}
+
+
+_DOCUMENT_MARKER = re.compile(r"=== DOCUMENT \d+ ===\n(.*?)\n=== END DOCUMENT \d+ ===", re.S)
+_TEXT_LABEL = re.compile(r"Text:[ \t]*\n")
+_WORD = re.compile(r"[^\W\d_][\w+#.-]{2,}")
+
+
+def parse_latency(spec: str) -> Tuple[str, Tuple[float, ...]]:
+    """
+    Parses a latency distribution: "fixed:S", "uniform:LOW,HIGH" or
+    "lognormal:MEDIAN,SIGMA", in seconds.
+    """
+    kind, _, args = spec.partition(":")
+    values = tuple(float(v) for v in args.split(",") if v.strip())
+    expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(f"Invalid latency distribution: {spec}")
+    return kind, values
+
+
+class SyntheticBackend(LLMBackend):
+    """
+    Answers without a model, for load tests: each call waits a latency drawn
+    from the configured distribution, fails with an API error at
+    error_rate, and otherwise returns JSON that matches the schema in the
+    prompt, filled with words from the document. Batch prompts get one
+    entry per document. A seed makes a run reproducible.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        error_code: int = 503,
+        seed: Optional[int] = None,
+        chunk_size: int = 64,
+    ):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.chunk_size = max(1, chunk_size)
+        self._random = random.Random(seed)
+        self._stats = {"calls": 0, "errors": 0}
+
+    def _delay(self) -> float:
+        kind, values = self.latency
+        if kind == "fixed":
+            return values[0]
+        if kind == "uniform":
+            return self._random.uniform(*values)
+        median, sigma = values
+        return median * self._random.lognormvariate(0, sigma)
+
+    async def _call(self, prompt: str) -> str:
+        self._stats["calls"] += 1
+        await asyncio.sleep(self._delay())
+        if self._random.random() < self.error_rate:
+            self._stats["errors"] += 1
+            raise genai_errors.APIError(
+                self.error_code,
+                {"error": {"code": self.error_code, "message": "Synthetic error", "status": "UNAVAILABLE"}},
+            )
+        return synthesize_response(prompt)
+
+    async def generate(self, prompt: str) -> str:
+        return await self._call(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        text = await self._call(prompt)
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size]
+
+    def stats(self) -> Dict[str, Any]:
+        kind, values = self.latency
+        return {
+            "name": self.name,
+            "latency": f"{kind}:{','.join(f'{v:g}' for v in values)}",
+            "error_rate": self.error_rate,
+            **self._stats,
+        }
+
+
+def _prompt_schema(prompt: str) -> Tuple[Any, str]:
+    """The JSON schema block of a prompt and the text that follows it."""
+    start = prompt.index("Schema:") + len("Schema:")
+    body = prompt[start:].lstrip()
+    schema, end = json.JSONDecoder().raw_decode(body)
+    return schema, body[end:]
+
+
+def _fill(template: Any, words: List[str], counter: List[int]) -> Any:
+    if isinstance(template, dict):
+        return {key: _fill(value, words, counter) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_fill(template[0], words, counter) for _ in range(2)] if template else []
+    counter[0] += 1
+    return words[counter[0] % len(words)] if words else "n/a"
+
+
+def synthesize_response(prompt: str) -> str:
+    """
+    A response that satisfies the prompt's schema, so synthetic runs go
+    through validation and storage like real ones.
+    """
+    schema, rest = _prompt_schema(prompt)
+    documents = _DOCUMENT_MARKER.findall(rest)
+    label = _TEXT_LABEL.search(rest)
+    texts = documents or [rest[label.end():] if label else rest]
+    filled = [_fill(schema, list(dict.fromkeys(_WORD.findall(text)))[:50], [0]) for text in texts]
+    if documents:
+        return json.dumps({"documents": filled}, ensure_ascii=False)
+    return json.dumps(filled[0], ensure_ascii=False)
+
+
+def create_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    The backend named by LLM_BACKEND: "gemini" (default), "record" or
+    "replay" (files under LLM_RECORDINGS_DIR), or "synthetic" (shaped by
+    LLM_SYNTHETIC_LATENCY, LLM_SYNTHETIC_ERROR_RATE,
+    LLM_SYNTHETIC_ERROR_CODE and LLM_SYNTHETIC_SEED).
+    """
+    name = (name or os.getenv("LLM_BACKEND") or "gemini").lower()
+    if name == "gemini":
+        return GeminiBackend()
+    if name in ("record", "replay"):
+        return RecordReplayBackend(os.getenv("LLM_RECORDINGS_DIR") or ".llm_recordings", name)
+    if name == "synthetic":
+        seed = os.getenv("LLM_SYNTHETIC_SEED")
+        return SyntheticBackend(
+            latency=os.getenv("LLM_SYNTHETIC_LATENCY") or "fixed:0",
+            error_rate=get_float_env("LLM_SYNTHETIC_ERROR_RATE", 0.0),
+            error_code=int(get_float_env("LLM_SYNTHETIC_ERROR_CODE", 503)),
+            seed=int(seed) if seed else None,
+        )
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import get_int_env
+from core.database import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
+
+SHARED_TABLE = "llm_parse_cache"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(raw_text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", raw_text).strip()
+
+
+def make_cache_key(kind: str, raw_text: str, prompt_version: str, model: str) -> str:
+    """
+    Content address for a parse result: the same normalized text sent with the
+    same prompt template and model always maps to the same key.
+    """
+    material = "\x00".join([kind, prompt_version, model, normalize_text(raw_text)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier cache for LLM parse results.
+    The local tier is an in-process LRU bounded by entry count and payload
+    bytes. The optional shared tier is the llm_parse_cache table, so results
+    survive restarts and are shared between machines.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, shared: bool = False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0}
+
+    def get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["local_hits"] += 1
+            return json.loads(entry[0])
+
+    def put_local(self, key: str, payload: Dict[str, Any]):
+        encoded = json.dumps(payload, ensure_ascii=False)
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (encoded, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    async def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            client = await get_async_supabase_client()
+            res = await (
+                client.table(SHARED_TABLE)
+                .select("parsed_data")
+                .eq("cache_key", key)
+                .limit(1)
+                .execute()
+            )
+        except Exception:
+            logger.warning("parse cache shared lookup failed", exc_info=True)
+            return None
+        return res.data[0]["parsed_data"] if res.data else None
+
+    async def _put_shared(self, key: str, kind: str, meta: Dict[str, str], payload: Dict[str, Any]):
+        try:
+            client = await get_async_supabase_client()
+            await client.table(SHARED_TABLE).upsert(
+                {"cache_key": key, "kind": kind, "parsed_data": payload, **meta},
+                on_conflict="cache_key",
+            ).execute()
+        except Exception:
+            logger.warning("parse cache shared write failed", exc_info=True)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        payload = self.get_local(key)
+        if payload is not None:
+            return payload
+        if self.shared:
+            payload = await self._get_shared(key)
+            if payload is not None:
+                with self._lock:
+                    self._stats["shared_hits"] += 1
+                self.put_local(key, payload)
+                return payload
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    async def put(
+        self,
+        key: str,
+        kind: str,
+        payload: Dict[str, Any],
+        meta: Optional[Dict[str, str]] = None,
+    ):
+        self.put_local(key, payload)
+        if self.shared:
+            await self._put_shared(key, kind, meta or {}, payload)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["local_hits"] + self._stats["shared_hits"] + self._stats["misses"]
+            hits = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "shared": self.shared,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache(
+            max_entries=get_int_env("PARSE_CACHE_MAX_ENTRIES", 512),
+            max_bytes=get_int_env("PARSE_CACHE_MAX_BYTES", 8 * 1024 * 1024),
+            shared=os.getenv("PARSE_CACHE_SHARED", "false").lower() == "true",
+        )
+    return _parse_cache
+
+
+def _reset_parse_cache():
+    global _parse_cache
+    _parse_cache = None
@@ -1,5 +1,74 @@
+import asyncio
+import multiprocessing
 import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
 import fitz  # PyMuPDF
+from core.config import get_float_env, get_int_env
+from core.compaction import PAGE_BREAK
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_PAGES = 50
+_READ_CHUNK_SIZE = 256 * 1024
+
+
+class PdfTooLargeError(ValueError):
+    pass
+
+
+class PdfTooManyPagesError(ValueError):
+    pass
+
+
+class InvalidPdfError(ValueError):
+    pass
+
+
+class PdfExtractionTimeoutError(RuntimeError):
+    pass
+
+
+class PdfExtractionError(RuntimeError):
+    """A worker process died while extracting (e.g. out of memory)."""
+
+
+async def read_upload(upload, max_bytes: int = DEFAULT_MAX_BYTES) -> bytes:
+    """
+    Reads an uploaded file into memory in chunks, failing as soon as the
+    running total passes max_bytes instead of after buffering everything.
+    """
+    size = getattr(upload, "size", None)
+    if size is not None and size > max_bytes:
+        raise PdfTooLargeError(f"File exceeds {max_bytes} bytes")
+
+    chunks: List[bytes] = []
+    total = 0
+    while True:
+        chunk = await upload.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise PdfTooLargeError(f"File exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _extract_text(doc, max_pages: Optional[int]) -> str:
+    if max_pages is not None and doc.page_count > max_pages:
+        raise PdfTooManyPagesError(f"PDF has {doc.page_count} pages (max {max_pages})")
+    return PAGE_BREAK.join(page.get_text() for page in doc).strip()
+
+
+def _open_stream(data: bytes):
+    try:
+        return fitz.open(stream=data, filetype="pdf")
+    except RuntimeError as e:  # FileDataError subclasses RuntimeError
+        raise InvalidPdfError(f"Invalid PDF: {e}")
+
 
 def extract_text_from_pdf(file_path: str) -> str:
     """
@@ -7,13 +76,206 @@ def extract_text_from_pdf(file_path: str) -> str:
     """
     if not file_path.lower().endswith(".pdf"):
         raise ValueError("Unsupported file type. Only PDF is supported.")
-        
+
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
-        
-    text = ""
+
     with fitz.open(file_path) as doc:
-        for page in doc:
-            text += page.get_text()
-            
-    return text.strip()
+        return _extract_text(doc, None)
+
+
+# --- Extraction engine ---
+# Jobs below run inside pool workers, so they must stay module-level and
+# picklable.
+
+def _warm_worker() -> int:
+    return os.getpid()
+
+
+def _extract_job(
+    data: bytes, max_pages: Optional[int], split_pages: Optional[int]
+) -> Tuple[Optional[str], int]:
+    """
+    Extracts the whole document, or only reports its page count when it is
+    large enough to be split across workers.
+    """
+    with _open_stream(data) as doc:
+        if max_pages is not None and doc.page_count > max_pages:
+            raise PdfTooManyPagesError(f"PDF has {doc.page_count} pages (max {max_pages})")
+        if split_pages is not None and doc.page_count > split_pages:
+            return None, doc.page_count
+        return PAGE_BREAK.join(page.get_text() for page in doc), doc.page_count
+
+
+def _extract_range_job(data: bytes, start: int, stop: int) -> str:
+    with _open_stream(data) as doc:
+        return PAGE_BREAK.join(doc[i].get_text() for i in range(start, stop))
+
+
+class PdfExtractionEngine:
+    """
+    Runs PyMuPDF extraction in a bounded pool of warm worker processes so it
+    never holds the GIL of the API process.
+    Documents over split_pages pages are split into page ranges across the
+    workers and reassembled in order. Workers are replaced after
+    max_jobs_per_worker jobs to cap memory growth. A document that times out
+    has its pool killed and replaced, since abandoning the future would leave
+    the worker busy and a pool cannot kill a single job; other documents'
+    jobs on that pool are resubmitted to the replacement. Page-range
+    splitting needs workers > 1 (PDF_WORKERS defaults to 1 to fit small
+    VMs). With workers=0 the engine falls back to a thread, which suits
+    tests and single-core machines.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_jobs_per_worker: int = 50,
+        split_pages: int = 20,
+        timeout: float = 30.0,
+    ):
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.split_pages = split_pages
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Guards creating and replacing the pool, so concurrent failures
+        # replace it once.
+        self._pool_lock = threading.Lock()
+        # Pools killed on purpose, whose jobs are run again rather than failed.
+        self._killed: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._queue_depth = 0
+        self._stats = {"documents": 0, "jobs": 0, "timeouts": 0, "pool_restarts": 0}
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_jobs_per_worker,
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(_warm_worker)
+            return self._executor
+
+    def shutdown(self):
+        with self._pool_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle(self, executor: Optional[ProcessPoolExecutor], kill: bool = False):
+        """
+        Drops executor so the next job starts a fresh pool, unless another
+        caller already replaced it. kill terminates its workers first.
+        """
+        with self._pool_lock:
+            if executor is None or self._executor is not executor:
+                return
+            self._executor = None
+        self._stats["pool_restarts"] += 1
+        if kill:
+            self._killed.add(executor)
+            for process in list((executor._processes or {}).values()):
+                process.kill()
+        # Pending futures of a killed pool fail with BrokenProcessPool so
+        # _run can resubmit them; cancelling them would cancel their callers.
+        executor.shutdown(wait=False, cancel_futures=not kill)
+
+    def _job_done(self, _future):
+        with self._lock:
+            self._queue_depth -= 1
+            self._stats["jobs"] += 1
+
+    async def _run(self, pools: Set[ProcessPoolExecutor], fn, *args):
+        """Runs one job, adding the pools it was submitted to to pools."""
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        while True:
+            executor = self.start()
+            pools.add(executor)
+            with self._lock:
+                self._queue_depth += 1
+            try:
+                try:
+                    future = executor.submit(fn, *args)
+                except Exception:
+                    with self._lock:
+                        self._queue_depth -= 1
+                    raise
+                future.add_done_callback(self._job_done)
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool as e:
+                if executor in self._killed:
+                    # Another document timed out on this pool; not our failure.
+                    continue
+                # A worker died (e.g. OOM); replace the pool for the next request.
+                self._recycle(executor)
+                raise PdfExtractionError("PDF extraction worker stopped unexpectedly") from e
+
+    async def _extract(self, data: bytes, max_pages: Optional[int], pools: Set[ProcessPoolExecutor]) -> str:
+        split_pages = self.split_pages if self.workers > 1 else None
+        text, page_count = await self._run(pools, _extract_job, data, max_pages, split_pages)
+        if text is None:
+            chunk = -(-page_count // self.workers)
+            ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+            parts = await asyncio.gather(
+                *(self._run(pools, _extract_range_job, data, start, stop) for start, stop in ranges)
+            )
+            text = PAGE_BREAK.join(parts)
+        return text.strip()
+
+    async def extract_text(self, data: bytes, max_pages: Optional[int] = DEFAULT_MAX_PAGES) -> str:
+        self._stats["documents"] += 1
+        pools: Set[ProcessPoolExecutor] = set()
+        try:
+            return await asyncio.wait_for(self._extract(data, max_pages, pools), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            # The worker keeps running a cancelled job, so kill it with its pool.
+            for executor in pools:
+                self._recycle(executor, kill=True)
+            raise PdfExtractionTimeoutError(f"PDF extraction timed out after {self.timeout:g}s")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "queue_depth": self._queue_depth,
+                "workers": self.workers,
+                "max_jobs_per_worker": self.max_jobs_per_worker,
+                "running": self._executor is not None or self.workers <= 0,
+            }
+
+
+_engine: Optional[PdfExtractionEngine] = None
+
+
+def get_pdf_engine() -> PdfExtractionEngine:
+    global _engine
+    if _engine is None:
+        _engine = PdfExtractionEngine(
+            workers=get_int_env("PDF_WORKERS", 1),
+            max_jobs_per_worker=get_int_env("PDF_MAX_JOBS_PER_WORKER", 50),
+            split_pages=get_int_env("PDF_SPLIT_PAGES", 20),
+            timeout=get_float_env("PDF_TIMEOUT_SECONDS", 30.0),
+        )
+    return _engine
+
+
+def _reset_pdf_engine():
+    global _engine
+    if _engine is not None:
+        _engine.shutdown()
+    _engine = None
+
+
+async def extract_pdf_text(data: bytes, max_pages: Optional[int] = DEFAULT_MAX_PAGES) -> str:
+    """
+    Extracts text from an in-memory PDF on the shared extraction engine.
+    """
+    return await get_pdf_engine().extract_text(data, max_pages)
@@ -0,0 +1,299 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from core.database import get_async_supabase_client
+
+Row = Dict[str, Any]
+
+# Embeds the analysis a document's latest_analysis_id points at (schema.sql
+# section 9). The FK name disambiguates it from analyses.resume_id/posting_id.
+_LATEST_ANALYSIS_EMBED = "latest_analysis:analyses!{table}_latest_analysis_id_fkey({columns})"
+
+
+def _first(res) -> Optional[Row]:
+    return res.data[0] if res.data else None
+
+
+class _Table:
+    table: str
+
+    async def _query(self):
+        return (await get_async_supabase_client()).table(self.table)
+
+
+class _DocumentTable(_Table):
+    owner_column: str
+
+    async def latest_analyses(self, ids: List[str], owner_id: str, columns: str) -> List[Row]:
+        """
+        The owner's documents among ids, each with its latest analysis (or
+        None) under "latest_analysis", read through the maintained pointer
+        in one query.
+        """
+        if not ids:
+            return []
+        embed = _LATEST_ANALYSIS_EMBED.format(table=self.table, columns=columns)
+        q = await self._query()
+        return (
+            await q.select(f"id, {embed}").in_("id", ids).eq(self.owner_column, owner_id).execute()
+        ).data or []
+
+
+class UserRepository(_Table):
+    table = "users"
+
+    async def get(self, user_id: str, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.select(columns).eq("id", user_id).limit(1).execute())
+
+    async def create(self, email: Optional[str], nickname: str) -> Optional[Row]:
+        q = await self._query()
+        return _first(
+            await q.insert(
+                {"email": email, "nickname": nickname, "status": "PENDING_ONBOARDING"}
+            ).execute()
+        )
+
+    async def update(self, user_id: str, fields: Row) -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.update(fields).eq("id", user_id).execute())
+
+    async def get_oauth_account(self, provider: str, provider_sub: str) -> Optional[Row]:
+        client = await get_async_supabase_client()
+        return _first(
+            await client.table("oauth_accounts")
+            .select("*")
+            .eq("provider", provider)
+            .eq("provider_sub", provider_sub)
+            .limit(1)
+            .execute()
+        )
+
+    async def link_oauth_account(
+        self, user_id: str, provider: str, provider_sub: str, email: Optional[str]
+    ):
+        client = await get_async_supabase_client()
+        await client.table("oauth_accounts").insert(
+            {"user_id": user_id, "provider": provider, "provider_sub": provider_sub, "email": email}
+        ).execute()
+
+    async def get_profile(self, user_id: str, role: str) -> Optional[Row]:
+        table = {"JOBSEEKER": "jobseeker_profiles", "COMPANY": "company_profiles"}.get(role)
+        if table is None:
+            return None
+        client = await get_async_supabase_client()
+        return _first(
+            await client.table(table).select("*").eq("user_id", user_id).limit(1).execute()
+        )
+
+    async def upsert_jobseeker_profile(self, user_id: str, jobseeker_type: str):
+        client = await get_async_supabase_client()
+        await client.table("jobseeker_profiles").upsert(
+            {"user_id": user_id, "type": jobseeker_type}, on_conflict="user_id"
+        ).execute()
+
+    async def upsert_company_profile(self, user_id: str, company_name: str, biz_reg_no: str):
+        client = await get_async_supabase_client()
+        await client.table("company_profiles").upsert(
+            {
+                "user_id": user_id,
+                "company_name": company_name,
+                "biz_reg_no": biz_reg_no,
+                "biz_verified": True,
+                "biz_verified_at": datetime.now(timezone.utc).isoformat(),
+            },
+            on_conflict="user_id",
+        ).execute()
+
+    async def get_mypage(self, user_id: str) -> Optional[Row]:
+        """
+        The my page read model from the get_mypage RPC (schema.sql): user,
+        profile, documents and each document's latest analysis summary.
+        """
+        client = await get_async_supabase_client()
+        return (await client.rpc("get_mypage", {"p_user_id": user_id}).execute()).data or None
+
+    async def delete_account(self, user_id: str) -> Optional[Row]:
+        """
+        Deletes the user and everything they own in one transaction via the
+        delete_account RPC (schema.sql). Returns {"resume_ids": [...],
+        "deleted": {table: row_count}}, or None when the user did not exist.
+        """
+        client = await get_async_supabase_client()
+        return (await client.rpc("delete_account", {"p_user_id": user_id}).execute()).data or None
+
+
+class ResumeRepository(_DocumentTable):
+    table = "resumes"
+    owner_column = "user_id"
+
+    async def get(self, resume_id: str, user_id: Optional[str] = None, columns: str = "*") -> Optional[Row]:
+        q = (await self._query()).select(columns).eq("id", resume_id)
+        if user_id is not None:
+            q = q.eq("user_id", user_id)
+        return _first(await q.limit(1).execute())
+
+    async def get_many(self, resume_ids: List[str], columns: str = "*") -> List[Row]:
+        if not resume_ids:
+            return []
+        q = await self._query()
+        return (await q.select(columns).in_("id", resume_ids).execute()).data or []
+
+    async def list_for_user(self, user_id: str, columns: str = "*") -> List[Row]:
+        q = await self._query()
+        return (await q.select(columns).eq("user_id", user_id).execute()).data or []
+
+    async def latest_for_user(self, user_id: str, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(
+            await q.select(columns)
+            .eq("user_id", user_id)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+
+    async def page(self, columns: str, offset: int, limit: int) -> List[Row]:
+        q = await self._query()
+        return (await q.select(columns).range(offset, offset + limit - 1).execute()).data or []
+
+    async def create(self, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.insert(fields).select(columns).execute())
+
+    async def update(self, resume_id: str, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.update(fields).eq("id", resume_id).select(columns).execute())
+
+    async def delete(self, resume_id: str, user_id: str) -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.delete().eq("id", resume_id).eq("user_id", user_id).execute())
+
+    async def upload_original(self, resume_id: str, data: bytes):
+        client = await get_async_supabase_client()
+        await client.storage.from_("resumes").upload(f"{resume_id}.pdf", data)
+
+
+class PostingRepository(_DocumentTable):
+    table = "job_postings"
+    owner_column = "created_by"
+
+    async def get(self, posting_id: str, owner_id: Optional[str] = None, columns: str = "*") -> Optional[Row]:
+        q = (await self._query()).select(columns).eq("id", posting_id)
+        if owner_id is not None:
+            q = q.eq("created_by", owner_id)
+        return _first(await q.limit(1).execute())
+
+    async def get_many(self, posting_ids: List[str], columns: str = "*") -> List[Row]:
+        if not posting_ids:
+            return []
+        q = await self._query()
+        return (await q.select(columns).in_("id", posting_ids).execute()).data or []
+
+    async def list_for_owner(self, owner_id: str, columns: str = "*") -> List[Row]:
+        q = await self._query()
+        return (await q.select(columns).eq("created_by", owner_id).execute()).data or []
+
+    async def create(self, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.insert(fields).select(columns).execute())
+
+    async def create_many(self, rows: List[Row], columns: str = "*") -> List[Row]:
+        if not rows:
+            return []
+        q = await self._query()
+        return (await q.insert(rows).select(columns).execute()).data or []
+
+    async def update(self, posting_id: str, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.update(fields).eq("id", posting_id).select(columns).execute())
+
+    async def delete(self, posting_id: str, owner_id: str) -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.delete().eq("id", posting_id).eq("created_by", owner_id).execute())
+
+
+class AnalysisRepository(_Table):
+    table = "analyses"
+
+    async def get(self, analysis_id: str, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.select(columns).eq("id", analysis_id).limit(1).execute())
+
+    async def get_many(self, analysis_ids: List[str], columns: str = "*") -> List[Row]:
+        if not analysis_ids:
+            return []
+        q = await self._query()
+        return (await q.select(columns).in_("id", analysis_ids).execute()).data or []
+
+    async def list_current_for(self, column: str, value: str, columns: str = "*") -> List[Row]:
+        """
+        Non-stale analyses whose `column` ("resume_id" or "posting_id")
+        equals value, newest first.
+        """
+        q = await self._query()
+        return (
+            await q.select(columns)
+            .eq(column, value)
+            .eq("stale", False)
+            .order("created_at", desc=True)
+            .execute()
+        ).data or []
+
+    async def find_memoized(
+        self, resume_id: str, posting_id: str, key: str, columns: str = "*"
+    ) -> Optional[Row]:
+        q = await self._query()
+        return _first(
+            await q.select(columns)
+            .eq("resume_id", resume_id)
+            .eq("posting_id", posting_id)
+            .eq("memo_key", key)
+            .eq("stale", False)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+
+    async def mark_stale(self, analysis_ids: List[str]):
+        if not analysis_ids:
+            return
+        q = await self._query()
+        await q.update({"stale": True}).in_("id", analysis_ids).execute()
+
+    async def update(self, analysis_id: str, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.update(fields).eq("id", analysis_id).select(columns).execute())
+
+    async def create(self, fields: Row, columns: str = "*") -> Optional[Row]:
+        q = await self._query()
+        return _first(await q.insert(fields).select(columns).execute())
+
+    async def create_many(self, rows: List[Row], columns: str = "*") -> List[Row]:
+        if not rows:
+            return []
+        q = await self._query()
+        return (await q.insert(rows).select(columns).execute()).data or []
+
+
+class Repository:
+    """
+    Typed async data access for the API. Every method awaits the pooled
+    Supabase async client, so handlers never block a worker thread on I/O.
+    """
+
+    def __init__(self):
+        self.users = UserRepository()
+        self.resumes = ResumeRepository()
+        self.postings = PostingRepository()
+        self.analyses = AnalysisRepository()
+
+
+_repository: Optional[Repository] = None
+
+
+def get_repository() -> Repository:
+    global _repository
+    if _repository is None:
+        _repository = Repository()
+    return _repository
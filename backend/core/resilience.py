@@ -0,0 +1,201 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts AIMD-style: each call that finishes under
+    latency_target raises the limit by 1/limit (about +1 per limit's worth
+    of calls), and a slow call or an overload error multiplies it by
+    decrease_factor. Waiters are served FIFO; acquire() gives up after a
+    timeout instead of queueing forever.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        latency_target: float = 20.0,
+        decrease_factor: float = 0.5,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=max(0.0, timeout))
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as we gave up; pass it on.
+                self.release()
+            else:
+                waiter.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency: float):
+        if latency > self.latency_target:
+            self.on_overload()
+            return
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_overload(self):
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency_target_seconds": self.latency_target,
+        }
+
+
+class TokenBucket:
+    """
+    Request-rate limiter: rate tokens per second up to capacity. A caller
+    that finds the bucket empty reserves the next token and sleeps until it
+    is due, unless that is further off than its timeout. A rate of 0
+    disables the bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.rate <= 0:
+            return True
+        self._refill()
+        wait = max(0.0, (1.0 - self.tokens) / self.rate)
+        if wait > timeout:
+            return False
+        self.tokens -= 1.0
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        if self.rate <= 0:
+            return {"enabled": False}
+        self._refill()
+        return {
+            "enabled": True,
+            "rate_per_minute": self.rate * 60,
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 2),
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures so callers fail fast
+    instead of queueing behind a struggling upstream. After reset_seconds
+    one probe call is let through (half-open); its outcome closes the
+    circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    def is_open(self) -> bool:
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at < self.reset_seconds
+        return self.state == self.HALF_OPEN and self._probing
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now; in half-open state this claims the
+        single probe.
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def abandon(self):
+        """A call ended without a verdict (e.g. the caller went away)."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at)), 2)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_seconds": retry_in,
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for retry number attempt (from 1)."""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -0,0 +1,148 @@
+import functools
+import typing
+from typing import Any, Dict, List, Type
+
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+_MISSING = object()
+# Keys tried, in order, when a string is expected but the model sent an object.
+_TEXT_KEYS = ("name", "value", "text", "title")
+
+
+class InvalidFieldsError(ValueError):
+    """
+    A model response that parsed as JSON but has fields that still fail
+    validation after coercion. data holds the coerced document, so only
+    fields need to be asked for again.
+    """
+
+    def __init__(self, model: Type[BaseModel], data: Dict[str, Any], fields: List[str]):
+        super().__init__(f"Invalid fields in {model.__name__}: {', '.join(fields)}")
+        self.model = model
+        self.data = data
+        self.fields = fields
+
+
+def load_json(response_text: str) -> Any:
+    """
+    Parses a model response with orjson, tolerating a ```json fence or
+    prose around the outermost object. Raises ValueError when no JSON is
+    found.
+    """
+    text = (response_text or "").strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return orjson.loads(text[start:end + 1])
+
+
+@functools.lru_cache(maxsize=None)
+def _adapters(model: Type[BaseModel]):
+    """Compiled validators for the model and each of its fields, built once."""
+    fields = {name: TypeAdapter(info.annotation) for name, info in model.model_fields.items()}
+    return TypeAdapter(model), fields
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _text(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (int, float, bool)):
+        return str(value)
+    if isinstance(value, list) and all(isinstance(v, (str, int, float)) for v in value):
+        return ", ".join(str(v) for v in value)
+    if isinstance(value, dict):
+        for key in _TEXT_KEYS:
+            if isinstance(value.get(key), str):
+                return value[key]
+    return value
+
+
+def _coerce(annotation: Any, value: Any) -> Any:
+    """
+    Deterministic fixes for the deviations models commonly make: null or a
+    bare value where a list belongs, a string where an object belongs
+    (taken as its first field), an object or number where a string
+    belongs, and missing string/list members of nested objects. Values
+    that fit none of these are returned unchanged for validation to
+    reject.
+    """
+    if typing.get_origin(annotation) in (list, List):
+        (item_type,) = typing.get_args(annotation) or (Any,)
+        if value is None or value is _MISSING:
+            return []
+        if not isinstance(value, list):
+            value = [value]
+        return [_coerce(item_type, item) for item in value if item is not None]
+    if annotation is str:
+        return "" if value is _MISSING else _text(value)
+    if _is_model(annotation):
+        fields = annotation.model_fields
+        if isinstance(value, str):
+            value = {next(iter(fields)): value}
+        if not isinstance(value, dict):
+            return value
+        coerced = dict(value)
+        for name, info in fields.items():
+            item = value.get(name, _MISSING)
+            if item is _MISSING and not info.is_required():
+                continue
+            coerced[name] = _coerce(info.annotation, item)
+        return coerced
+    return value
+
+
+def validate_document(model: Type[BaseModel], data: Any) -> BaseModel:
+    """
+    Coerces a parsed response into model. Top-level fields the response
+    left out stay missing (unless they have a default) rather than being
+    filled in, so they are reported instead of silently emptied. Raises
+    InvalidFieldsError naming the fields that remain invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object for {model.__name__}")
+    model_adapter, field_adapters = _adapters(model)
+    coerced: Dict[str, Any] = {}
+    invalid: List[str] = []
+    for name, info in model.model_fields.items():
+        if name not in data:
+            if info.is_required():
+                invalid.append(name)
+            continue
+        value = _coerce(info.annotation, data[name])
+        try:
+            coerced[name] = field_adapters[name].validate_python(value)
+        except ValidationError:
+            invalid.append(name)
+            continue
+    if invalid:
+        raise InvalidFieldsError(model, coerced, invalid)
+    return model_adapter.validate_python(coerced)
+
+
+def parse_document(model: Type[BaseModel], response_text: str) -> BaseModel:
+    return validate_document(model, load_json(response_text))
+
+
+def merge_repair(error: InvalidFieldsError, response_text: str) -> BaseModel:
+    """
+    Validates error's document with the fields from a follow-up response
+    put back in. Only the fields that were invalid are taken from it.
+    """
+    data = load_json(response_text)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object in the repair response")
+    merged = dict(error.data)
+    merged.update({name: data[name] for name in error.fields if name in data})
+    return validate_document(error.model, merged)
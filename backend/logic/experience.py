@@ -1,12 +1,180 @@
-from typing import List, Dict, Any
+import re
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
 
-def check_experience_fit(resume_experience: List[Dict[str, Any]], job_min_years: int) -> str:
+# Bump when parsing rules change so stored totals are recomputed on read.
+DURATION_VERSION = 1
+
+_MONTH_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_DATE_TOKEN = re.compile(
+    r"(?P<ym>(?P<ym_y>(?:19|20)\d{2})\s*(?:[./-]|년)\s*(?P<ym_m>\d{1,2})(?!\d)\s*월?)"
+    r"|(?P<my>(?P<my_m>\d{1,2})\s*[./]\s*(?P<my_y>(?:19|20)\d{2}))"
+    r"|(?P<named>(?P<named_m>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*(?P<named_y>(?:19|20)\d{2}))"
+    r"|(?P<year>(?<!\d)(?P<year_y>(?:19|20)\d{2})(?!\d)\s*년?)"
+    r"|(?P<present>present|current|now|today|현재|재직\s*중|근무\s*중|진행\s*중)",
+    re.IGNORECASE,
+)
+_OPEN_RANGE = re.compile(r"(?:[~–—-]|부터|since)\s*$", re.IGNORECASE)
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:년|years?|yrs?)(?![a-z])", re.IGNORECASE)
+_MONTHS = re.compile(r"(\d+)\s*(?:개월|months?|mos?)(?![a-z])", re.IGNORECASE)
+_YEAR_RANGE = re.compile(r"(\d+(?:\.\d+)?)\s*[~–-]\s*\d+(?:\.\d+)?\s*(?:년|years?|yrs?)", re.IGNORECASE)
+_NO_EXPERIENCE = re.compile(r"신입|경력\s*무관|entry[\s-]*level|no experience", re.IGNORECASE)
+
+Period = Tuple[int, int]  # inclusive (start, end) as year * 12 + month - 1
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + month - 1
+
+
+def _tokens(text: str, today: date) -> List[Optional[int]]:
     """
-    Calculates total years of experience and compares with job requirement.
-    Returns "Exceeds", "Matches", "Partial", or "Below".
+    Date tokens in order as month indexes. Year-only dates resolve to mid-year
+    so "2019 - 2021" counts about two years. None marks an unusable token.
+    """
+    tokens = []
+    for m in _DATE_TOKEN.finditer(text):
+        if m.group("present"):
+            tokens.append(_month_index(today.year, today.month))
+            continue
+        if m.group("ym"):
+            year, month = int(m.group("ym_y")), int(m.group("ym_m"))
+        elif m.group("my"):
+            year, month = int(m.group("my_y")), int(m.group("my_m"))
+        elif m.group("named"):
+            year, month = int(m.group("named_y")), _MONTH_NAMES[m.group("named_m").lower()]
+        else:
+            year, month = int(m.group("year_y")), 7
+        tokens.append(_month_index(year, month) if 1 <= month <= 12 else None)
+    return tokens
+
+
+def parse_duration(text: str, today: Optional[date] = None) -> Tuple[List[Period], int]:
+    """
+    Parses a free-text duration ("2019.03 - 2021.06", "Mar 2020 – Present",
+    "2020년 3월 ~ 현재", "2년 3개월", "18 months") into dated periods plus
+    months that have no dates attached. Date ranges win over stated
+    lengths, which resumes often repeat in parentheses.
+    """
+    today = today or date.today()
+    text = text or ""
+    tokens = _tokens(text, today)
+    if len(tokens) == 1 and tokens[0] is not None and _OPEN_RANGE.search(text):
+        tokens.append(_month_index(today.year, today.month))
+
+    periods = []
+    for start, end in zip(tokens[::2], tokens[1::2]):
+        if start is not None and end is not None and end >= start:
+            periods.append((start, end))
+    if periods:
+        return periods, 0
+
+    undated = _DATE_TOKEN.sub(" ", text)
+    years = sum(float(y) for y in _YEARS.findall(undated))
+    months = sum(int(mo) for mo in _MONTHS.findall(undated))
+    return [], int(round(years * 12)) + months
+
+
+def merge_periods(periods: List[Period]) -> List[Period]:
+    merged: List[Period] = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _period_months(periods: List[Period]) -> int:
+    return sum(end - start + 1 for start, end in merge_periods(periods))
+
+
+def annotate_experience(parsed_data: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Adds a month count to each parsed experience and the resume's total
+    (overlapping jobs counted once) under "experience_total", so analyses
+    read numbers instead of re-parsing free text. Open-ended ranges are
+    counted up to today, i.e. as of parse time.
+    """
+    all_periods: List[Period] = []
+    undated = 0
+    for exp in parsed_data.get("experiences") or []:
+        if not isinstance(exp, dict):
+            continue
+        periods, months = parse_duration(exp.get("duration") or "", today)
+        if not periods and not months and isinstance(exp.get("years"), (int, float)):
+            months = int(round(exp["years"] * 12))
+        exp["months"] = _period_months(periods) + months
+        all_periods.extend(periods)
+        undated += months
+
+    total = _period_months(all_periods) + undated
+    parsed_data["experience_total"] = {
+        "version": DURATION_VERSION,
+        "months": total,
+        "years": round(total / 12, 2),
+    }
+    return parsed_data
+
+
+def experience_years(parsed_data: Dict[str, Any]) -> float:
+    """
+    Total years of experience: the total stored at parse time, else derived
+    from the parsed experiences, else summed from legacy {"years": n}
+    entries under "experience".
+    """
+    stored = parsed_data.get("experience_total") or {}
+    if stored.get("version") == DURATION_VERSION:
+        return stored.get("years", 0)
+    if parsed_data.get("experiences"):
+        copy = {"experiences": [dict(e) for e in parsed_data["experiences"] if isinstance(e, dict)]}
+        return annotate_experience(copy)["experience_total"]["years"]
+    return sum(exp.get("years", 0) for exp in parsed_data.get("experience") or [] if isinstance(exp, dict))
+
+
+def parse_min_years(requirements: List[str]) -> Optional[float]:
+    """
+    Minimum years of experience stated in a posting's requirement lines
+    ("3년 이상", "5+ years", "3~5년" -> 3, "신입" -> 0). The strictest line
+    wins; None when no line states a length.
+    """
+    found: List[float] = []
+    for line in requirements or []:
+        if not isinstance(line, str):
+            continue
+        if _NO_EXPERIENCE.search(line):
+            found.append(0.0)
+        ranged = _YEAR_RANGE.findall(line)
+        line = _YEAR_RANGE.sub("", line)
+        found.extend(float(y) for y in ranged + _YEARS.findall(line))
+    return max(found) if found else None
+
+
+def posting_min_years(parsed_data: Dict[str, Any]) -> float:
+    """
+    The posting's numeric "min_experience", else the minimum stated in its
+    required_experience lines, else 0.
+    """
+    value = parsed_data.get("min_experience")
+    if isinstance(value, (int, float)):
+        return value
+    return parse_min_years(parsed_data.get("required_experience") or []) or 0
+
+
+def annotate_posting_experience(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stores the posting's minimum years as numeric "min_experience" so
+    analyses read it directly.
     """
-    total_years = sum(exp.get("years", 0) for exp in resume_experience)
-    
+    parsed_data["min_experience"] = posting_min_years(parsed_data)
+    return parsed_data
+
+
+def experience_alignment(total_years: float, job_min_years: float) -> str:
     if total_years >= job_min_years * 2.0:
         return "Exceeds"
     elif total_years >= job_min_years:
@@ -15,3 +183,18 @@ def check_experience_fit(resume_experience: List[Dict[str, Any]], job_min_years:
         return "Partial"
     else:
         return "Below"
+
+
+def check_experience_fit(resume_experience: List[Dict[str, Any]], job_min_years: int) -> str:
+    """
+    Calculates total years of experience and compares with job requirement.
+    Durations are parsed as at parse time (overlaps counted once); entries
+    with only {"years": n} count as given.
+    Returns "Exceeds", "Matches", "Partial", or "Below".
+    """
+    copy = {"experiences": [dict(e) for e in resume_experience if isinstance(e, dict)]}
+    return experience_alignment(annotate_experience(copy)["experience_total"]["years"], job_min_years)
+
+
+def resume_experience_fit(resume_parsed: Dict[str, Any], posting_parsed: Dict[str, Any]) -> str:
+    return experience_alignment(experience_years(resume_parsed), posting_min_years(posting_parsed))
@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from logic.scoring import WeightProfile, get_profile
+from logic.skill_index import get_skill_index, resume_skill_ids
+
+
+def to_bitset(skill_ids: Iterable[int]) -> int:
+    mask = 0
+    for skill_id in skill_ids:
+        mask |= 1 << skill_id
+    return mask
+
+
+def bitset_names(mask: int) -> List[str]:
+    index = get_skill_index()
+    names = []
+    while mask:
+        low = mask & -mask
+        names.append(index.canonical_name(low.bit_length() - 1))
+        mask ^= low
+    return names
+
+
+class CandidateIndex:
+    """
+    In-process index of resume skill sets for "best candidates for this
+    posting" queries.
+    Each resume is one bitset over skill IDs (bit i set = skill i present),
+    kept in parallel arrays with a free list so updates and deletes never
+    shift other slots. Scoring a candidate is two ANDs and two popcounts.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._resume_ids: List[Optional[str]] = []
+        self._masks: List[int] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._reload_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def upsert(self, resume_id: str, skill_ids: FrozenSet[int]):
+        mask = to_bitset(skill_ids)
+        with self._lock:
+            slot = self._slots.get(resume_id)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                    self._resume_ids[slot] = resume_id
+                    self._masks[slot] = mask
+                else:
+                    slot = len(self._masks)
+                    self._resume_ids.append(resume_id)
+                    self._masks.append(mask)
+                self._slots[resume_id] = slot
+            else:
+                self._masks[slot] = mask
+
+    def upsert_parsed(self, resume_id: str, parsed_data: Optional[Dict[str, Any]]):
+        self.upsert(resume_id, resume_skill_ids(parsed_data or {}, intern=True))
+
+    def remove(self, resume_id: str):
+        with self._lock:
+            slot = self._slots.pop(resume_id, None)
+            if slot is not None:
+                self._resume_ids[slot] = None
+                self._masks[slot] = 0
+                self._free.append(slot)
+
+    def load(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Replaces the index contents with (id, parsed_data) rows.
+        """
+        resume_ids: List[Optional[str]] = []
+        masks: List[int] = []
+        for row in rows:
+            resume_ids.append(row["id"])
+            masks.append(to_bitset(resume_skill_ids(row.get("parsed_data") or {}, intern=True)))
+        with self._lock:
+            self._resume_ids = resume_ids
+            self._masks = masks
+            self._slots = {rid: slot for slot, rid in enumerate(resume_ids)}
+            self._free = []
+            self._loaded_at = time.monotonic()
+
+    def _get_reload_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._reload_loop is not loop:
+            self._reload_loop, self._reload_lock = loop, asyncio.Lock()
+        return self._reload_lock
+
+    async def ensure_loaded(self, fetch_rows: Callable[[], Awaitable[Iterable[Dict[str, Any]]]]):
+        """
+        Reloads from fetch_rows once the TTL has passed. Concurrent callers
+        share one reload: the first to take the lock fetches, and the rest
+        find the index fresh when they get it.
+        """
+        if not self.is_stale():
+            return
+        async with self._get_reload_lock():
+            if self.is_stale():
+                self.load(await fetch_rows())
+
+    def top_k(
+        self,
+        required_ids: FrozenSet[int],
+        preferred_ids: FrozenSet[int],
+        k: int = 20,
+        profile: Optional[WeightProfile] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The k resumes with the highest weighted skill coverage. Required and
+        preferred skills are weighted in the proportion profile gives them
+        (the active scoring profile by default); experience is not indexed.
+        """
+        required = to_bitset(required_ids)
+        preferred = to_bitset(preferred_ids)
+        required_count = required.bit_count()
+        preferred_count = preferred.bit_count()
+        if not required_count and not preferred_count:
+            return []
+        if not preferred_count:
+            req_w, pref_w = 1.0 / required_count, 0.0
+        elif not required_count:
+            req_w, pref_w = 0.0, 1.0 / preferred_count
+        else:
+            profile = profile or get_profile()
+            skill_weight = profile.required_skills + profile.preferred_skills
+            req_w = profile.required_skills / skill_weight / required_count
+            pref_w = profile.preferred_skills / skill_weight / preferred_count
+
+        # Skills with no weight cannot lift a candidate above zero.
+        relevant = (required if req_w else 0) | (preferred if pref_w else 0)
+        with self._lock:
+            resume_ids = list(self._resume_ids)
+            masks = list(self._masks)
+
+        scored = (
+            ((mask & required).bit_count() * req_w + (mask & preferred).bit_count() * pref_w, slot)
+            for slot, mask in enumerate(masks)
+            if resume_ids[slot] is not None and mask & relevant
+        )
+        results = []
+        for score, slot in heapq.nlargest(k, scored):
+            mask = masks[slot]
+            results.append(
+                {
+                    "resume_id": resume_ids[slot],
+                    "score": int(round(score * 100)),
+                    "matched_required": bitset_names(mask & required),
+                    "matched_preferred": bitset_names(mask & preferred),
+                    "missing_required": bitset_names(required & ~mask),
+                }
+            )
+        return results
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+_candidate_index: Optional[CandidateIndex] = None
+
+
+def get_candidate_index() -> CandidateIndex:
+    global _candidate_index
+    if _candidate_index is None:
+        _candidate_index = CandidateIndex(
+            ttl_seconds=float(os.getenv("CANDIDATE_INDEX_TTL_SECONDS", "300"))
+        )
+    return _candidate_index
+
+
+def _reset_candidate_index():
+    global _candidate_index
+    _candidate_index = None
@@ -0,0 +1,110 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional, Set
+
+from logic.experience import experience_years, posting_min_years, resume_experience_fit
+from logic.scoring import WeightProfile, category_scores, coverage, fit_fraction, select_profile, to_scores
+from logic.screening import preferred_coverage
+from logic.skill_index import skill_names
+from logic.skills import compare_skills
+
+# Which score components read which hashed inputs.
+COMPONENT_INPUTS = {
+    "skill_fit": (("resume", "skills"), ("posting", "required_skills"), ("posting", "preferred_skills")),
+    "experience": (("resume", "experience"), ("posting", "min_experience")),
+}
+
+def content_hash(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+def resume_hashes(parsed: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "skills": content_hash(skill_names(parsed.get("skills", []))),
+        "experience": content_hash(experience_years(parsed)),
+    }
+
+def posting_hashes(parsed: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "required_skills": content_hash(skill_names(parsed.get("required_skills", []))),
+        "preferred_skills": content_hash(skill_names(parsed.get("preferred_skills", []))),
+        "min_experience": content_hash(posting_min_years(parsed)),
+    }
+
+def input_hashes(resume_parsed: Dict[str, Any], posting_parsed: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    The per-field hashes a resume/posting analysis depends on, stored on the
+    analyses row so later edits can tell which components they invalidate.
+    """
+    return {"resume": resume_hashes(resume_parsed), "posting": posting_hashes(posting_parsed)}
+
+def memo_key(hashes: Dict[str, Dict[str, str]], profile: WeightProfile) -> str:
+    """
+    Identifies an analysis result by its inputs and the scoring profile, so
+    a repeat request for an unchanged pair can reuse the stored row.
+    """
+    return content_hash({"inputs": hashes, "profile": profile.key})
+
+def changed_components(recorded: Optional[Dict[str, Any]], current: Dict[str, Dict[str, str]]) -> Set[str]:
+    """
+    Components whose inputs differ between the hashes recorded on an
+    analysis and the current documents. Rows without recorded hashes
+    predate tracking and are treated as fully changed.
+    """
+    if not recorded:
+        return set(COMPONENT_INPUTS)
+    return {
+        component
+        for component, inputs in COMPONENT_INPUTS.items()
+        if any((recorded.get(side) or {}).get(name) != current[side][name] for side, name in inputs)
+    }
+
+def recompute_analysis(
+    analysis: Dict[str, Any], resume_parsed: Dict[str, Any], posting_parsed: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Fields to write back to a stale analysis, recomputing only the changed
+    components and reusing the stored result of the others. Returns None
+    when nothing the analysis depends on has changed.
+    """
+    current = input_hashes(resume_parsed, posting_parsed)
+    changed = changed_components(analysis.get("input_hashes"), current)
+    if not changed:
+        return None
+
+    stored = analysis.get("category_scores") or {}
+    if "experience_alignment" not in stored:
+        changed.add("experience")
+    semantic = bool(stored.get("semantic")) and "skill_fit" not in changed
+    profile = select_profile(posting_parsed)
+
+    fit_items = analysis.get("fit_items") or []
+    gap_items = analysis.get("gap_items") or []
+    if "skill_fit" in changed:
+        # Semantic evidence is not recomputed here; the new fit is exact/alias only.
+        fit_items, gap_items = compare_skills(
+            skill_names(resume_parsed.get("skills", [])),
+            skill_names(posting_parsed.get("required_skills", [])),
+        )
+        preferred = preferred_coverage(resume_parsed, posting_parsed)
+    else:
+        preferred = stored.get("preferred_skills")
+    required = coverage(len(fit_items), len(fit_items) + len(gap_items))
+
+    if "experience" in changed:
+        alignment = resume_experience_fit(resume_parsed, posting_parsed)
+    else:
+        alignment = stored["experience_alignment"]
+
+    scores = category_scores(required, preferred, alignment, profile)
+    if semantic:
+        scores["semantic"] = True
+    return {
+        "overall_score": to_scores([fit_fraction(required, preferred, alignment, profile)])[0],
+        "fit_items": fit_items,
+        "gap_items": gap_items,
+        "category_scores": scores,
+        "input_hashes": current,
+        "memo_key": None if semantic else memo_key(current, profile),
+        "stale": False,
+    }
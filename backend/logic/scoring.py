@@ -0,0 +1,154 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EXPERIENCE_LEVELS = {"Exceeds": 1.0, "Matches": 1.0, "Partial": 0.5, "Below": 0.0}
+
+# Columns of the candidates x criteria matrix, in weight order.
+CRITERIA = ("required_skills", "preferred_skills", "experience")
+
+@dataclass(frozen=True)
+class WeightProfile:
+    """
+    One versioned fit formula: a weight per criterion (summing to 1) and the
+    level each experience alignment contributes. Profiles are immutable;
+    changing a formula means registering a new version, so stored scores
+    stay reproducible from the key recorded with them.
+    """
+    name: str
+    version: int
+    required_skills: float
+    preferred_skills: float
+    experience: float
+    experience_levels: Dict[str, float] = field(default_factory=lambda: dict(EXPERIENCE_LEVELS))
+    job_families: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    @property
+    def weights(self) -> np.ndarray:
+        return np.array([self.required_skills, self.preferred_skills, self.experience])
+
+    def experience_level(self, alignment: str) -> float:
+        return self.experience_levels.get(alignment, 0.0)
+
+_profiles: Dict[str, WeightProfile] = {}
+
+def register_profile(profile: WeightProfile) -> WeightProfile:
+    if abs(sum(profile.weights) - 1.0) > 1e-9:
+        raise ValueError(f"Weights of {profile.key} must sum to 1")
+    _profiles[profile.key] = profile
+    return profile
+
+DEFAULT_PROFILE = register_profile(WeightProfile("default", 1, 0.7, 0.0, 0.3))
+register_profile(
+    WeightProfile(
+        "engineering", 1, 0.6, 0.1, 0.3,
+        job_families=("engineering", "software", "data", "개발"),
+    )
+)
+
+def get_profile(key: Optional[str] = None) -> WeightProfile:
+    """
+    The profile registered under key, else the one named by SCORING_PROFILE
+    (for trying a formula on a deployment), else the default.
+    """
+    key = key or os.getenv("SCORING_PROFILE") or DEFAULT_PROFILE.key
+    if key not in _profiles:
+        raise ValueError(f"Unknown scoring profile: {key}")
+    return _profiles[key]
+
+def select_profile(posting_parsed: Dict[str, Any]) -> WeightProfile:
+    """
+    The newest profile registered for the posting's job family, falling
+    back to get_profile().
+    """
+    family = str(posting_parsed.get("job_family") or "").strip().lower()
+    if family:
+        matches = [p for p in _profiles.values() if family in p.job_families]
+        if matches:
+            return max(matches, key=lambda p: p.version)
+    return get_profile()
+
+def coverage(matched: int, total: int) -> float:
+    return matched / total if total else 1.0
+
+def criteria_row(
+    required_coverage: float,
+    preferred_coverage: Optional[float],
+    experience_alignment: str,
+    profile: WeightProfile,
+) -> List[float]:
+    """
+    One candidate's CRITERIA values. preferred_coverage is None when the
+    posting lists no preferred skills; required coverage stands in, so the
+    preferred weight is neither a free bonus nor a penalty.
+    """
+    if preferred_coverage is None:
+        preferred_coverage = required_coverage
+    return [required_coverage, preferred_coverage, profile.experience_level(experience_alignment)]
+
+def evaluate(criteria: Sequence[Sequence[float]], profile: WeightProfile) -> np.ndarray:
+    """
+    Fit fractions (0-1) for a candidates x CRITERIA matrix, as one
+    matrix-vector product.
+    """
+    matrix = np.asarray(criteria, dtype=np.float64).reshape(-1, len(CRITERIA))
+    return matrix @ profile.weights
+
+def to_scores(fractions: np.ndarray) -> List[int]:
+    return [int(s) for s in np.rint(np.asarray(fractions) * 100)]
+
+def fit_fraction(
+    required_coverage: float,
+    preferred_coverage: Optional[float],
+    experience_alignment: str,
+    profile: Optional[WeightProfile] = None,
+) -> float:
+    profile = profile or get_profile()
+    row = criteria_row(required_coverage, preferred_coverage, experience_alignment, profile)
+    return float(evaluate([row], profile)[0])
+
+def category_scores(
+    required_coverage: float,
+    preferred_coverage: Optional[float],
+    experience_alignment: str,
+    profile: WeightProfile,
+) -> Dict[str, Any]:
+    """
+    The per-criterion inputs of a score and the profile that weighted them,
+    as stored in analyses.category_scores.
+    """
+    return {
+        "profile": profile.key,
+        "required_skills": required_coverage,
+        "preferred_skills": preferred_coverage,
+        "experience_alignment": experience_alignment,
+    }
+
+# Single-document scores rate how complete a resume or posting is when
+# there is nothing to match it against.
+
+def posting_completeness_score(skill_count: int, raw_text_length: int, has_min_experience: bool) -> int:
+    score = 40
+    if skill_count >= 5:
+        score += 20
+    if raw_text_length >= 500:
+        score += 20
+    if has_min_experience:
+        score += 10
+    return min(100, score)
+
+def resume_completeness_score(skill_count: int, has_experience: bool, raw_text_length: int) -> int:
+    score = 40
+    if skill_count >= 5:
+        score += 20
+    if has_experience:
+        score += 20
+    if raw_text_length >= 500:
+        score += 20
+    return min(100, score)
@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional
+
+from logic.experience import resume_experience_fit
+from logic.recommendations import generate_recommendations
+from logic.scoring import (
+    WeightProfile,
+    category_scores,
+    coverage,
+    criteria_row,
+    evaluate,
+    select_profile,
+    to_scores,
+)
+from logic.skill_index import get_skill_index, posting_skill_ids, resume_skill_ids, skill_names
+
+def score_signal(overall_score: int) -> str:
+    if overall_score >= 80:
+        return "green"
+    if overall_score >= 40:
+        return "yellow"
+    return "red"
+
+def preferred_coverage(resume_parsed: Dict[str, Any], posting_parsed: Dict[str, Any]) -> Optional[float]:
+    """
+    Share of the posting's preferred skills the resume has, or None when the
+    posting lists none.
+    """
+    preferred_ids = posting_skill_ids(posting_parsed, "preferred")
+    if not preferred_ids:
+        return None
+    return coverage(len(preferred_ids & resume_skill_ids(resume_parsed)), len(preferred_ids))
+
+def screen_resumes(
+    posting_parsed: Dict[str, Any],
+    resumes_parsed: List[Dict[str, Any]],
+    profile: Optional[WeightProfile] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scores many parsed resumes against one parsed posting.
+    Posting skills are resolved to skill IDs once for the batch; each resume
+    contributes the ID set precomputed at parse time, so matching is a set
+    membership test. Matched/missing skills use the posting's wording.
+    All scores come from one evaluation of the candidates x criteria matrix.
+    Results keep the input order; callers rank them.
+    """
+    profile = profile or select_profile(posting_parsed)
+    index = get_skill_index()
+    job_skills = skill_names(posting_parsed.get("required_skills", []))
+    job_ids = [(index.skill_id(js), js) for js in job_skills]
+    preferred_ids = posting_skill_ids(posting_parsed, "preferred")
+
+    results = []
+    criteria = []
+    for parsed in resumes_parsed:
+        resume_ids = resume_skill_ids(parsed)
+        matched = [js for jid, js in job_ids if jid in resume_ids]
+        missing = [js for jid, js in job_ids if jid not in resume_ids]
+        alignment = resume_experience_fit(parsed, posting_parsed)
+        required_coverage = coverage(len(matched), len(job_skills))
+        preferred_coverage = (
+            coverage(len(preferred_ids & resume_ids), len(preferred_ids)) if preferred_ids else None
+        )
+        criteria.append(criteria_row(required_coverage, preferred_coverage, alignment, profile))
+        results.append(
+            {
+                "matched_skills": matched,
+                "missing_skills": missing,
+                "recommendations": generate_recommendations(missing),
+                "experience_alignment": alignment,
+                "category_scores": category_scores(
+                    required_coverage, preferred_coverage, alignment, profile
+                ),
+            }
+        )
+
+    scores = to_scores(evaluate(criteria, profile)) if criteria else []
+    for result, overall_score in zip(results, scores):
+        result["overall_score"] = overall_score
+        result["signal"] = score_signal(overall_score)
+    return results
@@ -0,0 +1,188 @@
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+HASH_DIM = 512
+
+_TOKEN_RE = re.compile(r"[\w+#]+")
+
+
+class HashingEmbedder:
+    """
+    Dependency-free local embedder: word tokens plus character trigrams,
+    hashed into a fixed-size vector. It captures spelling and inflection
+    overlap ("design" / "designed") but not true synonyms; install
+    sentence-transformers and set SEMANTIC_MODEL for that.
+    """
+
+    name = "hashing-v1"
+    default_threshold = 0.6
+
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+
+    def _features(self, phrase: str) -> List[str]:
+        text = unicodedata.normalize("NFKC", phrase).casefold()
+        features = []
+        for token in _TOKEN_RE.findall(text):
+            features.append(f"w:{token}")
+            padded = f"<{token}>"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, phrases: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(phrases), self.dim), dtype=np.float32)
+        for row, phrase in enumerate(phrases):
+            for feature in self._features(phrase):
+                weight = 2.0 if feature.startswith("w:") else 1.0
+                matrix[row, zlib.crc32(feature.encode("utf-8")) % self.dim] += weight
+        return matrix
+
+
+class SentenceTransformerEmbedder:
+    """
+    Small local CPU model (e.g. paraphrase-multilingual-MiniLM-L12-v2) via
+    the optional sentence-transformers package.
+    """
+
+    default_threshold = 0.6
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self._model = SentenceTransformer(model_name, device="cpu")
+
+    def embed(self, phrases: List[str]) -> np.ndarray:
+        return np.asarray(self._model.encode(phrases, batch_size=64), dtype=np.float32)
+
+
+class EmbeddingStore:
+    """
+    Memoizes one unit-length vector per phrase in a growable NumPy matrix.
+    Only phrases never seen before are sent to the embedder, in one batch.
+    The memo is dropped once it would exceed max_phrases, which bounds its
+    memory at max_phrases * dim * 4 bytes.
+    """
+
+    def __init__(self, embedder, initial_capacity: int = 1024, max_phrases: int = 10000):
+        self.embedder = embedder
+        self.max_phrases = max_phrases
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._capacity = initial_capacity
+        self._lock = threading.Lock()
+
+    def _append(self, vectors: np.ndarray) -> int:
+        start = len(self._rows)
+        needed = start + len(vectors)
+        if self._matrix is None:
+            self._matrix = np.zeros((max(self._capacity, needed), vectors.shape[1]), dtype=np.float32)
+        elif needed > self._matrix.shape[0]:
+            grown = np.zeros((max(needed, self._matrix.shape[0] * 2), self._matrix.shape[1]), dtype=np.float32)
+            grown[:start] = self._matrix[:start]
+            self._matrix = grown
+        self._matrix[start:needed] = vectors
+        return start
+
+    def vectors(self, phrases: List[str]) -> np.ndarray:
+        with self._lock:
+            new = [p for p in dict.fromkeys(phrases) if p not in self._rows]
+            if new and len(self._rows) + len(new) > self.max_phrases:
+                self._rows = {}
+                self._matrix = None
+                new = list(dict.fromkeys(phrases))
+            if new:
+                vectors = self.embedder.embed(new).astype(np.float32)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors = vectors / np.where(norms == 0, 1.0, norms)
+                start = self._append(vectors)
+                for offset, phrase in enumerate(new):
+                    self._rows[phrase] = start + offset
+            return self._matrix[[self._rows[p] for p in phrases]]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def semantic_matches(
+    store: EmbeddingStore,
+    job_phrases: List[str],
+    resume_phrases: List[str],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    For each job phrase, finds the most similar resume phrase with one
+    matrix product. Returns one entry per job phrase with the best evidence,
+    its cosine similarity and whether it clears the threshold.
+    """
+    if not job_phrases:
+        return []
+    if not resume_phrases:
+        return [{"item": p, "evidence": None, "similarity": 0.0, "matched": False} for p in job_phrases]
+
+    similarities = store.vectors(job_phrases) @ store.vectors(resume_phrases).T
+    best = similarities.argmax(axis=1)
+    results = []
+    for row, phrase in enumerate(job_phrases):
+        score = float(similarities[row, best[row]])
+        results.append(
+            {
+                "item": phrase,
+                "evidence": resume_phrases[best[row]],
+                "similarity": round(score, 4),
+                "matched": score >= threshold,
+            }
+        )
+    return results
+
+
+def resume_phrases(parsed_data: Dict[str, Any]) -> List[str]:
+    """
+    Short phrases from a parsed resume that can serve as evidence for a
+    requirement: skills, keywords, experience titles and achievements.
+    """
+    phrases: List[str] = []
+    for skill in parsed_data.get("skills") or []:
+        name = skill.get("name") if isinstance(skill, dict) else skill
+        if isinstance(name, str):
+            phrases.append(name)
+    phrases.extend(k for k in parsed_data.get("keywords") or [] if isinstance(k, str))
+    for exp in parsed_data.get("experiences") or []:
+        if isinstance(exp, dict):
+            if exp.get("title"):
+                phrases.append(exp["title"])
+            phrases.extend(a for a in exp.get("achievements") or [] if isinstance(a, str))
+    return [p.strip() for p in dict.fromkeys(phrases) if p and p.strip()]
+
+
+_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            model_name = os.getenv("SEMANTIC_MODEL")
+            embedder = SentenceTransformerEmbedder(model_name) if model_name else HashingEmbedder()
+            _store = EmbeddingStore(embedder)
+    return _store
+
+
+def get_semantic_threshold() -> float:
+    val = os.getenv("SEMANTIC_MATCH_THRESHOLD")
+    try:
+        return float(val) if val else get_embedding_store().embedder.default_threshold
+    except ValueError:
+        return get_embedding_store().embedder.default_threshold
+
+
+def _reset_embedding_store():
+    global _store
+    _store = None
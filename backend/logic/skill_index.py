@@ -0,0 +1,218 @@
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
+
+# Bump when the vocabulary or the normalizer changes so stored skill keys are
+# recomputed instead of trusted.
+VOCAB_VERSION = 1
+
+# Canonical skill name -> aliases seen in resumes and postings.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "Python": ["파이썬", "py"],
+    "Java": ["자바"],
+    "JavaScript": ["JS", "자바스크립트", "ECMAScript", "ES6"],
+    "TypeScript": ["TS", "타입스크립트"],
+    "Go": ["Golang"],
+    "Kotlin": ["코틀린"],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Node.js": ["Node", "NodeJS"],
+    "React": ["React.js", "ReactJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Next.js": ["NextJS"],
+    "Spring": ["Spring Framework", "스프링"],
+    "Spring Boot": ["SpringBoot", "스프링부트", "스프링 부트"],
+    "Django": ["장고"],
+    "FastAPI": [],
+    "PostgreSQL": ["Postgres", "psql", "포스트그레스"],
+    "MySQL": [],
+    "MongoDB": ["Mongo"],
+    "Redis": ["레디스"],
+    "Elasticsearch": ["Elastic Search"],
+    "Kafka": ["Apache Kafka", "카프카"],
+    "Docker": ["도커"],
+    "Kubernetes": ["k8s", "쿠버네티스"],
+    "AWS": ["Amazon Web Services", "아마존 웹 서비스"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Azure": ["Microsoft Azure"],
+    "CI/CD": ["CICD"],
+    "Git": ["깃"],
+    "REST API": ["RESTful API", "REST", "RESTful"],
+    "GraphQL": [],
+    "Machine Learning": ["ML", "머신러닝", "기계학습"],
+    "Deep Learning": ["DL", "딥러닝"],
+    "SQL": [],
+}
+
+# Keep "+" and "#" (C++, C#) but drop separators that only vary in spelling:
+# "Node.js", "node js" and "NodeJS" all normalize to "nodejs".
+_SEPARATORS_RE = re.compile(r"[\s\.\-_·]+")
+
+
+def normalize_skill(name: str) -> str:
+    return _SEPARATORS_RE.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+# An interned integer ID, or the normalized key of a name that was never
+# interned. Both compare equal only to the same skill.
+SkillId = Union[int, str]
+
+
+class SkillIndex:
+    """
+    Skill vocabulary with interned integer IDs.
+    Known aliases resolve to their canonical skill's ID. Other names get a
+    permanent ID only when interned explicitly (names from stored documents,
+    which the candidate bitsets need); ad-hoc names from request bodies are
+    matched by their normalized key, so they never grow the index. IDs are
+    process-local, so persisted data stores normalized keys instead.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]]):
+        self._lock = threading.Lock()
+        self._key_to_id: Dict[str, int] = {}
+        self._names: List[str] = []
+        for canonical, alias_list in aliases.items():
+            skill_id = self._intern(normalize_skill(canonical), canonical)
+            for alias in alias_list:
+                self._key_to_id.setdefault(normalize_skill(alias), skill_id)
+
+    def _intern(self, key: str, display_name: str) -> int:
+        skill_id = self._key_to_id.get(key)
+        if skill_id is None:
+            skill_id = len(self._names)
+            self._names.append(display_name)
+            self._key_to_id[key] = skill_id
+        return skill_id
+
+    def skill_id(self, name: str, intern: bool = False) -> Optional[SkillId]:
+        """
+        The name's integer ID if it is known (or intern is set), else its
+        normalized key.
+        """
+        key = normalize_skill(name)
+        if not key:
+            return None
+        skill_id = self._key_to_id.get(key)
+        if skill_id is None:
+            if not intern:
+                return key
+            with self._lock:
+                skill_id = self._intern(key, name.strip())
+        return skill_id
+
+    def canonical_key(self, name: str) -> Optional[str]:
+        skill_id = self.skill_id(name)
+        if isinstance(skill_id, int):
+            return normalize_skill(self._names[skill_id])
+        return skill_id
+
+    def canonical_name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def ids(self, names: Iterable[str], intern: bool = False) -> FrozenSet[SkillId]:
+        return frozenset(i for i in (self.skill_id(n, intern) for n in names) if i is not None)
+
+    def id_map(self, names: Iterable[str]) -> Dict[SkillId, str]:
+        """
+        Maps skill IDs to the first name that produced them, so matches can be
+        reported in the document's own wording.
+        """
+        mapping: Dict[int, str] = {}
+        for name in names:
+            skill_id = self.skill_id(name)
+            if skill_id is not None:
+                mapping.setdefault(skill_id, name)
+        return mapping
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+_index = SkillIndex(SKILL_ALIASES)
+
+
+def get_skill_index() -> SkillIndex:
+    return _index
+
+
+def skill_names(skills: List[Any]) -> List[str]:
+    """
+    Returns skill names from either plain strings or parsed skill objects
+    ({"name": ..., ...}) as stored in parsed_data.
+    """
+    names = []
+    for skill in skills or []:
+        if isinstance(skill, dict):
+            skill = skill.get("name")
+        if isinstance(skill, str) and skill.strip():
+            names.append(skill)
+    return names
+
+
+def _keys(names: List[str]) -> List[str]:
+    keys = []
+    for name in names:
+        key = _index.canonical_key(name)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def annotate_resume(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Adds normalized skill keys to resume parsed_data so later analyses can
+    skip normalization.
+    """
+    parsed_data["skill_index"] = {
+        "version": VOCAB_VERSION,
+        "skills": _keys(skill_names(parsed_data.get("skills", []))),
+    }
+    return parsed_data
+
+
+def annotate_posting(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Adds normalized required/preferred skill keys to posting parsed_data.
+    """
+    parsed_data["skill_index"] = {
+        "version": VOCAB_VERSION,
+        "required": _keys(skill_names(parsed_data.get("required_skills", []))),
+        "preferred": _keys(skill_names(parsed_data.get("preferred_skills", []))),
+    }
+    return parsed_data
+
+
+def stored_skill_ids(
+    parsed_data: Dict[str, Any], field: str, intern: bool = False
+) -> Optional[FrozenSet[SkillId]]:
+    """
+    Returns the skill IDs precomputed at parse time for `field` ("skills",
+    "required" or "preferred"), or None when they are missing or stale.
+    """
+    stored = parsed_data.get("skill_index") or {}
+    if stored.get("version") != VOCAB_VERSION or field not in stored:
+        return None
+    return _index.ids(stored[field], intern)
+
+
+def resume_skill_ids(parsed_data: Dict[str, Any], intern: bool = False) -> FrozenSet[SkillId]:
+    """
+    Skill IDs for a resume. Pass intern=True only for stored resumes that
+    need integer IDs (the candidate index).
+    """
+    stored = stored_skill_ids(parsed_data, "skills", intern)
+    if stored is not None:
+        return stored
+    return _index.ids(skill_names(parsed_data.get("skills", [])), intern)
+
+
+def posting_skill_ids(parsed_data: Dict[str, Any], field: str, intern: bool = False) -> FrozenSet[SkillId]:
+    """
+    Skill IDs for a posting's "required" or "preferred" skills.
+    """
+    stored = stored_skill_ids(parsed_data, field, intern)
+    if stored is not None:
+        return stored
+    return _index.ids(skill_names(parsed_data.get(f"{field}_skills", [])), intern)
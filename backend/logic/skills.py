@@ -1,19 +1,32 @@
 from typing import List, Tuple
 
+from logic.skill_index import get_skill_index
+
+def compare_skills_many(
+    resume_skill_lists: List[List[str]],
+    job_skills: List[str],
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    Compares many resumes against the same job skills.
+    Names are resolved to skill IDs through the skill index, so case,
+    spelling variants and known aliases ("Postgres" / "PostgreSQL") match.
+    The job side is resolved once for the whole batch.
+    Returns one (matched_skills, missing_skills) pair per resume.
+    """
+    index = get_skill_index()
+    job_ids = [(index.skill_id(js), js) for js in job_skills]
+
+    results = []
+    for resume_skills in resume_skill_lists:
+        resume_ids = index.id_map(resume_skills)
+        matched = [resume_ids[jid] for jid, _ in job_ids if jid in resume_ids]
+        missing = [js for jid, js in job_ids if jid not in resume_ids]
+        results.append((matched, missing))
+    return results
+
 def compare_skills(resume_skills: List[str], job_skills: List[str]) -> Tuple[List[str], List[str]]:
     """
-    Compares resume skills against job skills (case-insensitive).
+    Compares resume skills against job skills (case-insensitive, alias-aware).
     Returns (matched_skills, missing_skills).
     """
-    resume_skills_lower = {s.lower(): s for s in resume_skills}
-    
-    matched = []
-    missing = []
-    
-    for js in job_skills:
-        if js.lower() in resume_skills_lower:
-            matched.append(resume_skills_lower[js.lower()])
-        else:
-            missing.append(js)
-            
-    return matched, missing
+    return compare_skills_many([resume_skills], job_skills)[0]
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Depends, Security, HTTPException, UploadFile, File, Form, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from core.auth import verify_api_key
+from core.config import get_int_env
+from core.errors import FitGapException
 from core.security import (
     create_access_token,
     create_refresh_token,
@@ -19,19 +21,85 @@ from models.analysis import AnalysisInput, AnalysisOutput
 from models.resume import ResumeParsedData
 from models.posting import PostingParsedData
 from logic.skills import compare_skills
-from logic.experience import check_experience_fit
+from logic.skill_index import (
+    annotate_posting,
+    annotate_resume,
+    get_skill_index,
+    posting_skill_ids,
+    resume_skill_ids,
+    skill_names,
+)
+from logic.matching_index import get_candidate_index
+from logic.semantic import get_embedding_store, get_semantic_threshold, resume_phrases, semantic_matches
+from logic.screening import preferred_coverage, score_signal, screen_resumes
+from logic.scoring import (
+    category_scores,
+    coverage,
+    fit_fraction,
+    posting_completeness_score,
+    resume_completeness_score,
+    select_profile,
+    to_scores,
+)
+from logic.experience import (
+    annotate_experience,
+    annotate_posting_experience,
+    experience_years,
+    posting_min_years,
+    resume_experience_fit,
+)
 from logic.recommendations import generate_recommendations
-from core.pdf import extract_text_from_pdf
-from core.llm import parse_resume_with_llm, parse_posting_with_llm
-from core.database import get_supabase_client
+from logic.reanalysis import input_hashes, memo_key, posting_hashes, recompute_analysis, resume_hashes
+from core.pdf import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_PAGES,
+    InvalidPdfError,
+    PdfExtractionError,
+    PdfExtractionTimeoutError,
+    PdfTooLargeError,
+    PdfTooManyPagesError,
+    extract_pdf_text,
+    get_pdf_engine,
+    read_upload,
+)
+from core.llm import (
+    parse_resume_with_llm,
+    parse_posting_with_llm,
+    parse_postings_with_llm,
+    stream_resume_with_llm,
+    llm_stats,
+    is_transient_error,
+    parse_error_code,
+    LLMTimeoutError,
+)
+from core.database import close_async_supabase_client
+from core.repository import get_repository
+from core.parse_cache import get_parse_cache
+from core.jobs import get_job_queue
+import asyncio
+import json
+import logging
 import os
-from datetime import datetime, timezone
-import shutil
-import tempfile
-from typing import Optional, Dict, Any, Literal
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Literal
 from uuid import UUID
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_pdf_engine().start()
+    get_job_queue().start()
+    if os.getenv("SEMANTIC_MODEL"):
+        # Warm the embedding model in the background; requests that need it
+        # first wait in their worker thread, not on the event loop.
+        asyncio.get_running_loop().run_in_executor(None, get_embedding_store)
+    yield
+    await get_job_queue().stop()
+    get_pdf_engine().shutdown()
+    await close_async_supabase_client()
+
+app = FastAPI(lifespan=lifespan)
 
 _allowed_origins = os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:3000").split(",")
 app.add_middleware(
@@ -42,20 +110,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def _get_int_env(name: str, default: int) -> int:
-    val = os.getenv(name)
-    if not val:
-        return default
-    try:
-        return int(val)
-    except ValueError:
-        return default
-
 # --- Schemas for Requests ---
 class PostingCreate(BaseModel):
     company_name: Optional[str] = None
     raw_text: str
 
+class PostingImport(BaseModel):
+    owner_id: Optional[UUID] = None
+    postings: List[PostingCreate]
+
 class PostingUpdate(BaseModel):
     company_name: Optional[str] = None
     raw_text: Optional[str] = None
@@ -72,6 +135,21 @@ class ResumeTextUpdate(BaseModel):
 class AnalysisRequest(BaseModel):
     resume_id: Optional[UUID] = None
     posting_id: Optional[UUID] = None
+    semantic: bool = False
+    force: bool = False
+
+class BatchResumeInput(BaseModel):
+    ref: Optional[str] = None
+    parsed_data: Dict[str, Any]
+
+class BatchAnalysisRequest(BaseModel):
+    posting_id: UUID
+    resume_ids: List[UUID] = []
+    resumes: List[BatchResumeInput] = []
+
+class LatestAnalysesRequest(BaseModel):
+    resume_ids: List[UUID] = []
+    posting_ids: List[UUID] = []
 
 class AnalysisRead(BaseModel):
     analysis_id: UUID
@@ -88,13 +166,6 @@ class OnboardingComplete(BaseModel):
 
     model_config = {"populate_by_name": True}
 
-# Custom exception for our standardized error format
-class FitGapException(Exception):
-    def __init__(self, code: str, message: str, status_code: int = 400):
-        self.code = code
-        self.message = message
-        self.status_code = status_code
-
 @app.exception_handler(FitGapException)
 async def fitgap_exception_handler(request: Request, exc: FitGapException):
     return JSONResponse(
@@ -115,6 +186,46 @@ def success_response(data: dict, status_code: int = 200):
         content={"success": True, "data": data}
     )
 
+# Public field name -> column, for `fields=` projections. Aliased columns use
+# PostgREST's "alias:column" syntax so rows come back already renamed.
+_RESUME_FIELDS = {
+    "resume_id": "id",
+    "raw_text": "raw_text",
+    "parsed_data": "parsed_data",
+    "is_stored": "is_stored",
+    "parse_error": "parse_error",
+    "created_at": "created_at",
+}
+_RESUME_DEFAULT_FIELDS = ["resume_id", "parsed_data", "created_at"]
+_POSTING_FIELDS = {
+    "posting_id": "id",
+    "company_name": "company_name",
+    "raw_text": "raw_text",
+    "parsed_data": "parsed_data",
+    "parse_error": "parse_error",
+    "created_at": "created_at",
+}
+_POSTING_DEFAULT_FIELDS = ["posting_id", "company_name", "parsed_data", "created_at"]
+_ANALYSIS_SUMMARY_COLUMNS = "id, overall_score, created_at"
+
+def _select_fields(fields: Optional[str], allowed: Dict[str, str], default: List[str]):
+    """
+    Resolves a comma-separated `fields=` query parameter against an endpoint's
+    public field names. Returns (field names, PostgREST select string).
+    """
+    names = default
+    if fields:
+        names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in names if f not in allowed]
+        if unknown or not names:
+            raise FitGapException(
+                "INVALID_REQUEST",
+                f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+                400,
+            )
+    columns = ", ".join(name if allowed[name] == name else f"{name}:{allowed[name]}" for name in names)
+    return names, columns
+
 def _set_refresh_cookie(response, refresh_token: str):
     cookie_opts = get_cookie_settings()
     response.set_cookie("refresh_token", refresh_token, httponly=True, **cookie_opts)
@@ -123,26 +234,272 @@ def _clear_refresh_cookie(response):
     cookie_opts = get_cookie_settings()
     response.delete_cookie("refresh_token", **cookie_opts)
 
+_CANDIDATE_PAGE_SIZE = 1000
+
+async def _fetch_candidate_rows() -> List[Dict[str, Any]]:
+    """
+    Pages through every resume's skill data (not the full parsed_data) to
+    build the in-process candidate index.
+    """
+    repo = get_repository()
+    result = []
+    offset = 0
+    while True:
+        rows = await repo.resumes.page(
+            "id, skill_index:parsed_data->skill_index, skills:parsed_data->skills",
+            offset,
+            _CANDIDATE_PAGE_SIZE,
+        )
+        for row in rows:
+            result.append({
+                "id": row["id"],
+                "parsed_data": {"skill_index": row.get("skill_index"), "skills": row.get("skills")},
+            })
+        if len(rows) < _CANDIDATE_PAGE_SIZE:
+            return result
+        offset += _CANDIDATE_PAGE_SIZE
+
+def _sync_candidate_index(resume_id: str, parsed_data: Optional[Dict[str, Any]] = None, removed: bool = False):
+    index = get_candidate_index()
+    if not index.loaded:
+        # The first query loads everything from the database anyway.
+        return
+    if removed:
+        index.remove(resume_id)
+    else:
+        index.upsert_parsed(resume_id, parsed_data)
+
+_DISCONNECT_POLL_SECONDS = 0.5
+
+async def _await_llm(request: Request, coro):
+    """
+    Awaits an LLM parse while watching the client connection. If the client
+    goes away the parse task is cancelled so its model slot is freed.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise FitGapException("CLIENT_DISCONNECTED", "Client closed the request", 499)
+    except LLMTimeoutError as e:
+        raise FitGapException("ANALYSIS_TIMEOUT", str(e), 504)
+    finally:
+        if not task.done():
+            task.cancel()
+
+# --- Background parsing jobs ---
+
+async def _parse_resume_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    parsed_data = await parse_resume_with_llm(payload["raw_text"])
+    parsed_dict = annotate_resume(annotate_experience(parsed_data.dict()))
+    updated = await get_repository().resumes.update(
+        payload["resume_id"], {"parsed_data": parsed_dict, "parse_error": None}, columns="id"
+    )
+    if not updated:
+        raise RuntimeError("Resume was deleted before parsing finished")
+    _sync_candidate_index(payload["resume_id"], parsed_dict)
+    return {"resume_id": payload["resume_id"], "parsed_data": parsed_dict}
+
+async def _parse_posting_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    parsed_data = await parse_posting_with_llm(payload["raw_text"])
+    parsed_dict = annotate_posting(annotate_posting_experience(parsed_data.dict()))
+    updated = await get_repository().postings.update(
+        payload["posting_id"], {"parsed_data": parsed_dict, "parse_error": None}, columns="id"
+    )
+    if not updated:
+        raise RuntimeError("Job posting was deleted before parsing finished")
+    return {"posting_id": payload["posting_id"], "parsed_data": parsed_dict}
+
+_REANALYSIS_COLUMNS = "id, resume_id, posting_id, fit_items, gap_items, category_scores, input_hashes"
+
+async def _reanalyze_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    repo = get_repository()
+    analyses = await repo.analyses.get_many(payload["analysis_ids"], columns=_REANALYSIS_COLUMNS)
+    resumes, postings = await asyncio.gather(
+        repo.resumes.get_many(list({a["resume_id"] for a in analyses}), columns="id, parsed_data"),
+        repo.postings.get_many(list({a["posting_id"] for a in analyses}), columns="id, parsed_data"),
+    )
+    resume_parsed = {r["id"]: r.get("parsed_data") or {} for r in resumes}
+    posting_parsed = {p["id"]: p.get("parsed_data") or {} for p in postings}
+
+    updates = []
+    for analysis in analyses:
+        if analysis["resume_id"] not in resume_parsed or analysis["posting_id"] not in posting_parsed:
+            # The document was deleted; the analysis goes with it.
+            continue
+        fields = recompute_analysis(
+            analysis, resume_parsed[analysis["resume_id"]], posting_parsed[analysis["posting_id"]]
+        )
+        updates.append(repo.analyses.update(analysis["id"], fields or {"stale": False}, columns="id"))
+    await asyncio.gather(*updates)
+    return {"reanalyzed": len(updates)}
+
+async def _resume_parse_failed(payload: Dict[str, Any], error: Exception):
+    # parse_error tells a failed parse apart from one still running, which
+    # both leave parsed_data empty. It is shown to the owner, so it holds a
+    # code; the queue has already logged the exception.
+    await get_repository().resumes.update(
+        payload["resume_id"], {"parse_error": parse_error_code(error)}, columns="id"
+    )
+
+async def _posting_parse_failed(payload: Dict[str, Any], error: Exception):
+    await get_repository().postings.update(
+        payload["posting_id"], {"parse_error": parse_error_code(error)}, columns="id"
+    )
+
+# Only transient errors are retried; a bad document or a bug fails at once.
+get_job_queue().register(
+    "parse_resume", _parse_resume_job, retry_if=is_transient_error,
+    on_failure=_resume_parse_failed, error_code=parse_error_code,
+)
+get_job_queue().register(
+    "parse_posting", _parse_posting_job, retry_if=is_transient_error,
+    on_failure=_posting_parse_failed, error_code=parse_error_code,
+)
+get_job_queue().register("reanalyze", _reanalyze_job, retry_if=is_transient_error)
+
+async def _invalidate_analyses(column: str, document_id: str, parsed_data: Dict[str, Any], owner: str):
+    """
+    Called after a document's parsed_data changes. Resume/posting analyses
+    whose recorded hashes for this document no longer match are marked
+    stale, and the newest one per pair is queued for re-analysis; pairs
+    whose inputs did not change are left alone.
+    """
+    side, current = (
+        ("resume", resume_hashes(parsed_data))
+        if column == "resume_id"
+        else ("posting", posting_hashes(parsed_data))
+    )
+    repo = get_repository()
+    rows = await repo.analyses.list_current_for(
+        column, document_id, columns="id, resume_id, posting_id, input_hashes"
+    )
+    affected = [
+        r for r in rows
+        if r.get("resume_id") and r.get("posting_id")
+        and (r.get("input_hashes") or {}).get(side) != current
+    ]
+    if not affected:
+        return
+    await repo.analyses.mark_stale([r["id"] for r in affected])
+
+    newest = {}
+    for r in affected:
+        newest.setdefault((r["resume_id"], r["posting_id"]), r["id"])
+    await get_job_queue().submit("reanalyze", {"analysis_ids": list(newest.values())}, owner=owner)
+
+def _get_owned_job(job_id: str, token_data: Dict[str, Any]):
+    job = get_job_queue().get(job_id)
+    if job is None or job.owner != token_data.get("sub"):
+        raise FitGapException("NOT_FOUND", "Job not found", 404)
+    return job
+
+_SSE_KEEPALIVE_SECONDS = 15
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"Hello": "Fit-Gap API"}
 
+# --- Ops API ---
+
+@app.get("/api/v1/ops/parse-cache", dependencies=[Depends(verify_api_key)])
+async def get_parse_cache_stats():
+    return success_response(get_parse_cache().stats())
+
+@app.get("/api/v1/ops/pdf-engine", dependencies=[Depends(verify_api_key)])
+async def get_pdf_engine_stats():
+    return success_response(get_pdf_engine().stats())
+
+@app.post("/api/v1/ops/import/postings", dependencies=[Depends(verify_api_key)])
+async def import_postings(payload: PostingImport):
+    """
+    Bulk import (e.g. historical postings). Texts are extracted several per
+    model call and stored with one insert; per-account posting limits do
+    not apply here.
+    """
+    max_import = get_int_env("POSTING_IMPORT_MAX", 200)
+    if not payload.postings or len(payload.postings) > max_import:
+        raise FitGapException("INVALID_REQUEST", f"Send between 1 and {max_import} postings", 400)
+    too_short = [i for i, p in enumerate(payload.postings) if len(p.raw_text) < 100]
+    if too_short:
+        raise FitGapException(
+            "TEXT_TOO_SHORT", f"Postings at index {too_short} are shorter than 100 characters", 400
+        )
+
+    try:
+        parsed = await parse_postings_with_llm([p.raw_text for p in payload.postings])
+    except LLMTimeoutError as e:
+        raise FitGapException("ANALYSIS_TIMEOUT", str(e), 504)
+    rows = [
+        {
+            "company_name": p.company_name,
+            "raw_text": p.raw_text,
+            "parsed_data": annotate_posting(annotate_posting_experience(data.dict())),
+            "created_by": str(payload.owner_id) if payload.owner_id else None,
+        }
+        for p, data in zip(payload.postings, parsed)
+    ]
+    created = await get_repository().postings.create_many(rows, columns="id, company_name, created_at")
+    return success_response({"imported": len(created), "postings": created}, status_code=201)
+
+@app.get("/api/v1/ops/llm", dependencies=[Depends(verify_api_key)])
+async def get_llm_stats():
+    return success_response(llm_stats())
+
+@app.get("/api/v1/ops/jobs", dependencies=[Depends(verify_api_key)])
+async def get_job_queue_stats():
+    return success_response(get_job_queue().stats())
+
+# --- Job API ---
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(job_id: str, token_data: Dict[str, Any] = Depends(require_access_token)):
+    return success_response(_get_owned_job(job_id, token_data).to_dict())
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, token_data: Dict[str, Any] = Depends(require_access_token)):
+    """
+    Server-sent events: one "status" event per job state change, ending
+    after the job succeeds or fails.
+    """
+    job = _get_owned_job(job_id, token_data)
+    queue = get_job_queue()
+
+    async def events():
+        seen = job.version
+        yield _sse("status", job.to_dict())
+        while not job.done:
+            if await queue.wait_for_change(job, seen, _SSE_KEEPALIVE_SECONDS):
+                seen = job.version
+                yield _sse("status", job.to_dict())
+            else:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
 # --- Auth API ---
 
 @app.get("/auth/google/start")
-def google_auth_start():
+async def google_auth_start():
     state = create_state_token(ttl_minutes=10)
     url = build_google_auth_url(state)
     return RedirectResponse(url=url)
 
 @app.get("/api/auth/callback/google")
-def google_auth_callback(code: str, state: str):
+async def google_auth_callback(code: str, state: str):
     payload = decode_token(state)
     if payload.get("typ") != "state":
         raise FitGapException("INVALID_STATE", "Invalid OAuth state", 400)
 
     try:
-        token_res = exchange_code_for_tokens(code)
+        token_res = await asyncio.to_thread(exchange_code_for_tokens, code)
         id_token = token_res.get("id_token")
         if not id_token:
             raise FitGapException(
@@ -150,7 +507,7 @@ def google_auth_callback(code: str, state: str):
                 f"Missing id_token. keys={list(token_res.keys())}",
                 400,
             )
-        id_payload = verify_google_id_token(id_token)
+        id_payload = await asyncio.to_thread(verify_google_id_token, id_token)
     except FitGapException:
         raise
     except Exception as e:
@@ -161,49 +518,27 @@ def google_auth_callback(code: str, state: str):
     if not provider_sub:
         raise FitGapException("INVALID_ID_TOKEN", "Invalid id_token payload", 400)
 
-    supabase = get_supabase_client()
-    oauth = (
-        supabase.table("oauth_accounts")
-        .select("*")
-        .eq("provider", "GOOGLE")
-        .eq("provider_sub", provider_sub)
-        .execute()
-    )
-
+    users = get_repository().users
     user = None
-    oauth_row = oauth.data[0] if oauth.data else None
+    oauth_row = await users.get_oauth_account("GOOGLE", provider_sub)
     if oauth_row:
-        user = (
-            supabase.table("users").select("*").eq("id", oauth_row["user_id"]).single().execute()
-        ).data
+        user = await users.get(oauth_row["user_id"])
     else:
         nickname = (email.split("@")[0] if email else "user")
-        user_res = (
-            supabase.table("users")
-            .insert({"email": email, "nickname": nickname, "status": "PENDING_ONBOARDING"})
-            .execute()
-        )
-        if not user_res.data:
+        user = await users.create(email, nickname)
+        if not user:
             raise FitGapException("INTERNAL_ERROR", "Failed to create user", 500)
-        user = user_res.data[0]
-        supabase.table("oauth_accounts").insert(
-            {
-                "user_id": user["id"],
-                "provider": "GOOGLE",
-                "provider_sub": provider_sub,
-                "email": email,
-            }
-        ).execute()
+        await users.link_oauth_account(user["id"], "GOOGLE", provider_sub, email)
 
     frontend_base = os.getenv("FRONTEND_BASE_URL", "https://fit-gap-common.vercel.app")
     if user.get("status") == "ACTIVE":
         access = create_access_token(
             user_id=user["id"],
             role=user.get("role"),
-            ttl_minutes=_get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
+            ttl_minutes=get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
         )
         refresh = create_refresh_token(
-            user_id=user["id"], ttl_days=_get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
+            user_id=user["id"], ttl_days=get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
         )
         res = RedirectResponse(url=f"{frontend_base}/login/callback#idToken={id_token}")
         _set_refresh_cookie(res, refresh)
@@ -213,14 +548,14 @@ def google_auth_callback(code: str, state: str):
         provider="GOOGLE",
         provider_sub=provider_sub,
         email=email,
-        ttl_minutes=_get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
+        ttl_minutes=get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
     )
     res = RedirectResponse(url=f"{frontend_base}/onboarding?authToken={signup_token}")
     return res
 
 @app.post("/onboarding/complete")
 @app.post("/api/onboarding/complete")
-def onboarding_complete(
+async def onboarding_complete(
     payload: OnboardingComplete,
     token_data: Dict[str, Any] = Depends(require_signup_token),
 ):
@@ -229,42 +564,18 @@ def onboarding_complete(
     if not provider_sub:
         raise FitGapException("ONBOARDING_TOKEN_INVALID", "Invalid signup token", 401)
 
-    supabase = get_supabase_client()
-    oauth = (
-        supabase.table("oauth_accounts")
-        .select("*")
-        .eq("provider", "GOOGLE")
-        .eq("provider_sub", provider_sub)
-        .execute()
-    )
-
-    oauth_row = oauth.data[0] if oauth.data else None
+    users = get_repository().users
+    oauth_row = await users.get_oauth_account("GOOGLE", provider_sub)
     preferred_nickname = payload.nickname or (email.split("@")[0] if email else "user")
     if not oauth_row:
-        user_res = (
-            supabase.table("users")
-            .insert({"email": email, "nickname": preferred_nickname, "status": "PENDING_ONBOARDING"})
-            .execute()
-        )
-        if not user_res.data:
+        user = await users.create(email, preferred_nickname)
+        if not user:
             raise FitGapException("INTERNAL_ERROR", "Failed to create user", 500)
-        user = user_res.data[0]
-        supabase.table("oauth_accounts").insert(
-            {
-                "user_id": user["id"],
-                "provider": "GOOGLE",
-                "provider_sub": provider_sub,
-                "email": email,
-            }
-        ).execute()
+        await users.link_oauth_account(user["id"], "GOOGLE", provider_sub, email)
     else:
-        user = (
-            supabase.table("users")
-            .select("*")
-            .eq("id", oauth_row["user_id"])
-            .single()
-            .execute()
-        ).data
+        user = await users.get(oauth_row["user_id"])
+        if not user:
+            raise FitGapException("NOT_FOUND", "User not found", 404)
 
     if user.get("status") == "ACTIVE":
         raise FitGapException("ALREADY_ONBOARDED", "User already onboarded", 400)
@@ -274,38 +585,24 @@ def onboarding_complete(
             raise FitGapException("INVALID_REQUEST", "jobseeker_type is required", 400)
         if not payload.nickname:
             raise FitGapException("INVALID_REQUEST", "nickname is required", 400)
-        supabase.table("jobseeker_profiles").upsert(
-            {"user_id": user["id"], "type": payload.jobseeker_type},
-            on_conflict="user_id",
-        ).execute()
-        supabase.table("users").update({"nickname": payload.nickname}).eq("id", user["id"]).execute()
+        await users.upsert_jobseeker_profile(user["id"], payload.jobseeker_type)
+        await users.update(user["id"], {"nickname": payload.nickname})
     else:
         if not payload.company_name or not payload.biz_reg_no:
             raise FitGapException("INVALID_REQUEST", "company_name and biz_reg_no are required", 400)
-        if not verify_biz_registration(payload.biz_reg_no):
+        if not await asyncio.to_thread(verify_biz_registration, payload.biz_reg_no):
             raise FitGapException("BIZ_VERIFY_FAILED", "사업자 등록번호 인증에 실패했습니다.", 422)
-        supabase.table("company_profiles").upsert(
-            {
-                "user_id": user["id"],
-                "company_name": payload.company_name,
-                "biz_reg_no": payload.biz_reg_no,
-                "biz_verified": True,
-                "biz_verified_at": datetime.now(timezone.utc).isoformat(),
-            },
-            on_conflict="user_id",
-        ).execute()
+        await users.upsert_company_profile(user["id"], payload.company_name, payload.biz_reg_no)
 
-    supabase.table("users").update(
-        {"role": payload.role, "status": "ACTIVE"}
-    ).eq("id", user["id"]).execute()
+    await users.update(user["id"], {"role": payload.role, "status": "ACTIVE"})
 
     access = create_access_token(
         user_id=user["id"],
         role=payload.role,
-        ttl_minutes=_get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
+        ttl_minutes=get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
     )
     refresh = create_refresh_token(
-        user_id=user["id"], ttl_days=_get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
+        user_id=user["id"], ttl_days=get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
     )
 
     res = success_response(
@@ -321,9 +618,9 @@ def onboarding_complete(
     return res
 
 @app.post("/api/auth/session")
-def create_session(payload: IdTokenRequest):
+async def create_session(payload: IdTokenRequest):
     try:
-        id_payload = verify_google_id_token(payload.id_token)
+        id_payload = await asyncio.to_thread(verify_google_id_token, payload.id_token)
     except Exception as e:
         raise FitGapException("INVALID_ID_TOKEN", str(e), 401)
 
@@ -332,31 +629,18 @@ def create_session(payload: IdTokenRequest):
     if not provider_sub:
         raise FitGapException("INVALID_ID_TOKEN", "Missing sub", 401)
 
-    supabase = get_supabase_client()
-    oauth = (
-        supabase.table("oauth_accounts")
-        .select("*")
-        .eq("provider", "GOOGLE")
-        .eq("provider_sub", provider_sub)
-        .execute()
-    )
-    oauth_row = oauth.data[0] if oauth.data else None
+    users = get_repository().users
+    oauth_row = await users.get_oauth_account("GOOGLE", provider_sub)
     user = None
     if oauth_row:
-        user = (
-            supabase.table("users")
-            .select("*")
-            .eq("id", oauth_row["user_id"])
-            .single()
-            .execute()
-        ).data
+        user = await users.get(oauth_row["user_id"])
 
     if not user:
         signup_token = create_signup_token(
             provider="GOOGLE",
             provider_sub=provider_sub,
             email=email,
-            ttl_minutes=_get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
+            ttl_minutes=get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
         )
         return success_response(
             {
@@ -370,7 +654,7 @@ def create_session(payload: IdTokenRequest):
             provider="GOOGLE",
             provider_sub=provider_sub,
             email=email,
-            ttl_minutes=_get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
+            ttl_minutes=get_int_env("SIGNUP_TOKEN_TTL_MINUTES", 20),
         )
         return success_response(
             {
@@ -382,10 +666,10 @@ def create_session(payload: IdTokenRequest):
     access = create_access_token(
         user_id=user["id"],
         role=user.get("role"),
-        ttl_minutes=_get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
+        ttl_minutes=get_int_env("ACCESS_TOKEN_TTL_MINUTES", 15),
     )
     refresh = create_refresh_token(
-        user_id=user["id"], ttl_days=_get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
+        user_id=user["id"], ttl_days=get_int_env("REFRESH_TOKEN_TTL_DAYS", 14)
     )
     res = success_response(
         {
@@ -401,16 +685,15 @@ def create_session(payload: IdTokenRequest):
     return res
 
 @app.post("/api/auth/logout")
-def logout():
+async def logout():
     res = success_response({"message": "logged out"})
     _clear_refresh_cookie(res)
     return res
 
 @app.get("/me")
-def get_me(token_data: Dict[str, Any] = Depends(require_access_token)):
+async def get_me(token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    user = supabase.table("users").select("*").eq("id", user_id).single().execute().data
+    user = await get_repository().users.get(user_id)
     if not user:
         raise FitGapException("NOT_FOUND", "User not found", 404)
     return success_response(
@@ -424,81 +707,39 @@ def get_me(token_data: Dict[str, Any] = Depends(require_access_token)):
     )
 
 @app.get("/api/mypage")
-def get_mypage(token_data: Dict[str, Any] = Depends(require_access_token)):
+async def get_mypage(token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    user = supabase.table("users").select("*").eq("id", user_id).single().execute().data
-    if not user:
+    page = await get_repository().users.get_mypage(user_id)
+    if not page:
         raise FitGapException("NOT_FOUND", "User not found", 404)
 
-    role = user.get("role")
-    profile = None
-    resumes = []
-    postings = []
-    if role == "JOBSEEKER":
-        profile_res = (
-            supabase.table("jobseeker_profiles")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        profile = profile_res.data[0] if profile_res.data else None
-        resumes = (
-            supabase.table("resumes")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        ).data or []
-    elif role == "COMPANY":
-        profile_res = (
-            supabase.table("company_profiles")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        profile = profile_res.data[0] if profile_res.data else None
-        postings = (
-            supabase.table("job_postings")
-            .select("*")
-            .eq("created_by", user_id)
-            .execute()
-        ).data or []
-
+    for doc in (page.get("resumes") or []) + (page.get("postings") or []):
+        latest = doc.get("latest_analysis")
+        if latest:
+            latest["signal"] = score_signal(latest.get("overall_score") or 0)
     return success_response(
         {
-            "user": {
-                "id": user["id"],
-                "email": user.get("email"),
-                "nickname": user.get("nickname"),
-                "role": role,
-                "status": user.get("status"),
-            },
-            "profile": profile,
-            "resumes": resumes,
-            "postings": postings,
+            "user": page["user"],
+            "profile": page.get("profile"),
+            "resumes": page.get("resumes") or [],
+            "postings": page.get("postings") or [],
         }
     )
 
 @app.patch("/api/mypage/nickname")
-def update_nickname(
+async def update_nickname(
     payload: NicknameUpdate, token_data: Dict[str, Any] = Depends(require_access_token)
 ):
     user_id = token_data.get("sub")
     if not payload.nickname.strip():
         raise FitGapException("INVALID_REQUEST", "nickname is required", 400)
-    supabase = get_supabase_client()
-    res = (
-        supabase.table("users")
-        .update({"nickname": payload.nickname.strip()})
-        .eq("id", user_id)
-        .execute()
-    )
-    if not res.data:
+    updated = await get_repository().users.update(user_id, {"nickname": payload.nickname.strip()})
+    if not updated:
         raise FitGapException("NOT_FOUND", "User not found", 404)
-    return success_response({"nickname": res.data[0].get("nickname")})
+    return success_response({"nickname": updated.get("nickname")})
 
 @app.put("/api/mypage/resume")
-def upsert_resume_text(
+async def upsert_resume_text(
     payload: ResumeTextUpdate, token_data: Dict[str, Any] = Depends(require_access_token)
 ):
     user_id = token_data.get("sub")
@@ -508,191 +749,179 @@ def upsert_resume_text(
     if not payload.raw_text.strip():
         raise FitGapException("INVALID_REQUEST", "raw_text is required", 400)
 
-    supabase = get_supabase_client()
-    existing = (
-        supabase.table("resumes")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
-    ).data
+    resumes = get_repository().resumes
+    existing = await resumes.list_for_user(user_id, columns="id")
     if existing:
         resume_id = existing[0]["id"]
-        res = (
-            supabase.table("resumes")
-            .update({"raw_text": payload.raw_text, "parsed_data": {}})
-            .eq("id", resume_id)
-            .execute()
+        updated = await resumes.update(
+            resume_id, {"raw_text": payload.raw_text, "parsed_data": {}}, columns="id"
         )
-        if not res.data:
+        if not updated:
             raise FitGapException("INTERNAL_ERROR", "Failed to update resume", 500)
+        _sync_candidate_index(resume_id, {})
+        await _invalidate_analyses("resume_id", str(resume_id), {}, user_id)
         return success_response({"resume_id": resume_id})
 
-    res = (
-        supabase.table("resumes")
-        .insert(
-            {
-                "user_id": user_id,
-                "raw_text": payload.raw_text,
-                "parsed_data": {},
-                "is_stored": False,
-            }
-        )
-        .execute()
+    created = await resumes.create(
+        {
+            "user_id": user_id,
+            "raw_text": payload.raw_text,
+            "parsed_data": {},
+            "is_stored": False,
+        },
+        columns="id",
     )
-    if not res.data:
+    if not created:
         raise FitGapException("INTERNAL_ERROR", "Failed to create resume", 500)
-    return success_response({"resume_id": res.data[0]["id"]})
+    _sync_candidate_index(created["id"], {})
+    return success_response({"resume_id": created["id"]})
 
 @app.delete("/api/mypage")
-def delete_account(token_data: Dict[str, Any] = Depends(require_access_token)):
+async def delete_account(token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    resume_rows = (
-        supabase.table("resumes").select("id").eq("user_id", user_id).execute()
-    ).data or []
-    posting_rows = (
-        supabase.table("job_postings")
-        .select("id")
-        .eq("created_by", user_id)
-        .execute()
-    ).data or []
-
-    resume_ids = [row["id"] for row in resume_rows]
-    posting_ids = [row["id"] for row in posting_rows]
-
-    if resume_ids:
-        supabase.table("analyses").delete().in_("resume_id", resume_ids).execute()
-    if posting_ids:
-        supabase.table("posting_insights").delete().in_("posting_id", posting_ids).execute()
-        supabase.table("analyses").delete().in_("posting_id", posting_ids).execute()
-
-    supabase.table("resumes").delete().eq("user_id", user_id).execute()
-    supabase.table("job_postings").delete().eq("created_by", user_id).execute()
-    supabase.table("jobseeker_profiles").delete().eq("user_id", user_id).execute()
-    supabase.table("company_profiles").delete().eq("user_id", user_id).execute()
-    supabase.table("oauth_accounts").delete().eq("user_id", user_id).execute()
-
-    res = supabase.table("users").delete().eq("id", user_id).execute()
-    if not res.data:
+    result = await get_repository().users.delete_account(user_id)
+    if result is None:
         raise FitGapException("NOT_FOUND", "User not found", 404)
-    response = success_response({"message": "Account deleted"})
+    for resume_id in result.get("resume_ids") or []:
+        _sync_candidate_index(resume_id, removed=True)
+    response = success_response({"message": "Account deleted", "deleted": result.get("deleted") or {}})
     _clear_refresh_cookie(response)
     return response
 
 @app.post("/api/v1/analyze", dependencies=[Depends(verify_api_key)])
-def analyze_fit_gap(input_data: AnalysisInput):
+async def analyze_fit_gap(input_data: AnalysisInput):
     try:
         resume_skills = input_data.resume_data.get("skills", [])
         job_skills = input_data.job_data.get("required_skills", [])
         matched_skills, missing_skills = compare_skills(resume_skills, job_skills)
-        resume_exp = input_data.resume_data.get("experience", [])
-        job_min_years = input_data.job_data.get("min_experience", 0)
-        experience_alignment = check_experience_fit(resume_exp, job_min_years)
+        experience_alignment = resume_experience_fit(input_data.resume_data, input_data.job_data)
         recommendations = generate_recommendations(missing_skills)
-        skill_score = len(matched_skills) / len(job_skills) if job_skills else 1.0
-        exp_weight = {"Exceeds": 1.0, "Matches": 1.0, "Partial": 0.5, "Below": 0.0}.get(experience_alignment, 0.0)
-        overall_score = (skill_score * 0.7) + (exp_weight * 0.3)
+        profile = select_profile(input_data.job_data)
+        overall_score = fit_fraction(
+            coverage(len(matched_skills), len(job_skills)),
+            preferred_coverage(input_data.resume_data, input_data.job_data),
+            experience_alignment,
+            profile,
+        )
         
         return success_response({
             "overall_score": overall_score,
             "matched_skills": matched_skills,
             "missing_skills": missing_skills,
             "recommendations": recommendations,
-            "experience_alignment": experience_alignment
+            "experience_alignment": experience_alignment,
+            "scoring_profile": profile.key,
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _semantic_results(job_phrases: List[str], resume_parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return semantic_matches(
+        get_embedding_store(), job_phrases, resume_phrases(resume_parsed), get_semantic_threshold()
+    )
+
 @app.post("/api/v1/analyze/session")
-def create_analysis_session(
+async def create_analysis_session(
     payload: AnalysisRequest, token_data: Dict[str, Any] = Depends(require_access_token)
 ):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
+    repo = get_repository()
 
-    resume = None
+    # raw_text is only read by the single-document scores, so it is fetched
+    # only when the other document cannot be present.
+    resume_columns = "id, parsed_data" if payload.posting_id else "id, parsed_data, raw_text"
     if payload.resume_id:
-        resume = (
-            supabase.table("resumes")
-            .select("*")
-            .eq("id", str(payload.resume_id))
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        ).data
+        resume_lookup = repo.resumes.get(str(payload.resume_id), user_id=user_id, columns=resume_columns)
     else:
-        resume_res = (
-            supabase.table("resumes")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        resume = resume_res.data[0] if resume_res.data else None
+        resume_lookup = repo.resumes.latest_for_user(user_id, columns=resume_columns)
+    posting_lookup = (
+        repo.postings.get(str(payload.posting_id), columns="id, parsed_data")
+        if payload.posting_id
+        else None
+    )
+    if posting_lookup is None:
+        resume, posting = await resume_lookup, None
+    else:
+        resume, posting = await asyncio.gather(resume_lookup, posting_lookup)
     if not resume and not payload.posting_id:
         raise FitGapException("INVALID_REQUEST", "resume_id or posting_id is required", 400)
 
-    posting = None
     if payload.posting_id:
-        posting = (
-            supabase.table("job_postings")
-            .select("*")
-            .eq("id", str(payload.posting_id))
-            .single()
-            .execute()
-        ).data
         if not posting:
             raise FitGapException("NOT_FOUND", "Posting not found", 404)
+        if not resume:
+            posting = await repo.postings.get(str(payload.posting_id), columns="id, parsed_data, raw_text")
 
     resume_parsed = resume.get("parsed_data") or {} if resume else {}
     posting_parsed = posting.get("parsed_data") or {} if posting else {}
 
-    resume_skills = resume_parsed.get("skills", [])
-    job_skills = posting_parsed.get("required_skills", [])
-    matched_skills, missing_skills = compare_skills(resume_skills, job_skills)
-    resume_exp = resume_parsed.get("experience", [])
-    job_min_years = posting_parsed.get("min_experience", 0)
-    experience_alignment = check_experience_fit(resume_exp, job_min_years)
+    pair_hashes = key = None
+    profile = select_profile(posting_parsed)
+    if posting and resume:
+        pair_hashes = input_hashes(resume_parsed, posting_parsed)
+        # Semantic matches depend on the embedding model and threshold, which
+        # the key does not cover.
+        if not payload.semantic:
+            key = memo_key(pair_hashes, profile)
+    if key and not payload.force:
+        memoized = await repo.analyses.find_memoized(
+            resume["id"], posting["id"], key,
+            columns="id, overall_score, fit_items, gap_items, category_scores",
+        )
+        if memoized:
+            gap_items = memoized.get("gap_items") or []
+            return success_response(
+                {
+                    "analysis_id": memoized["id"],
+                    "overall_score": memoized.get("overall_score") or 0,
+                    "signal": score_signal(memoized.get("overall_score") or 0),
+                    "matched_skills": memoized.get("fit_items") or [],
+                    "missing_skills": gap_items,
+                    "recommendations": generate_recommendations(gap_items),
+                    "experience_alignment": (memoized.get("category_scores") or {}).get("experience_alignment"),
+                    "semantic_matches": [],
+                    "memoized": True,
+                }
+            )
+
+    # Same matching as screen_resumes: the resume's skill IDs stored at parse
+    # time, with matched/missing skills in the posting's wording.
+    index = get_skill_index()
+    job_skills = skill_names(posting_parsed.get("required_skills", []))
+    job_ids = [(index.skill_id(js), js) for js in job_skills]
+    resume_ids = resume_skill_ids(resume_parsed)
+    matched_skills = [js for jid, js in job_ids if jid in resume_ids]
+    missing_skills = [js for jid, js in job_ids if jid not in resume_ids]
+    experience_alignment = resume_experience_fit(resume_parsed, posting_parsed)
+
+    semantic_evidence = []
+    if payload.semantic and posting and resume and missing_skills:
+        # Only requirements the exact/alias match missed go through embeddings.
+        # Loading the model and encoding are blocking, so they run off the loop.
+        results = await asyncio.to_thread(_semantic_results, missing_skills, resume_parsed)
+        semantic_evidence = [r for r in results if r["matched"]]
+        newly_matched = {r["item"] for r in semantic_evidence}
+        matched_skills = matched_skills + [s for s in missing_skills if s in newly_matched]
+        missing_skills = [s for s in missing_skills if s not in newly_matched]
     recommendations = generate_recommendations(missing_skills)
 
     if posting and resume:
-        skill_score = len(matched_skills) / len(job_skills) if job_skills else 1.0
-        exp_weight = {"Exceeds": 1.0, "Matches": 1.0, "Partial": 0.5, "Below": 0.0}.get(
-            experience_alignment, 0.0
-        )
-        overall_score = int(round((skill_score * 0.7 + exp_weight * 0.3) * 100))
+        required = coverage(len(matched_skills), len(job_skills))
+        preferred = preferred_coverage(resume_parsed, posting_parsed)
+        overall_score = to_scores([fit_fraction(required, preferred, experience_alignment, profile)])[0]
     elif posting:
-        raw_text = posting.get("raw_text") or ""
-        score = 40
-        if len(job_skills) >= 5:
-            score += 20
-        if len(raw_text) >= 500:
-            score += 20
-        if posting_parsed.get("min_experience"):
-            score += 10
-        overall_score = min(100, score)
+        overall_score = posting_completeness_score(
+            len(job_skills), len(posting.get("raw_text") or ""), bool(posting_min_years(posting_parsed))
+        )
         matched_skills = []
         missing_skills = job_skills
         recommendations = generate_recommendations(missing_skills)
         experience_alignment = "Unknown"
     else:
-        raw_text = resume.get("raw_text") or ""
-        score = 40
-        if len(resume_skills) >= 5:
-            score += 20
-        if resume_exp:
-            score += 20
-        if len(raw_text) >= 500:
-            score += 20
-        overall_score = min(100, score)
-
-    if overall_score >= 80:
-        signal = "green"
-    elif overall_score >= 40:
-        signal = "yellow"
-    else:
-        signal = "red"
+        overall_score = resume_completeness_score(
+            len(resume_skills), bool(experience_years(resume_parsed)), len(resume.get("raw_text") or "")
+        )
+    signal = score_signal(overall_score)
 
     insert_data = {
         "resume_id": resume.get("id") if resume else None,
@@ -703,8 +932,14 @@ def create_analysis_session(
         "explanation": "Auto-generated analysis",
         "confidence": "Medium",
     }
-    res = supabase.table("analyses").insert(insert_data).execute()
-    analysis_id = res.data[0]["id"] if res.data else None
+    if pair_hashes:
+        insert_data["category_scores"] = category_scores(required, preferred, experience_alignment, profile)
+        if payload.semantic:
+            insert_data["category_scores"]["semantic"] = True
+        insert_data["input_hashes"] = pair_hashes
+        insert_data["memo_key"] = key
+    created = await repo.analyses.create(insert_data, columns="id")
+    analysis_id = created["id"] if created else None
 
     return success_response(
         {
@@ -715,22 +950,108 @@ def create_analysis_session(
             "missing_skills": missing_skills,
             "recommendations": recommendations,
             "experience_alignment": experience_alignment,
+            "semantic_matches": semantic_evidence,
+            "memoized": False,
+        },
+        status_code=201,
+    )
+
+@app.post("/api/v1/analyze/batch")
+async def create_batch_analysis(
+    payload: BatchAnalysisRequest, token_data: Dict[str, Any] = Depends(require_access_token)
+):
+    """
+    Screens many resumes against one posting in a single request: the posting
+    is loaded once, stored resumes are fetched with one IN query, and all
+    analyses rows are written with one bulk insert.
+    """
+    user_id = token_data.get("sub")
+    if token_data.get("role") != "COMPANY":
+        raise FitGapException("FORBIDDEN", "Only company accounts can run batch screening", 403)
+
+    resume_ids = list(dict.fromkeys(str(rid) for rid in payload.resume_ids))
+    total = len(resume_ids) + len(payload.resumes)
+    if total == 0:
+        raise FitGapException("INVALID_REQUEST", "resume_ids or resumes is required", 400)
+    max_batch = get_int_env("BATCH_ANALYSIS_MAX", 200)
+    if total > max_batch:
+        raise FitGapException("INVALID_REQUEST", f"At most {max_batch} resumes per batch", 400)
+
+    repo = get_repository()
+    posting, stored = await asyncio.gather(
+        repo.postings.get(str(payload.posting_id), owner_id=user_id, columns="id, parsed_data"),
+        repo.resumes.get_many(resume_ids, columns="id, parsed_data"),
+    )
+    if not posting:
+        raise FitGapException("NOT_FOUND", "Posting not found", 404)
+
+    found_ids = {row["id"] for row in stored}
+    posting_parsed = posting.get("parsed_data") or {}
+    resume_parsed = {row["id"]: row.get("parsed_data") or {} for row in stored}
+
+    candidates = [{"resume_id": row["id"], "ref": None} for row in stored]
+    candidates += [{"resume_id": None, "ref": item.ref} for item in payload.resumes]
+    profile = select_profile(posting_parsed)
+    scored = screen_resumes(
+        posting_parsed,
+        [resume_parsed[row["id"]] for row in stored]
+        + [item.parsed_data for item in payload.resumes],
+        profile,
+    )
+    results = [{**candidate, **score} for candidate, score in zip(candidates, scored)]
+
+    # Inline payloads have no resume row to attach an analysis to.
+    persisted = [r for r in results if r["resume_id"]]
+    if persisted:
+        hashes = {r["resume_id"]: input_hashes(resume_parsed[r["resume_id"]], posting_parsed) for r in persisted}
+        rows = [
+            {
+                "resume_id": r["resume_id"],
+                "posting_id": str(payload.posting_id),
+                "overall_score": r["overall_score"],
+                "fit_items": r["matched_skills"],
+                "gap_items": r["missing_skills"],
+                "explanation": "Auto-generated batch analysis",
+                "confidence": "Medium",
+                "category_scores": r["category_scores"],
+                "input_hashes": hashes[r["resume_id"]],
+                "memo_key": memo_key(hashes[r["resume_id"]], profile),
+            }
+            for r in persisted
+        ]
+        inserted = await repo.analyses.create_many(rows, columns="id, resume_id")
+        analysis_ids = {row.get("resume_id"): row.get("id") for row in inserted}
+        for r in persisted:
+            r["analysis_id"] = analysis_ids.get(r["resume_id"])
+
+    results.sort(key=lambda r: r["overall_score"], reverse=True)
+    ranked = [
+        {"rank": rank, "analysis_id": r.get("analysis_id"), **r}
+        for rank, r in enumerate(results, start=1)
+    ]
+
+    return success_response(
+        {
+            "posting_id": str(payload.posting_id),
+            "total": len(ranked),
+            "summary": {
+                signal: sum(1 for r in ranked if r["signal"] == signal)
+                for signal in ("green", "yellow", "red")
+            },
+            "results": ranked,
+            "missing_resume_ids": [rid for rid in resume_ids if rid not in found_ids],
         },
         status_code=201,
     )
 
 @app.get("/api/v1/analyze/session/{analysis_id}")
-def get_analysis_session(
+async def get_analysis_session(
     analysis_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)
 ):
-    supabase = get_supabase_client()
-    analysis = (
-        supabase.table("analyses")
-        .select("*")
-        .eq("id", str(analysis_id))
-        .single()
-        .execute()
-    ).data
+    analysis = await get_repository().analyses.get(
+        str(analysis_id),
+        columns="id, resume_id, posting_id, overall_score, fit_items, gap_items, over_items, explanation, confidence, stale",
+    )
     if not analysis:
         raise FitGapException("NOT_FOUND", "Analysis not found", 404)
 
@@ -754,104 +1075,71 @@ def get_analysis_session(
             "over_items": analysis.get("over_items") or [],
             "summary": analysis.get("explanation") or "",
             "confidence": analysis.get("confidence") or "Medium",
+            "stale": bool(analysis.get("stale")),
         }
     )
 
-@app.get("/api/v1/analyze/session/by-resume/{resume_id}")
-def get_latest_analysis_by_resume_session(
-    resume_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)
-):
-    user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-
-    resume = (
-        supabase.table("resumes")
-        .select("id")
-        .eq("id", str(resume_id))
-        .eq("user_id", user_id)
-        .single()
-        .execute()
-    ).data
-    if not resume:
-        raise FitGapException("NOT_FOUND", "Resume not found", 404)
-
-    analysis_res = (
-        supabase.table("analyses")
-        .select("*")
-        .eq("resume_id", str(resume_id))
-        .order("created_at", desc=True)
-        .limit(1)
-        .execute()
-    )
-    analysis = analysis_res.data[0] if analysis_res.data else None
+def _analysis_summary(analysis: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if not analysis:
-        return success_response({"analysis": None})
-
+        return None
     overall_score = analysis.get("overall_score") or 0
-    if overall_score >= 80:
-        signal = "green"
-    elif overall_score >= 40:
-        signal = "yellow"
-    else:
-        signal = "red"
+    return {
+        "analysis_id": analysis.get("id"),
+        "overall_score": overall_score,
+        "signal": score_signal(overall_score),
+        "created_at": analysis.get("created_at"),
+    }
 
-    return success_response(
-        {
-            "analysis": {
-                "analysis_id": analysis.get("id"),
-                "overall_score": overall_score,
-                "signal": signal,
-                "created_at": analysis.get("created_at"),
-            }
-        }
+@app.get("/api/v1/analyze/session/by-resume/{resume_id}")
+async def get_latest_analysis_by_resume_session(
+    resume_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)
+):
+    rows = await get_repository().resumes.latest_analyses(
+        [str(resume_id)], token_data.get("sub"), columns=_ANALYSIS_SUMMARY_COLUMNS
     )
+    if not rows:
+        raise FitGapException("NOT_FOUND", "Resume not found", 404)
+    return success_response({"analysis": _analysis_summary(rows[0].get("latest_analysis"))})
 
 @app.get("/api/v1/analyze/session/by-posting/{posting_id}")
-def get_latest_analysis_by_posting_session(
+async def get_latest_analysis_by_posting_session(
     posting_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)
 ):
-    user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-
-    posting = (
-        supabase.table("job_postings")
-        .select("id")
-        .eq("id", str(posting_id))
-        .eq("created_by", user_id)
-        .single()
-        .execute()
-    ).data
-    if not posting:
+    rows = await get_repository().postings.latest_analyses(
+        [str(posting_id)], token_data.get("sub"), columns=_ANALYSIS_SUMMARY_COLUMNS
+    )
+    if not rows:
         raise FitGapException("NOT_FOUND", "Posting not found", 404)
+    return success_response({"analysis": _analysis_summary(rows[0].get("latest_analysis"))})
 
-    analysis_res = (
-        supabase.table("analyses")
-        .select("*")
-        .eq("posting_id", str(posting_id))
-        .order("created_at", desc=True)
-        .limit(1)
-        .execute()
-    )
-    analysis = analysis_res.data[0] if analysis_res.data else None
-    if not analysis:
-        return success_response({"analysis": None})
+@app.post("/api/v1/analyze/session/latest")
+async def get_latest_analyses(
+    payload: LatestAnalysesRequest, token_data: Dict[str, Any] = Depends(require_access_token)
+):
+    """
+    Latest analysis summaries for many resumes and postings in one call.
+    IDs the caller does not own, or that do not exist, are listed in
+    missing_ids rather than failing the request.
+    """
+    resume_ids = list(dict.fromkeys(str(rid) for rid in payload.resume_ids))
+    posting_ids = list(dict.fromkeys(str(pid) for pid in payload.posting_ids))
+    max_ids = get_int_env("LATEST_ANALYSES_MAX", 200)
+    if len(resume_ids) + len(posting_ids) > max_ids:
+        raise FitGapException("INVALID_REQUEST", f"At most {max_ids} ids per request", 400)
 
-    overall_score = analysis.get("overall_score") or 0
-    if overall_score >= 80:
-        signal = "green"
-    elif overall_score >= 40:
-        signal = "yellow"
-    else:
-        signal = "red"
+    user_id = token_data.get("sub")
+    repo = get_repository()
+    resumes, postings = await asyncio.gather(
+        repo.resumes.latest_analyses(resume_ids, user_id, columns=_ANALYSIS_SUMMARY_COLUMNS),
+        repo.postings.latest_analyses(posting_ids, user_id, columns=_ANALYSIS_SUMMARY_COLUMNS),
+    )
+    found = {row["id"] for row in resumes} | {row["id"] for row in postings}
 
     return success_response(
         {
-            "analysis": {
-                "analysis_id": analysis.get("id"),
-                "overall_score": overall_score,
-                "signal": signal,
-                "created_at": analysis.get("created_at"),
-            }
+            "resumes": {row["id"]: _analysis_summary(row.get("latest_analysis")) for row in resumes},
+            "postings": {row["id"]: _analysis_summary(row.get("latest_analysis")) for row in postings},
+            "missing_ids": [i for i in resume_ids + posting_ids if i not in found],
         }
     )
 
@@ -859,124 +1147,191 @@ def get_latest_analysis_by_posting_session(
 @app.post("/resumes")
 @app.post("/api/v1/resumes")
 async def upload_resume(
+    request: Request,
     file: UploadFile = File(...),
     store_original: bool = Form(False),
+    background: bool = False,
+    stream: bool = False,
     token_data: Dict[str, Any] = Depends(require_access_token),
 ):
+    """
+    Parses an uploaded resume PDF. background=true returns 202 and parses on
+    the job queue; stream=true answers with server-sent events: one "item"
+    per skill, experience or metric as the model produces it, then
+    "resume" with the saved result (or "error").
+    """
     user_id = token_data.get("sub")
     if not user_id:
         raise FitGapException("UNAUTHORIZED", "Missing user id", 401)
+    if background and stream:
+        raise FitGapException("INVALID_REQUEST", "background and stream cannot be combined", 400)
     if not file.filename.lower().endswith(".pdf"):
         raise FitGapException("UNSUPPORTED_FILE_TYPE", "Only PDF files are supported", 400)
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = tmp.name
-        
     try:
-        raw_text = extract_text_from_pdf(tmp_path)
-        parsed_data = await parse_resume_with_llm(raw_text)
-        
-        supabase = get_supabase_client()
-        existing = (
-            supabase.table("resumes")
-            .select("id")
-            .eq("user_id", user_id)
-            .execute()
-        ).data
-        if existing:
-            raise FitGapException("LIMIT_EXCEEDED", "Only one resume is allowed per account", 400)
-        db_data = {
-            "user_id": user_id,
-            "raw_text": raw_text,
-            "parsed_data": parsed_data.dict(),
-            "is_stored": store_original
-        }
-        res = supabase.table("resumes").insert(db_data).execute()
-        
-        if not res.data:
-            raise FitGapException("INTERNAL_ERROR", "Failed to save to database", 500)
-            
-        resume_id = res.data[0]["id"]
-        
-        if store_original:
-            with open(tmp_path, "rb") as f:
-                supabase.storage.from_("resumes").upload(f"{resume_id}.pdf", f)
-                
+        pdf_bytes = await read_upload(file, max_bytes=get_int_env("PDF_MAX_BYTES", DEFAULT_MAX_BYTES))
+        raw_text = await extract_pdf_text(
+            pdf_bytes, max_pages=get_int_env("PDF_MAX_PAGES", DEFAULT_MAX_PAGES)
+        )
+    except PdfTooLargeError as e:
+        raise FitGapException("FILE_TOO_LARGE", str(e), 400)
+    except PdfTooManyPagesError as e:
+        raise FitGapException("TOO_MANY_PAGES", str(e), 400)
+    except InvalidPdfError as e:
+        raise FitGapException("INVALID_REQUEST", str(e), 400)
+    except PdfExtractionTimeoutError as e:
+        raise FitGapException("ANALYSIS_TIMEOUT", str(e), 504)
+    except PdfExtractionError:
+        logger.exception("PDF extraction worker failed")
+        raise FitGapException("INTERNAL_ERROR", "PDF extraction failed, please retry", 500)
+    if not raw_text:
+        raise FitGapException("INVALID_REQUEST", "텍스트 기반 PDF만 지원됩니다", 400)
+
+    resumes = get_repository().resumes
+    existing = await resumes.list_for_user(user_id, columns="id")
+    if existing:
+        raise FitGapException("LIMIT_EXCEEDED", "Only one resume is allowed per account", 400)
+
+    if stream:
+        return StreamingResponse(
+            _stream_resume_upload(user_id, raw_text, pdf_bytes, store_original),
+            media_type="text/event-stream",
+            headers=_SSE_HEADERS,
+        )
+    if background:
+        # Persist the text now and parse it on the job queue; parsed_data
+        # stays empty until the job finishes.
+        parsed_dict = {}
+    else:
+        parsed_data = await _await_llm(request, parse_resume_with_llm(raw_text))
+        parsed_dict = annotate_resume(annotate_experience(parsed_data.dict()))
+    db_data = {
+        "user_id": user_id,
+        "raw_text": raw_text,
+        "parsed_data": parsed_dict,
+        "is_stored": store_original
+    }
+    created = await resumes.create(db_data, columns="id, created_at")
+
+    if not created:
+        raise FitGapException("INTERNAL_ERROR", "Failed to save to database", 500)
+
+    resume_id = created["id"]
+
+    if store_original:
+        # Same buffer the text was extracted from; no second read of the upload.
+        await resumes.upload_original(resume_id, pdf_bytes)
+
+    if background:
+        job = await get_job_queue().submit(
+            "parse_resume", {"resume_id": resume_id, "raw_text": raw_text}, owner=user_id
+        )
         return success_response({
             "resume_id": resume_id,
-            "parsed_data": parsed_data.dict(),
-            "created_at": res.data[0].get("created_at")
-        }, status_code=201)
-        
-    finally:
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+            "job_id": job.id,
+            "status": job.status,
+            "created_at": created.get("created_at")
+        }, status_code=202)
+
+    _sync_candidate_index(resume_id, parsed_dict)
+    return success_response({
+        "resume_id": resume_id,
+        "parsed_data": parsed_dict,
+        "created_at": created.get("created_at")
+    }, status_code=201)
+
+async def _stream_resume_upload(user_id: str, raw_text: str, pdf_bytes: bytes, store_original: bool):
+    try:
+        async for event in stream_resume_with_llm(raw_text):
+            if event["type"] == "item":
+                yield _sse("item", {"field": event["field"], "item": event["item"]})
+                continue
+            parsed_dict = annotate_resume(annotate_experience(event["parsed"].dict()))
+    except LLMTimeoutError as e:
+        yield _sse("error", {"code": "ANALYSIS_TIMEOUT", "message": str(e)})
+        return
+    except FitGapException as e:
+        yield _sse("error", {"code": e.code, "message": e.message})
+        return
+    except Exception:
+        logger.exception("streaming resume parse failed")
+        yield _sse("error", {"code": "INTERNAL_ERROR", "message": "Failed to parse resume"})
+        return
+
+    resumes = get_repository().resumes
+    created = await resumes.create(
+        {"user_id": user_id, "raw_text": raw_text, "parsed_data": parsed_dict, "is_stored": store_original},
+        columns="id, created_at",
+    )
+    if not created:
+        yield _sse("error", {"code": "INTERNAL_ERROR", "message": "Failed to save to database"})
+        return
+    if store_original:
+        await resumes.upload_original(created["id"], pdf_bytes)
+    _sync_candidate_index(created["id"], parsed_dict)
+    yield _sse(
+        "resume",
+        {"resume_id": created["id"], "parsed_data": parsed_dict, "created_at": created.get("created_at")},
+    )
 
 @app.get("/resumes/{resume_id}")
-def get_resume(resume_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def get_resume(
+    resume_id: UUID,
+    fields: Optional[str] = None,
+    token_data: Dict[str, Any] = Depends(require_access_token),
+):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    res = (
-        supabase.table("resumes")
-        .select("*")
-        .eq("id", str(resume_id))
-        .eq("user_id", user_id)
-        .single()
-        .execute()
-    )
+    names, columns = _select_fields(fields, _RESUME_FIELDS, _RESUME_DEFAULT_FIELDS)
+    resume = await get_repository().resumes.get(str(resume_id), user_id=user_id, columns=columns)
     
-    if not res.data:
+    if not resume:
         raise FitGapException("NOT_FOUND", "Resume not found", 404)
         
-    return success_response({
-        "resume_id": res.data["id"],
-        "parsed_data": res.data["parsed_data"],
-        "created_at": res.data.get("created_at")
-    })
+    return success_response({name: resume.get(name) for name in names})
 
 @app.patch("/resumes/{resume_id}")
-def update_resume(resume_id: UUID, update: ResumeUpdate, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def update_resume(resume_id: UUID, update: ResumeUpdate, token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    current = (
-        supabase.table("resumes")
-        .select("parsed_data")
-        .eq("id", str(resume_id))
-        .eq("user_id", user_id)
-        .single()
-        .execute()
-    )
-    if not current.data:
+    resumes = get_repository().resumes
+    current = await resumes.get(str(resume_id), user_id=user_id, columns="parsed_data")
+    if not current:
         raise FitGapException("NOT_FOUND", "Resume not found", 404)
         
-    new_parsed_data = current.data["parsed_data"].copy()
+    new_parsed_data = (current["parsed_data"] or {}).copy()
     new_parsed_data.update(update.parsed_data)
-    res = supabase.table("resumes").update({"parsed_data": new_parsed_data}).eq("id", str(resume_id)).execute()
+    annotate_resume(annotate_experience(new_parsed_data))
+    updated = await resumes.update(str(resume_id), {"parsed_data": new_parsed_data}, columns="id, parsed_data")
     
-    if not res.data:
+    if not updated:
         raise FitGapException("INTERNAL_ERROR", "Failed to update resume", 500)
-        
+    _sync_candidate_index(str(resume_id), new_parsed_data)
+    await _invalidate_analyses("resume_id", str(resume_id), new_parsed_data, user_id)
+
     return success_response({
-        "resume_id": res.data[0]["id"],
-        "parsed_data": res.data[0]["parsed_data"],
-        "updated_at": res.data[0].get("updated_at")
+        "resume_id": updated["id"],
+        "parsed_data": updated["parsed_data"],
+        "updated_at": updated.get("updated_at")
     })
 
 @app.delete("/resumes/{resume_id}")
-def delete_resume(resume_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def delete_resume(resume_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    res = supabase.table("resumes").delete().eq("id", str(resume_id)).eq("user_id", user_id).execute()
-    if not res.data:
+    deleted = await get_repository().resumes.delete(str(resume_id), user_id)
+    if not deleted:
         raise FitGapException("NOT_FOUND", "Resume not found or already deleted", 404)
+    _sync_candidate_index(str(resume_id), removed=True)
     return success_response({"message": "서류가 삭제되었습니다."})
 
 # --- Job Posting API ---
 
 @app.post("/postings", status_code=201)
 @app.post("/api/v1/postings", status_code=201)
-async def create_posting(posting: PostingCreate, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def create_posting(
+    request: Request,
+    posting: PostingCreate,
+    background: bool = False,
+    token_data: Dict[str, Any] = Depends(require_access_token),
+):
     user_id = token_data.get("sub")
     role = token_data.get("role")
     if role != "COMPANY":
@@ -985,32 +1340,45 @@ async def create_posting(posting: PostingCreate, token_data: Dict[str, Any] = De
         raise FitGapException("TEXT_TOO_SHORT", "Job posting text must be at least 100 characters", 400)
         
     try:
-        parsed_data = await parse_posting_with_llm(posting.raw_text)
-        supabase = get_supabase_client()
-        existing = (
-            supabase.table("job_postings")
-            .select("id")
-            .eq("created_by", user_id)
-            .execute()
-        ).data or []
+        postings = get_repository().postings
+        existing = await postings.list_for_owner(user_id, columns="id")
         if len(existing) >= 3:
             raise FitGapException("LIMIT_EXCEEDED", "Only 3 postings are allowed per account", 400)
+        if background:
+            parsed_dict = {}
+        else:
+            parsed_data = await _await_llm(request, parse_posting_with_llm(posting.raw_text))
+            parsed_dict = annotate_posting(annotate_posting_experience(parsed_data.dict()))
         db_data = {
             "company_name": posting.company_name,
             "raw_text": posting.raw_text,
-            "parsed_data": parsed_data.dict(),
+            "parsed_data": parsed_dict,
             "created_by": user_id,
         }
-        res = supabase.table("job_postings").insert(db_data).execute()
+        created = await postings.create(db_data, columns="id, company_name, created_at")
         
-        if not res.data:
+        if not created:
             raise FitGapException("INTERNAL_ERROR", "Failed to save posting to database", 500)
-            
+
+        if background:
+            job = await get_job_queue().submit(
+                "parse_posting",
+                {"posting_id": created["id"], "raw_text": posting.raw_text},
+                owner=user_id,
+            )
+            return success_response({
+                "posting_id": created["id"],
+                "company_name": created.get("company_name"),
+                "job_id": job.id,
+                "status": job.status,
+                "created_at": created.get("created_at")
+            }, status_code=202)
+
         return success_response({
-            "posting_id": res.data[0]["id"],
-            "company_name": res.data[0].get("company_name"),
-            "parsed_data": parsed_data.dict(),
-            "created_at": res.data[0].get("created_at")
+            "posting_id": created["id"],
+            "company_name": created.get("company_name"),
+            "parsed_data": parsed_dict,
+            "created_at": created.get("created_at")
         }, status_code=201)
         
     except Exception as e:
@@ -1020,80 +1388,113 @@ async def create_posting(posting: PostingCreate, token_data: Dict[str, Any] = De
 
 @app.get("/postings/{posting_id}")
 @app.get("/api/v1/postings/{posting_id}")
-def get_posting(posting_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def get_posting(
+    posting_id: UUID,
+    fields: Optional[str] = None,
+    token_data: Dict[str, Any] = Depends(require_access_token),
+):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    res = (
-        supabase.table("job_postings")
-        .select("*")
-        .eq("id", str(posting_id))
-        .eq("created_by", user_id)
-        .single()
-        .execute()
-    )
+    names, columns = _select_fields(fields, _POSTING_FIELDS, _POSTING_DEFAULT_FIELDS)
+    posting = await get_repository().postings.get(str(posting_id), owner_id=user_id, columns=columns)
     
-    if not res.data:
+    if not posting:
         raise FitGapException("NOT_FOUND", "Job posting not found", 404)
         
-    return success_response({
-        "posting_id": res.data["id"],
-        "company_name": res.data.get("company_name"),
-        "parsed_data": res.data["parsed_data"],
-        "created_at": res.data.get("created_at")
-    })
+    return success_response({name: posting.get(name) for name in names})
+
+@app.get("/api/v1/postings/{posting_id}/candidates")
+async def get_posting_candidates(
+    posting_id: UUID, k: int = 20, token_data: Dict[str, Any] = Depends(require_access_token)
+):
+    user_id = token_data.get("sub")
+    if token_data.get("role") != "COMPANY":
+        raise FitGapException("FORBIDDEN", "Only company accounts can search candidates", 403)
+    if not 1 <= k <= 100:
+        raise FitGapException("INVALID_REQUEST", "k must be between 1 and 100", 400)
+
+    posting = await get_repository().postings.get(
+        str(posting_id), owner_id=user_id, columns="id, parsed_data"
+    )
+    if not posting:
+        raise FitGapException("NOT_FOUND", "Job posting not found", 404)
+
+    parsed = posting.get("parsed_data") or {}
+    index = get_candidate_index()
+    await index.ensure_loaded(_fetch_candidate_rows)
+    profile = select_profile(parsed)
+    candidates = index.top_k(
+        posting_skill_ids(parsed, "required", intern=True),
+        posting_skill_ids(parsed, "preferred", intern=True),
+        k,
+        profile,
+    )
+    return success_response(
+        {
+            "posting_id": str(posting_id),
+            "indexed_resumes": len(index),
+            "scoring_profile": profile.key,
+            "candidates": candidates,
+        }
+    )
 
 @app.patch("/postings/{posting_id}")
 @app.patch("/api/v1/postings/{posting_id}")
-async def update_posting(posting_id: UUID, update: PostingUpdate, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def update_posting(request: Request, posting_id: UUID, update: PostingUpdate, token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
+    postings = get_repository().postings
     
     # 1. Fetch current
-    current = (
-        supabase.table("job_postings")
-        .select("*")
-        .eq("id", str(posting_id))
-        .eq("created_by", user_id)
-        .single()
-        .execute()
+    current = await postings.get(
+        str(posting_id), owner_id=user_id, columns="id, company_name, raw_text, parsed_data"
     )
-    if not current.data:
+    if not current:
         raise FitGapException("NOT_FOUND", "Job posting not found", 404)
         
     update_data = {}
     if update.company_name:
         update_data["company_name"] = update.company_name
         
-    if update.raw_text:
+    if update.raw_text and update.raw_text != current.get("raw_text"):
         if len(update.raw_text) < 100:
             raise FitGapException("TEXT_TOO_SHORT", "Job posting text must be at least 100 characters", 400)
         update_data["raw_text"] = update.raw_text
         # Re-parse
-        parsed_data = await parse_posting_with_llm(update.raw_text)
-        update_data["parsed_data"] = parsed_data.dict()
+        parsed_data = await _await_llm(request, parse_posting_with_llm(update.raw_text))
+        update_data["parsed_data"] = annotate_posting(annotate_posting_experience(parsed_data.dict()))
         
     if not update_data:
+        if update.raw_text:
+            # Same text as stored: nothing to re-parse or write.
+            return success_response({
+                "posting_id": current["id"],
+                "company_name": current.get("company_name"),
+                "parsed_data": current.get("parsed_data"),
+                "updated_at": current.get("updated_at")
+            })
         raise FitGapException("INVALID_REQUEST", "No update fields provided", 400)
         
     # 2. Update
-    res = supabase.table("job_postings").update(update_data).eq("id", str(posting_id)).execute()
+    updated = await postings.update(
+        str(posting_id), update_data, columns="id, company_name, parsed_data"
+    )
     
-    if not res.data:
+    if not updated:
         raise FitGapException("INTERNAL_ERROR", "Failed to update posting", 500)
+    if "parsed_data" in update_data:
+        await _invalidate_analyses("posting_id", str(posting_id), update_data["parsed_data"], user_id)
         
     return success_response({
-        "posting_id": res.data[0]["id"],
-        "company_name": res.data[0].get("company_name"),
-        "parsed_data": res.data[0]["parsed_data"],
-        "updated_at": res.data[0].get("updated_at")
+        "posting_id": updated["id"],
+        "company_name": updated.get("company_name"),
+        "parsed_data": updated["parsed_data"],
+        "updated_at": updated.get("updated_at")
     })
 
 @app.delete("/postings/{posting_id}")
 @app.delete("/api/v1/postings/{posting_id}")
-def delete_posting(posting_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
+async def delete_posting(posting_id: UUID, token_data: Dict[str, Any] = Depends(require_access_token)):
     user_id = token_data.get("sub")
-    supabase = get_supabase_client()
-    res = supabase.table("job_postings").delete().eq("id", str(posting_id)).eq("created_by", user_id).execute()
-    if not res.data:
+    deleted = await get_repository().postings.delete(str(posting_id), user_id)
+    if not deleted:
         raise FitGapException("NOT_FOUND", "Job posting not found or already deleted", 404)
     return success_response({"message": "공고가 삭제되었습니다."})
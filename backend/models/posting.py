@@ -14,6 +14,7 @@ class PostingParsedData(BaseModel):
     responsibilities: List[str]
     required_experience: List[str] = []
     culture_keywords: List[str]
+    job_family: str = ""
 
 class JobPosting(BaseModel):
     id: UUID
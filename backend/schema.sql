@@ -84,3 +84,241 @@ CREATE TABLE IF NOT EXISTS company_profiles (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc', now()),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc', now())
 );
+
+-- 6. LLM Parse Cache (shared tier of core/parse_cache.py)
+CREATE TABLE IF NOT EXISTS llm_parse_cache (
+    cache_key VARCHAR(64) PRIMARY KEY, -- sha256(kind, prompt_version, model, normalized text)
+    kind VARCHAR(30) NOT NULL, -- resume / posting
+    model VARCHAR(100),
+    prompt_version VARCHAR(30),
+    parsed_data JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc', now())
+);
+
+-- 7. Account deletion: one RPC call, one transaction.
+-- Returns the deleted resume IDs and a row count per table, or NULL when the
+-- user does not exist.
+CREATE OR REPLACE FUNCTION delete_account(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_resume_ids UUID[];
+    v_posting_ids UUID[];
+    v_analyses INTEGER;
+    v_posting_insights INTEGER;
+    v_resumes INTEGER;
+    v_job_postings INTEGER;
+    v_jobseeker_profiles INTEGER;
+    v_company_profiles INTEGER;
+    v_oauth_accounts INTEGER;
+    v_users INTEGER;
+BEGIN
+    -- Serialize concurrent deletes of the same account.
+    PERFORM 1 FROM users WHERE id = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT coalesce(array_agg(id), '{}') INTO v_resume_ids FROM resumes WHERE user_id = p_user_id;
+    SELECT coalesce(array_agg(id), '{}') INTO v_posting_ids FROM job_postings WHERE created_by = p_user_id;
+
+    DELETE FROM analyses WHERE resume_id = ANY(v_resume_ids) OR posting_id = ANY(v_posting_ids);
+    GET DIAGNOSTICS v_analyses = ROW_COUNT;
+    DELETE FROM posting_insights WHERE posting_id = ANY(v_posting_ids);
+    GET DIAGNOSTICS v_posting_insights = ROW_COUNT;
+    DELETE FROM resumes WHERE user_id = p_user_id;
+    GET DIAGNOSTICS v_resumes = ROW_COUNT;
+    DELETE FROM job_postings WHERE created_by = p_user_id;
+    GET DIAGNOSTICS v_job_postings = ROW_COUNT;
+    DELETE FROM jobseeker_profiles WHERE user_id = p_user_id;
+    GET DIAGNOSTICS v_jobseeker_profiles = ROW_COUNT;
+    DELETE FROM company_profiles WHERE user_id = p_user_id;
+    GET DIAGNOSTICS v_company_profiles = ROW_COUNT;
+    DELETE FROM oauth_accounts WHERE user_id = p_user_id;
+    GET DIAGNOSTICS v_oauth_accounts = ROW_COUNT;
+    DELETE FROM users WHERE id = p_user_id;
+    GET DIAGNOSTICS v_users = ROW_COUNT;
+
+    RETURN jsonb_build_object(
+        'resume_ids', to_jsonb(v_resume_ids),
+        'deleted', jsonb_build_object(
+            'analyses', v_analyses,
+            'posting_insights', v_posting_insights,
+            'resumes', v_resumes,
+            'job_postings', v_job_postings,
+            'jobseeker_profiles', v_jobseeker_profiles,
+            'company_profiles', v_company_profiles,
+            'oauth_accounts', v_oauth_accounts,
+            'users', v_users
+        )
+    );
+END;
+$$;
+
+-- Takes an arbitrary user id, so only the backend's service role may call it.
+REVOKE ALL ON FUNCTION delete_account(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION delete_account(UUID) TO service_role;
+
+-- 8. My page read model: user, profile, documents and each document's latest
+-- analysis in one round trip. Only the columns the SPA renders are projected;
+-- parsed_data never leaves the database here.
+CREATE OR REPLACE FUNCTION get_mypage(p_user_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'user', jsonb_build_object(
+            'id', u.id, 'email', u.email, 'nickname', u.nickname, 'role', u.role, 'status', u.status
+        ),
+        'profile', CASE u.role
+            WHEN 'JOBSEEKER' THEN (
+                SELECT jsonb_build_object('type', p.type)
+                FROM jobseeker_profiles p WHERE p.user_id = u.id
+            )
+            WHEN 'COMPANY' THEN (
+                SELECT jsonb_build_object('company_name', p.company_name, 'biz_verified', p.biz_verified)
+                FROM company_profiles p WHERE p.user_id = u.id
+            )
+        END,
+        'resumes', CASE WHEN u.role = 'JOBSEEKER' THEN coalesce((
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'id', r.id, 'raw_text', r.raw_text, 'created_at', r.created_at,
+                    'latest_analysis', la.summary
+                ) ORDER BY r.created_at DESC
+            )
+            FROM resumes r
+            LEFT JOIN LATERAL (
+                SELECT jsonb_build_object(
+                    'analysis_id', a.id, 'overall_score', a.overall_score, 'created_at', a.created_at
+                ) AS summary
+                FROM analyses a WHERE a.resume_id = r.id
+                ORDER BY a.created_at DESC LIMIT 1
+            ) la ON TRUE
+            WHERE r.user_id = u.id
+        ), '[]'::jsonb) ELSE '[]'::jsonb END,
+        'postings', CASE WHEN u.role = 'COMPANY' THEN coalesce((
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'id', jp.id, 'company_name', jp.company_name, 'created_at', jp.created_at,
+                    'latest_analysis', la.summary
+                ) ORDER BY jp.created_at DESC
+            )
+            FROM job_postings jp
+            LEFT JOIN LATERAL (
+                SELECT jsonb_build_object(
+                    'analysis_id', a.id, 'overall_score', a.overall_score, 'created_at', a.created_at
+                ) AS summary
+                FROM analyses a WHERE a.posting_id = jp.id
+                ORDER BY a.created_at DESC LIMIT 1
+            ) la ON TRUE
+            WHERE jp.created_by = u.id
+        ), '[]'::jsonb) ELSE '[]'::jsonb END
+    )
+    FROM users u
+    WHERE u.id = p_user_id;
+$$;
+
+REVOKE ALL ON FUNCTION get_mypage(UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_mypage(UUID) TO service_role;
+
+-- 9. Latest-analysis lookups
+CREATE INDEX IF NOT EXISTS analyses_resume_created_idx ON analyses (resume_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS analyses_posting_created_idx ON analyses (posting_id, created_at DESC);
+
+-- Denormalized pointer to each document's newest analysis, kept current by
+-- the triggers below so "latest analysis" is a primary-key lookup.
+ALTER TABLE resumes
+    ADD COLUMN IF NOT EXISTS latest_analysis_id UUID REFERENCES analyses(id) ON DELETE SET NULL;
+ALTER TABLE job_postings
+    ADD COLUMN IF NOT EXISTS latest_analysis_id UUID REFERENCES analyses(id) ON DELETE SET NULL;
+
+-- Statement-level so a bulk insert from batch screening updates each
+-- document once.
+CREATE OR REPLACE FUNCTION analyses_set_latest()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE resumes r SET latest_analysis_id = i.id
+    FROM (
+        SELECT DISTINCT ON (resume_id) resume_id, id
+        FROM inserted WHERE resume_id IS NOT NULL
+        ORDER BY resume_id, created_at DESC
+    ) i
+    WHERE r.id = i.resume_id;
+
+    UPDATE job_postings jp SET latest_analysis_id = i.id
+    FROM (
+        SELECT DISTINCT ON (posting_id) posting_id, id
+        FROM inserted WHERE posting_id IS NOT NULL
+        ORDER BY posting_id, created_at DESC
+    ) i
+    WHERE jp.id = i.posting_id;
+    RETURN NULL;
+END;
+$$;
+
+-- ON DELETE SET NULL has already cleared pointers to deleted rows by the time
+-- this runs; fall back to the next newest analysis.
+CREATE OR REPLACE FUNCTION analyses_reset_latest()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE resumes r SET latest_analysis_id = (
+        SELECT a.id FROM analyses a WHERE a.resume_id = r.id ORDER BY a.created_at DESC LIMIT 1
+    )
+    WHERE r.latest_analysis_id IS NULL
+      AND r.id IN (SELECT resume_id FROM deleted WHERE resume_id IS NOT NULL);
+
+    UPDATE job_postings jp SET latest_analysis_id = (
+        SELECT a.id FROM analyses a WHERE a.posting_id = jp.id ORDER BY a.created_at DESC LIMIT 1
+    )
+    WHERE jp.latest_analysis_id IS NULL
+      AND jp.id IN (SELECT posting_id FROM deleted WHERE posting_id IS NOT NULL);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS analyses_set_latest ON analyses;
+CREATE TRIGGER analyses_set_latest
+    AFTER INSERT ON analyses
+    REFERENCING NEW TABLE AS inserted
+    FOR EACH STATEMENT EXECUTE FUNCTION analyses_set_latest();
+
+DROP TRIGGER IF EXISTS analyses_reset_latest ON analyses;
+CREATE TRIGGER analyses_reset_latest
+    AFTER DELETE ON analyses
+    REFERENCING OLD TABLE AS deleted
+    FOR EACH STATEMENT EXECUTE FUNCTION analyses_reset_latest();
+
+-- Backfill pointers for analyses that predate the triggers.
+UPDATE resumes r SET latest_analysis_id = (
+    SELECT a.id FROM analyses a WHERE a.resume_id = r.id ORDER BY a.created_at DESC LIMIT 1
+)
+WHERE r.latest_analysis_id IS NULL;
+UPDATE job_postings jp SET latest_analysis_id = (
+    SELECT a.id FROM analyses a WHERE a.posting_id = jp.id ORDER BY a.created_at DESC LIMIT 1
+)
+WHERE jp.latest_analysis_id IS NULL;
+
+-- 10. Incremental re-analysis: the per-field content hashes each analysis
+-- was computed from (logic/reanalysis.py), and whether a later document
+-- edit has invalidated it.
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS input_hashes JSONB;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS stale BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- 11. Analysis memo: repeat requests for an unchanged resume/posting pair
+-- return the stored row instead of inserting a new one.
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS memo_key TEXT;
+CREATE INDEX IF NOT EXISTS analyses_memo_idx
+    ON analyses (resume_id, posting_id, memo_key) WHERE memo_key IS NOT NULL;
+
+-- 12. Background parsing: error code for why the last parse job for a document failed
+-- (NULL once a parse succeeds), so a failed parse is not mistaken for one
+-- still running.
+ALTER TABLE resumes ADD COLUMN IF NOT EXISTS parse_error TEXT;
+ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS parse_error TEXT;
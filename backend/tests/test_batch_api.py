@@ -0,0 +1,88 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from core.security import create_access_token
+from uuid import uuid4
+
+client = TestClient(app)
+
+@pytest.fixture
+def company_auth(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("company-1", "COMPANY", 10)
+    return {"Authorization": f"Bearer {token}"}
+
+def test_batch_analysis_ranks_and_bulk_inserts(mocker, company_auth):
+    posting_id = str(uuid4())
+    strong, weak = str(uuid4()), str(uuid4())
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.get.return_value = {
+        "id": posting_id, "parsed_data": {"required_skills": [{"name": "Python"}, {"name": "SQL"}]}
+    }
+    repo.resumes.get_many.return_value = [
+        {"id": weak, "parsed_data": {"skills": [{"name": "Java"}]}},
+        {"id": strong, "parsed_data": {"skills": [{"name": "Python"}, {"name": "SQL"}]}},
+    ]
+    repo.analyses.create_many.return_value = [
+        {"id": "a-weak", "resume_id": weak}, {"id": "a-strong", "resume_id": strong}
+    ]
+
+    payload = {
+        "posting_id": posting_id,
+        "resume_ids": [weak, strong, str(uuid4())],
+        "resumes": [{"ref": "inline-1", "parsed_data": {"skills": ["python"]}}],
+    }
+    response = client.post("/api/v1/analyze/batch", json=payload, headers=company_auth)
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["total"] == 3
+    assert [r["rank"] for r in data["results"]] == [1, 2, 3]
+    assert data["results"][0]["resume_id"] == strong
+    assert data["results"][0]["analysis_id"] == "a-strong"
+    assert data["results"][1]["ref"] == "inline-1"
+    assert data["results"][1]["analysis_id"] is None
+    assert len(data["missing_resume_ids"]) == 1
+
+    assert repo.resumes.get_many.await_count == 1
+    assert repo.analyses.create_many.await_count == 1
+    assert len(repo.analyses.create_many.await_args.args[0]) == 2
+
+def test_batch_analysis_requires_company(mocker, monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("user-1", "JOBSEEKER", 10)
+    response = client.post(
+        "/api/v1/analyze/batch",
+        json={"posting_id": str(uuid4()), "resume_ids": [str(uuid4())]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+def test_batch_analysis_enforces_max_size(mocker, company_auth, monkeypatch):
+    monkeypatch.setenv("BATCH_ANALYSIS_MAX", "2")
+    payload = {"posting_id": str(uuid4()), "resume_ids": [str(uuid4()) for _ in range(3)]}
+    response = client.post("/api/v1/analyze/batch", json=payload, headers=company_auth)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_REQUEST"
+
+def test_posting_candidates_top_k(mocker, company_auth):
+    from logic.matching_index import _reset_candidate_index
+    _reset_candidate_index()
+    posting_id = str(uuid4())
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.get.return_value = {
+        "id": posting_id, "parsed_data": {"required_skills": [{"name": "Python"}], "preferred_skills": []}
+    }
+    repo.resumes.page.return_value = [
+        {"id": "r1", "skill_index": None, "skills": [{"name": "python"}]},
+        {"id": "r2", "skill_index": None, "skills": [{"name": "Java"}]},
+    ]
+    response = client.get(f"/api/v1/postings/{posting_id}/candidates?k=5", headers=company_auth)
+    _reset_candidate_index()
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["indexed_resumes"] == 2
+    assert [c["resume_id"] for c in data["candidates"]] == ["r1"]
@@ -0,0 +1,76 @@
+from core.compaction import (
+    PAGE_BREAK,
+    _reset_compaction_stats,
+    compact_text,
+    estimate_tokens,
+    fit_to_budget,
+    get_compaction_stats,
+    prepare_prompt_text,
+)
+
+def _page(n, body):
+    return f"Jane Doe · Resume\n{body}\n\n\n\nPage {n} of 3\n"
+
+def test_compact_text_strips_headers_footers_and_page_numbers():
+    raw = PAGE_BREAK.join([
+        _page(1, "Backend Engineer   at   Acme\n2019.03 - 2021.06"),
+        _page(2, "Data Engineer at Beta\n2021.07 - 2023.01"),
+        _page(3, "Skills: Python, SQL"),
+    ])
+    compact = compact_text(raw)
+    lines = compact.text.split("\n")
+    assert lines.count("Jane Doe · Resume") == 1
+    assert not any(line.startswith("Page") for line in lines)
+    assert "Backend Engineer at Acme" in lines
+    assert "2019.03 - 2021.06" in lines and "2021.07 - 2023.01" in lines
+    assert "" in lines and "\n\n\n" not in compact.text
+    assert compact.ratio < 1
+
+def test_compact_text_keeps_repeated_content_in_the_body():
+    raw = PAGE_BREAK.join([
+        "Header\nExperience\nSoftware Engineer\nAcme\nJava\nGo\nRust\nFooter",
+        "Header\nProjects\nSoftware Engineer\nBeta\nJava\nGo\nRust\nFooter",
+    ])
+    lines = compact_text(raw).text.split("\n")
+    assert lines.count("Software Engineer") == 2
+    assert lines.count("Header") == 1 and lines.count("Footer") == 1
+
+def test_compact_text_drops_duplicated_lines():
+    sidebar = "Led the migration of the billing platform to Kubernetes"
+    compact = compact_text(f"Summary\nSummary\n{sidebar}\nOther\n{sidebar}")
+    assert compact.text == f"Summary\n{sidebar}\nOther"
+
+def test_estimate_tokens_counts_hangul_denser_than_ascii():
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("가나다") == 2
+
+def test_fit_to_budget_truncates_at_line_boundaries():
+    compact = compact_text("\n".join(f"line {i} " + "x" * 36 for i in range(100)))
+    fitted = fit_to_budget(compact, 50)
+    assert fitted.truncated
+    assert fitted.tokens <= 50
+    assert compact.text.startswith(fitted.text)
+    assert fit_to_budget(compact, 0) is compact
+
+def test_compaction_stats_record_ratio(monkeypatch):
+    _reset_compaction_stats()
+    monkeypatch.setenv("LLM_INPUT_TOKEN_BUDGET", "0")
+    get_compaction_stats().record(prepare_prompt_text("Python   developer\n\n\n\n5 years"))
+    stats = get_compaction_stats().stats()
+    _reset_compaction_stats()
+    assert stats["documents"] == 1
+    assert stats["compact_chars"] < stats["original_chars"]
+    assert 0 < stats["ratio"] < 1
+
+def test_compact_text_keeps_numbers_inside_a_page():
+    raw = "1\nScore\n95\nTOEIC\n900\nProjects: 12\nAwards\n2" + PAGE_BREAK + "Education\n3\nGPA\n2"
+    lines = compact_text(raw).text.split("\n")
+    assert lines == ["Score", "95", "TOEIC", "900", "Projects: 12", "Awards", "Education", "3", "GPA"]
+
+def test_fit_to_budget_cuts_a_single_long_line():
+    compact = compact_text("Python developer needed. " * 1720)
+    fitted = fit_to_budget(compact, 1000)
+    assert fitted.truncated
+    assert 0 < fitted.tokens <= 1000
+    assert len(fitted.text) > 3500
+    assert compact.text.startswith(fitted.text)
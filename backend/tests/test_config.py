@@ -0,0 +1,13 @@
+from core.config import get_float_env, get_int_env
+
+def test_env_helpers_parse_values(monkeypatch):
+    monkeypatch.setenv("FITGAP_TEST_INT", "7")
+    monkeypatch.setenv("FITGAP_TEST_FLOAT", "0.25")
+    assert get_int_env("FITGAP_TEST_INT", 1) == 7
+    assert get_float_env("FITGAP_TEST_FLOAT", 1.0) == 0.25
+
+def test_env_helpers_fall_back_on_missing_or_malformed(monkeypatch):
+    monkeypatch.delenv("FITGAP_TEST_INT", raising=False)
+    monkeypatch.setenv("FITGAP_TEST_FLOAT", "fast")
+    assert get_int_env("FITGAP_TEST_INT", 3) == 3
+    assert get_float_env("FITGAP_TEST_FLOAT", 1.5) == 1.5
@@ -33,3 +33,69 @@ def test_check_experience_fit_partial():
     
     alignment = check_experience_fit(resume_exp, job_min_years)
     assert alignment == "Partial"
+
+from datetime import date
+from logic.experience import (
+    annotate_experience,
+    annotate_posting_experience,
+    experience_years,
+    parse_duration,
+    parse_min_years,
+    resume_experience_fit,
+)
+
+TODAY = date(2024, 6, 15)
+
+@pytest.mark.parametrize(
+    "text, months",
+    [
+        ("2019.03 - 2021.06", 28),
+        ("2019.03 - 2021.06 (2년 4개월)", 28),
+        ("2020년 3월 ~ 현재", 52),
+        ("Mar 2020 – Present", 52),
+        ("03/2019 - 06/2019", 4),
+        ("2022.01 ~", 30),
+        ("2년 3개월", 27),
+        ("1.5 years", 18),
+        ("18 months", 18),
+        ("2020년 입사", 0),
+    ],
+)
+def test_parse_duration_months(text, months):
+    periods, undated = parse_duration(text, TODAY)
+    assert sum(end - start + 1 for start, end in periods) + undated == months
+
+def test_annotate_experience_merges_overlaps():
+    parsed = {
+        "experiences": [
+            {"title": "A", "duration": "2019.01 - 2020.12"},
+            {"title": "B", "duration": "2020.06 - 2021.05"},
+            {"title": "C", "duration": "6개월"},
+        ]
+    }
+    annotate_experience(parsed, TODAY)
+    assert [e["months"] for e in parsed["experiences"]] == [24, 12, 6]
+    assert parsed["experience_total"]["months"] == 35
+    assert experience_years(parsed) == pytest.approx(35 / 12, abs=0.01)
+
+def test_experience_years_derives_for_unannotated_resumes():
+    assert experience_years({"experiences": [{"duration": "3 years"}]}) == 3
+    assert experience_years({"experience": [{"years": 2}]}) == 2
+
+def test_posting_min_years_from_requirements():
+    assert parse_min_years(["Python 3년 이상", "3~5년 경력"]) == 3
+    assert parse_min_years(["5+ years of backend development"]) == 5
+    assert parse_min_years(["신입 가능"]) == 0
+    assert parse_min_years(["팀워크"]) is None
+    assert annotate_posting_experience({"required_experience": ["2년 이상"]})["min_experience"] == 2
+
+def test_resume_experience_fit_reads_experiences():
+    resume = {"experiences": [{"duration": "2021.01 - 2023.12"}]}
+    assert resume_experience_fit(resume, {"required_experience": ["3년 이상"]}) == "Matches"
+    assert resume_experience_fit(resume, {"min_experience": 5}) == "Below"
+
+def test_check_experience_fit_parses_durations():
+    # Overlapping 2021-2022 and 2022-2023 jobs: 3 years, not 4.
+    resume_exp = [{"duration": "2021.01 - 2022.12"}, {"duration": "2022.01 - 2023.12"}]
+    assert check_experience_fit(resume_exp, 3) == "Matches"
+    assert check_experience_fit(resume_exp, 4) == "Below"
@@ -0,0 +1,74 @@
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from core import google_oauth
+from core.google_oauth import JwksCache, verify_google_id_token
+
+def _make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk["kid"] = kid
+    return private_key, jwk
+
+def _jwks_response(mocker, jwks, cache_control="public, max-age=3600"):
+    res = mocker.MagicMock()
+    res.json.return_value = {"keys": jwks}
+    res.headers = {"Cache-Control": cache_control}
+    return res
+
+@pytest.fixture(autouse=True)
+def reset_jwks_cache():
+    google_oauth._jwks_cache.clear()
+    yield
+    google_oauth._jwks_cache.clear()
+
+def test_verify_google_id_token_fetches_jwks_once(mocker, monkeypatch):
+    monkeypatch.setenv("GOOGLE_CLIENT_ID", "client-1")
+    private_key, jwk = _make_key("k1")
+    mock_get = mocker.patch("core.google_oauth.requests.get", return_value=_jwks_response(mocker, [jwk]))
+    token = jwt.encode(
+        {"sub": "123", "aud": "client-1", "iss": "https://accounts.google.com", "exp": int(time.time()) + 60},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "k1"},
+    )
+    assert verify_google_id_token(token)["sub"] == "123"
+    assert verify_google_id_token(token)["sub"] == "123"
+    assert mock_get.call_count == 1
+
+def test_unknown_kid_triggers_single_refetch(mocker):
+    _, jwk1 = _make_key("k1")
+    _, jwk2 = _make_key("k2")
+    mock_get = mocker.patch(
+        "core.google_oauth.requests.get",
+        side_effect=[_jwks_response(mocker, [jwk1]), _jwks_response(mocker, [jwk1, jwk2])],
+    )
+    cache = JwksCache("https://example.test/certs", min_refetch_interval=0)
+    assert cache.get_key("k1") is not None
+    assert cache.get_key("k2") is not None
+    assert mock_get.call_count == 2
+
+def test_unknown_kid_refetch_is_rate_limited(mocker):
+    _, jwk1 = _make_key("k1")
+    mock_get = mocker.patch("core.google_oauth.requests.get", return_value=_jwks_response(mocker, [jwk1]))
+    cache = JwksCache("https://example.test/certs", min_refetch_interval=60)
+    assert cache.get_key("k1") is not None
+    assert cache.get_key("missing") is None
+    assert cache.get_key("missing") is None
+    assert mock_get.call_count == 1
+
+def test_expired_keys_are_refetched_and_kept_on_failure(mocker):
+    _, jwk1 = _make_key("k1")
+    mock_get = mocker.patch(
+        "core.google_oauth.requests.get",
+        side_effect=[_jwks_response(mocker, [jwk1], "max-age=0"), RuntimeError("network down")],
+    )
+    cache = JwksCache("https://example.test/certs")
+    assert cache.get_key("k1") is not None
+    # Expired immediately; the refetch fails but the cached key is still served.
+    assert cache.get_key("k1") is not None
+    assert mock_get.call_count == 2
+    # The failure backs off instead of retrying on every verification.
+    assert cache.get_key("k1") is not None
+    assert mock_get.call_count == 2
@@ -0,0 +1,211 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from core.jobs import LocalJobQueue
+from core.security import create_access_token
+from uuid import uuid4
+
+client = TestClient(app)
+
+@pytest.fixture
+def company_auth(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("company-1", "COMPANY", 10)
+    return {"Authorization": f"Bearer {token}"}
+
+async def _wait_done(queue, job):
+    while not job.done:
+        await queue.wait_for_change(job, job.version, timeout=1)
+
+def test_job_queue_runs_job_to_success():
+    async def run():
+        queue = LocalJobQueue(workers=2)
+
+        async def handler(payload):
+            return {"doubled": payload["n"] * 2}
+
+        queue.register("double", handler)
+        job = await queue.submit("double", {"n": 21}, owner="u1")
+        await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "succeeded"
+    assert job.result == {"doubled": 42}
+    assert job.attempts == 1
+
+def test_job_queue_retries_then_fails():
+    calls = []
+
+    async def run():
+        queue = LocalJobQueue(workers=1, max_attempts=3, backoff_seconds=0.001)
+
+        async def handler(payload):
+            calls.append(payload)
+            raise RuntimeError("LLM unavailable")
+
+        queue.register("flaky", handler)
+        job = await queue.submit("flaky", {})
+        await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "failed"
+    assert job.attempts == 3
+    assert len(calls) == 3
+    assert job.error == "JOB_FAILED"
+
+def test_job_queue_recovers_on_retry():
+    attempts = []
+
+    async def run():
+        queue = LocalJobQueue(workers=1, backoff_seconds=0.001)
+
+        async def handler(payload):
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise RuntimeError("transient")
+            return {"ok": True}
+
+        queue.register("transient", handler)
+        job = await queue.submit("transient", {})
+        await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "succeeded"
+    assert job.attempts == 2
+    assert job.error is None
+
+def test_job_queue_fails_permanent_errors_without_retry():
+    calls, failures = [], []
+
+    async def run():
+        queue = LocalJobQueue(workers=1, max_attempts=3, backoff_seconds=0.001)
+
+        async def handler(payload):
+            calls.append(payload)
+            raise ValueError("unparseable document")
+
+        async def on_failure(payload, error):
+            failures.append((payload, str(error)))
+
+        queue.register(
+            "parse", handler, retry_if=lambda e: not isinstance(e, ValueError), on_failure=on_failure
+        )
+        job = await queue.submit("parse", {"resume_id": "r1"})
+        await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "failed"
+    assert job.attempts == 1
+    assert failures == [({"resume_id": "r1"}, "unparseable document")]
+    assert job.error == "JOB_FAILED"
+
+def test_job_error_is_a_code_not_exception_text():
+    from core.errors import FitGapException
+
+    async def run():
+        queue = LocalJobQueue(workers=1, max_attempts=1)
+
+        async def handler(payload):
+            raise FitGapException("LLM_UNAVAILABLE", "upstream said: secret-key-123", 503)
+
+        async def leaky(payload):
+            raise RuntimeError("secret-key-123")
+
+        queue.register("coded", handler)
+        queue.register("custom", leaky, error_code=lambda e: "CUSTOM")
+        jobs = [await queue.submit("coded", {}), await queue.submit("custom", {})]
+        for job in jobs:
+            await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return jobs
+
+    coded, custom = asyncio.run(run())
+    assert coded.error == "LLM_UNAVAILABLE"
+    assert custom.error == "CUSTOM"
+
+def test_parse_resume_job_marks_resume_failed(mocker):
+    from core.llm import LLMTimeoutError
+    import main
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    queue = main.get_job_queue()
+    mocker.patch.object(queue, "max_attempts", 2)
+    mocker.patch.object(queue, "backoff_seconds", 0.001)
+    parse = mocker.patch("main.parse_resume_with_llm", side_effect=LLMTimeoutError("slow"))
+
+    async def run():
+        job = await queue.submit("parse_resume", {"resume_id": "r1", "raw_text": "text"}, owner="u1")
+        await asyncio.wait_for(_wait_done(queue, job), 2)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == "failed"
+    assert parse.await_count == 2
+    assert job.error == "ANALYSIS_TIMEOUT"
+    repo.resumes.update.assert_awaited_once_with("r1", {"parse_error": "ANALYSIS_TIMEOUT"}, columns="id")
+
+def test_parse_error_code_hides_exception_text():
+    from core.llm import LLMTimeoutError, LLMUnavailableError, parse_error_code
+    assert parse_error_code(LLMTimeoutError("slow")) == "ANALYSIS_TIMEOUT"
+    assert parse_error_code(LLMUnavailableError("busy")) == "LLM_UNAVAILABLE"
+    assert parse_error_code(ValueError("prompt text leaked")) == "PARSE_FAILED"
+
+def test_job_queue_rejects_unknown_kind():
+    async def run():
+        await LocalJobQueue().submit("missing", {})
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+def test_background_posting_returns_202_with_job(mocker, company_auth):
+    posting_id = str(uuid4())
+    parse = mocker.patch("main.parse_posting_with_llm")
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.list_for_owner.return_value = []
+    repo.postings.create.return_value = {"id": posting_id, "company_name": "Co", "created_at": "now"}
+    queue = LocalJobQueue()
+    queue.register("parse_posting", mocker.AsyncMock(return_value={}))
+    mocker.patch("main.get_job_queue", return_value=queue)
+
+    payload = {"company_name": "Co", "raw_text": "We need a Python developer. " * 10}
+    response = client.post("/api/v1/postings?background=true", json=payload, headers=company_auth)
+
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["posting_id"] == posting_id
+    parse.assert_not_called()
+    inserted = repo.postings.create.await_args.args[0]
+    assert inserted["parsed_data"] == {}
+
+    job = queue.get(data["job_id"])
+    assert job.payload["posting_id"] == posting_id
+    assert job.owner == "company-1"
+
+    status = client.get(f"/api/v1/jobs/{data['job_id']}", headers=company_auth)
+    assert status.status_code == 200
+    assert status.json()["data"]["job_id"] == data["job_id"]
+
+def test_get_job_hides_other_users_jobs(mocker, company_auth):
+    async def run():
+        queue = LocalJobQueue()
+        queue.register("parse_posting", mocker.AsyncMock(return_value={}))
+        job = await queue.submit("parse_posting", {}, owner="someone-else")
+        await queue.stop()
+        return queue, job
+
+    queue, job = asyncio.run(run())
+    mocker.patch("main.get_job_queue", return_value=queue)
+
+    response = client.get(f"/api/v1/jobs/{job.id}", headers=company_auth)
+    assert response.status_code == 404
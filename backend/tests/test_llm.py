@@ -59,3 +59,312 @@ def test_parse_llm_posting_response():
     parsed = parse_llm_posting_response(mock_response)
     assert isinstance(parsed, PostingParsedData)
     assert parsed.required_skills[0].name == "Python"
+    assert parsed.job_family == ""
+
+def test_parsed_posting_job_family_selects_profile():
+    from core.llm import parse_llm_posting_response
+    from logic.scoring import select_profile
+    mock_response = """
+    {
+        "required_skills": [],
+        "preferred_skills": [],
+        "responsibilities": [],
+        "culture_keywords": [],
+        "job_family": "engineering"
+    }
+    """
+    parsed = parse_llm_posting_response(mock_response)
+    assert select_profile(parsed.dict()).key == "engineering@v1"
+
+def test_parse_resume_with_llm_uses_async_client(mocker):
+    import asyncio
+    import core.llm as llm
+    from core.parse_cache import _reset_parse_cache
+    llm._reset_llm_limits()
+    _reset_parse_cache()
+    mock_response = mocker.MagicMock()
+    mock_response.text = '{"skills": [], "experiences": [], "metrics": [], "soft_skills": [], "keywords": []}'
+    mock_generate = mocker.patch.object(
+        llm.client.aio.models, "generate_content", new=mocker.AsyncMock(return_value=mock_response)
+    )
+    parsed = asyncio.run(llm.parse_resume_with_llm("Python developer"))
+    assert isinstance(parsed, ResumeParsedData)
+    mock_generate.assert_awaited_once()
+
+def test_parse_posting_compacts_text_once(mocker):
+    import asyncio
+    import core.llm as llm
+    from core.parse_cache import _reset_parse_cache
+    _reset_parse_cache()
+    prepare = mocker.patch("core.llm.prepare_prompt_text", wraps=llm.prepare_prompt_text)
+    generate = mocker.patch(
+        "core.llm.generate_json",
+        new=mocker.AsyncMock(
+            return_value='{"required_skills": [], "preferred_skills": [], "responsibilities": [], "culture_keywords": []}'
+        ),
+    )
+    asyncio.run(llm.parse_posting_with_llm("Backend   engineer\n\n\n\nPython"))
+    prepare.assert_called_once()
+    assert "Backend engineer" in generate.await_args.args[0]
+
+def test_generate_json_timeout(mocker, monkeypatch):
+    import asyncio
+    import core.llm as llm
+    llm._reset_llm_limits()
+    monkeypatch.setenv("LLM_TIMEOUT_SECONDS", "0.05")
+
+    async def slow_call(**kwargs):
+        await asyncio.sleep(1)
+
+    mocker.patch.object(llm.client.aio.models, "generate_content", new=slow_call)
+    with pytest.raises(llm.LLMTimeoutError):
+        asyncio.run(llm.generate_json("prompt"))
+
+def test_generate_json_respects_concurrency_limit(mocker, monkeypatch):
+    import asyncio
+    import core.llm as llm
+    llm._reset_llm_limits()
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "2")
+    state = {"active": 0, "peak": 0}
+
+    async def tracked_call(**kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        response = mocker.MagicMock()
+        response.text = "{}"
+        return response
+
+    mocker.patch.object(llm.client.aio.models, "generate_content", new=tracked_call)
+
+    async def run_many():
+        await asyncio.gather(*(llm.generate_json("p") for _ in range(6)))
+
+    asyncio.run(run_many())
+    llm._reset_llm_limits()
+    assert state["peak"] == 2
+
+POSTING_DOC = {
+    "required_skills": [{"name": "Python", "detail": "", "source": ""}],
+    "preferred_skills": [],
+    "responsibilities": [],
+    "required_experience": [],
+    "culture_keywords": [],
+}
+
+def _batch_llm(mocker, responder):
+    import core.llm as llm
+    from core.parse_cache import _reset_parse_cache
+    llm._reset_llm_limits()
+    _reset_parse_cache()
+    prompts = []
+
+    async def call(**kwargs):
+        prompts.append(kwargs["contents"])
+        response = mocker.MagicMock()
+        response.text = responder(kwargs["contents"])
+        return response
+
+    mocker.patch.object(llm.client.aio.models, "generate_content", new=call)
+    return llm, prompts
+
+def test_parse_postings_batches_documents(mocker, monkeypatch):
+    import asyncio
+    import json
+    monkeypatch.setenv("LLM_BATCH_SIZE", "3")
+
+    def respond(prompt):
+        count = prompt.count("=== END DOCUMENT")
+        return json.dumps({"documents": [POSTING_DOC] * count})
+
+    llm, prompts = _batch_llm(mocker, respond)
+    texts = [f"posting {i}" for i in range(5)] + ["posting 0"]
+    parsed = asyncio.run(llm.parse_postings_with_llm(texts))
+
+    assert len(parsed) == 6
+    assert all(p.required_skills[0].name == "Python" for p in parsed)
+    assert len(prompts) == 2
+    assert "=== DOCUMENT 3 ===" in prompts[0]
+
+    # Batch results land in the single-document cache.
+    asyncio.run(llm.parse_posting_with_llm("posting 4"))
+    assert len(prompts) == 2
+
+def test_parse_postings_falls_back_per_document(mocker):
+    import asyncio
+    import json
+
+    def respond(prompt):
+        if "=== DOCUMENT" in prompt:
+            return json.dumps({"documents": [POSTING_DOC, "oops"]})
+        return json.dumps(POSTING_DOC)
+
+    llm, prompts = _batch_llm(mocker, respond)
+    parsed = asyncio.run(llm.parse_postings_with_llm(["good", "bad"]))
+
+    assert [p.required_skills[0].name for p in parsed] == ["Python", "Python"]
+    assert len(prompts) == 2
+    assert "bad" in prompts[1] and "=== DOCUMENT" not in prompts[1]
+
+@pytest.mark.parametrize("error", ["unavailable", "rejected"])
+def test_parse_postings_falls_back_when_batch_call_fails(mocker, error):
+    import asyncio
+    import json
+    from google.genai import errors as genai_errors
+    from core.llm import LLMUnavailableError
+
+    def respond(prompt):
+        if "=== DOCUMENT" in prompt:
+            if error == "unavailable":
+                raise LLMUnavailableError("busy")
+            raise genai_errors.APIError(400, {"error": {"code": 400, "message": "Prompt too long"}})
+        return json.dumps(POSTING_DOC)
+
+    llm, prompts = _batch_llm(mocker, respond)
+    parsed = asyncio.run(llm.parse_postings_with_llm(["first", "second"]))
+
+    assert [p.required_skills[0].name for p in parsed] == ["Python", "Python"]
+    assert len(prompts) == 3
+    assert all("=== DOCUMENT" not in p for p in prompts[1:])
+
+def test_parse_postings_batch_server_error_is_raised(mocker, monkeypatch):
+    import asyncio
+    from google.genai import errors as genai_errors
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+
+    def respond(prompt):
+        raise genai_errors.APIError(500, {"error": {"code": 500, "message": "Internal"}})
+
+    llm, prompts = _batch_llm(mocker, respond)
+    with pytest.raises(genai_errors.APIError):
+        asyncio.run(llm.parse_postings_with_llm(["first", "second"]))
+    assert len(prompts) == 1
+
+def test_parse_postings_repairs_batch_entries_field_by_field(mocker):
+    import asyncio
+    import json
+
+    def respond(prompt):
+        if "=== DOCUMENT" in prompt:
+            partial = {k: v for k, v in POSTING_DOC.items() if k != "responsibilities"}
+            return json.dumps({"documents": [POSTING_DOC, partial]})
+        return json.dumps({"responsibilities": ["Ship"]})
+
+    llm, prompts = _batch_llm(mocker, respond)
+    parsed = asyncio.run(llm.parse_postings_with_llm(["good", "partial"]))
+
+    assert parsed[1].responsibilities == ["Ship"]
+    assert parsed[1].required_skills[0].name == "Python"
+    assert len(prompts) == 2
+    assert "Extract only the fields" in prompts[1] and "partial" in prompts[1]
+
+def test_split_batch_response_rejects_wrong_count():
+    from core.llm import split_batch_response
+    with pytest.raises(ValueError):
+        split_batch_response('{"documents": [{}]}', 2)
+    with pytest.raises(ValueError):
+        split_batch_response("not json", 1)
+
+def _api_error(code):
+    from google.genai import errors
+    return errors.APIError(code, {"error": {"code": code, "message": "overloaded", "status": "UNAVAILABLE"}})
+
+def test_generate_json_retries_overload_errors(mocker, monkeypatch):
+    import asyncio
+    import core.llm as llm
+    llm._reset_llm_limits()
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "0.001")
+    response = mocker.MagicMock()
+    response.text = "{}"
+    mock_generate = mocker.patch.object(
+        llm.client.aio.models,
+        "generate_content",
+        new=mocker.AsyncMock(side_effect=[_api_error(429), _api_error(503), response]),
+    )
+    assert asyncio.run(llm.generate_json("p")) == "{}"
+    assert mock_generate.await_count == 3
+    stats = llm.llm_stats()
+    llm._reset_llm_limits()
+    assert stats["circuit"]["state"] == "closed"
+    assert stats["concurrency"]["limit"] < stats["concurrency"]["max_limit"]
+
+def test_generate_json_does_not_retry_client_errors(mocker):
+    import asyncio
+    import core.llm as llm
+    llm._reset_llm_limits()
+    mock_generate = mocker.patch.object(
+        llm.client.aio.models, "generate_content", new=mocker.AsyncMock(side_effect=_api_error(400))
+    )
+    with pytest.raises(Exception):
+        asyncio.run(llm.generate_json("p"))
+    llm._reset_llm_limits()
+    assert mock_generate.await_count == 1
+
+def test_generate_json_fails_fast_when_circuit_open(mocker, monkeypatch):
+    import asyncio
+    import core.llm as llm
+    from core.errors import FitGapException
+    llm._reset_llm_limits()
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    monkeypatch.setenv("LLM_BREAKER_FAILURES", "2")
+    mock_generate = mocker.patch.object(
+        llm.client.aio.models, "generate_content", new=mocker.AsyncMock(side_effect=_api_error(503))
+    )
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await llm.generate_json("p")
+        with pytest.raises(FitGapException) as exc:
+            await llm.generate_json("p")
+        return exc.value
+
+    error = asyncio.run(run())
+    llm._reset_llm_limits()
+    assert error.code == "LLM_UNAVAILABLE"
+    assert error.status_code == 503
+    assert mock_generate.await_count == 2
+
+def test_parse_posting_repairs_only_invalid_fields(mocker):
+    import asyncio
+    import json
+    import core.llm as llm
+    from core.parse_cache import _reset_parse_cache
+    llm._reset_llm_limits()
+    _reset_parse_cache()
+    first = mocker.MagicMock()
+    first.text = json.dumps({k: v for k, v in POSTING_DOC.items() if k != "culture_keywords"})
+    repair = mocker.MagicMock()
+    repair.text = '{"culture_keywords": ["Fast"]}'
+    mock_generate = mocker.patch.object(
+        llm.client.aio.models, "generate_content", new=mocker.AsyncMock(side_effect=[first, repair])
+    )
+    parsed = asyncio.run(llm.parse_posting_with_llm("Looking for a Python developer " * 5))
+    llm._reset_llm_limits()
+    assert parsed.culture_keywords == ["Fast"]
+    assert parsed.required_skills[0].name == "Python"
+    repair_prompt = mock_generate.await_args_list[1].kwargs["contents"]
+    assert '"culture_keywords"' in repair_prompt
+    assert '"required_skills"' not in repair_prompt
+
+def test_compaction_counted_once_per_document_across_batch_and_repair(mocker):
+    import asyncio
+    import json
+    from core.compaction import _reset_compaction_stats, get_compaction_stats
+
+    def respond(prompt):
+        if "=== DOCUMENT" in prompt:
+            partial = {k: v for k, v in POSTING_DOC.items() if k != "responsibilities"}
+            return json.dumps({"documents": [POSTING_DOC, partial, "oops"]})
+        if "Extract only the fields" in prompt:
+            return json.dumps({"responsibilities": ["Ship"]})
+        return json.dumps(POSTING_DOC)
+
+    llm, prompts = _batch_llm(mocker, respond)
+    _reset_compaction_stats()
+    asyncio.run(llm.parse_postings_with_llm(["good", "partial", "bad"]))
+    documents = get_compaction_stats().stats()["documents"]
+    _reset_compaction_stats()
+    assert len(prompts) == 3
+    assert documents == 3
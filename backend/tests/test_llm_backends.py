@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+from core.llm_backends import (
+    LLMBackend,
+    RecordReplayBackend,
+    RecordingNotFoundError,
+    SyntheticBackend,
+    create_backend,
+    parse_latency,
+    synthesize_response,
+)
+from core.llm import (
+    POSTING_SCHEMA,
+    generate_batch_prompt,
+    generate_resume_prompt,
+    parse_llm_resume_response,
+    split_batch_response,
+)
+
+RESUME_TEXT = "Backend developer with Python, FastAPI and PostgreSQL experience at Acme."
+
+def test_synthesize_response_matches_prompt_schema():
+    parsed = parse_llm_resume_response(synthesize_response(generate_resume_prompt(RESUME_TEXT)))
+    assert parsed.skills
+    assert {s.name for s in parsed.skills} <= set(RESUME_TEXT.replace(",", "").rstrip(".").split())
+
+def test_synthesize_response_answers_each_batch_document():
+    prompt = generate_batch_prompt("job posting", POSTING_SCHEMA, ["Python role", "Go role", "Rust role"])
+    documents = split_batch_response(synthesize_response(prompt), 3)
+    assert all(doc["required_skills"] for doc in documents)
+
+def test_parse_latency_rejects_unknown_distributions():
+    assert parse_latency("lognormal:0.8,0.5") == ("lognormal", (0.8, 0.5))
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+    with pytest.raises(ValueError):
+        parse_latency("uniform:1")
+
+def test_synthetic_backend_is_reproducible_with_a_seed():
+    a = SyntheticBackend(latency="uniform:0,2", error_rate=0.5, seed=7)
+    b = SyntheticBackend(latency="uniform:0,2", error_rate=0.5, seed=7)
+    assert [a._delay() for _ in range(5)] == [b._delay() for _ in range(5)]
+
+def test_synthetic_backend_errors_are_retried_as_overload(monkeypatch):
+    import core.llm as llm
+    monkeypatch.setenv("LLM_BACKEND", "synthetic")
+    monkeypatch.setenv("LLM_SYNTHETIC_ERROR_RATE", "1")
+    monkeypatch.setenv("LLM_MAX_RETRIES", "1")
+    monkeypatch.setenv("LLM_RETRY_BASE_SECONDS", "0.001")
+    llm._reset_llm_backend()
+    llm._reset_llm_limits()
+    with pytest.raises(Exception):
+        asyncio.run(llm.generate_json(generate_resume_prompt(RESUME_TEXT)))
+    stats = llm.llm_stats()
+    llm._reset_llm_backend()
+    llm._reset_llm_limits()
+    assert stats["backend"]["calls"] == 2
+    assert stats["backend"]["errors"] == 2
+
+def test_parse_resume_runs_on_synthetic_backend(monkeypatch):
+    import core.llm as llm
+    from core.parse_cache import _reset_parse_cache
+    monkeypatch.setenv("LLM_BACKEND", "synthetic")
+    monkeypatch.setenv("PARSE_CACHE_SHARED", "false")
+    llm._reset_llm_backend()
+    llm._reset_llm_limits()
+    _reset_parse_cache()
+    parsed = asyncio.run(llm.parse_resume_with_llm(RESUME_TEXT))
+    llm._reset_llm_backend()
+    assert parsed.experiences
+
+def test_record_then_replay(tmp_path):
+    inner = SyntheticBackend(seed=1)
+    recorder = RecordReplayBackend(str(tmp_path), "record", inner=inner)
+    prompt = generate_resume_prompt(RESUME_TEXT)
+
+    async def record():
+        text = await recorder.generate(prompt)
+        chunks = [c async for c in recorder.stream(prompt + " ")]
+        return text, chunks
+
+    text, chunks = asyncio.run(record())
+    replayer = RecordReplayBackend(str(tmp_path), "replay", inner=inner)
+
+    async def replay():
+        return await replayer.generate(prompt), [c async for c in replayer.stream(prompt + " ")]
+
+    assert asyncio.run(replay()) == (text, chunks)
+    assert inner.stats()["calls"] == 2
+    with pytest.raises(RecordingNotFoundError):
+        asyncio.run(replayer.generate("never recorded"))
+    assert replayer.stats()["misses"] == 1
+
+def test_create_backend_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_RECORDINGS_DIR", str(tmp_path))
+    assert create_backend("replay").directory == str(tmp_path)
+    monkeypatch.setenv("LLM_BACKEND", "synthetic")
+    assert create_backend().name == "synthetic"
+    with pytest.raises(ValueError):
+        create_backend("other")
+
+def test_offline_backends_stay_out_of_the_shared_parse_cache(mocker, monkeypatch, tmp_path):
+    import core.llm as llm
+    from core.parse_cache import ParseCache, _reset_parse_cache
+    monkeypatch.setenv("PARSE_CACHE_SHARED", "true")
+    shared_get = mocker.patch.object(ParseCache, "_get_shared", new=mocker.AsyncMock(return_value=None))
+    shared_put = mocker.patch.object(ParseCache, "_put_shared", new=mocker.AsyncMock())
+    _reset_parse_cache()
+    llm._reset_llm_limits()
+
+    monkeypatch.setenv("LLM_BACKEND", "synthetic")
+    llm._reset_llm_backend()
+    synthetic_key = llm._cache_key("resume", RESUME_TEXT, llm.RESUME_PROMPT_VERSION)
+
+    async def parse_twice():
+        await llm.parse_resume_with_llm(RESUME_TEXT)
+        await llm.parse_resume_with_llm(RESUME_TEXT)
+
+    asyncio.run(parse_twice())
+    calls = llm.get_llm_backend().stats()["calls"]
+
+    monkeypatch.setenv("LLM_BACKEND", "gemini")
+    llm._reset_llm_backend()
+    gemini_key = llm._cache_key("resume", RESUME_TEXT, llm.RESUME_PROMPT_VERSION)
+    _reset_parse_cache()
+
+    assert calls == 2  # nothing cached for synthetic runs
+    shared_get.assert_not_awaited()
+    shared_put.assert_not_awaited()
+    assert synthetic_key != gemini_key
+
+def test_backend_must_implement_generate():
+    class Incomplete(LLMBackend):
+        name = "incomplete"
+
+    class Echo(LLMBackend):
+        name = "echo"
+
+        async def generate(self, prompt):
+            return prompt
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    async def collect():
+        return [chunk async for chunk in Echo().stream("{}")]
+
+    assert asyncio.run(collect()) == ["{}"]
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from core.json_stream import IncrementalJSONParser
+from core.llm import stream_resume_with_llm, parse_llm_resume_response
+from core.parse_cache import _reset_parse_cache
+from core.security import create_access_token
+from main import app
+
+RESUME_JSON = json.dumps({
+    "skills": [{"name": "Python", "level": "Senior", "source": 'a "quoted" [line]'}],
+    "experiences": [{"title": "Dev", "duration": "2020.01 - 2021.12", "description": "{x}", "achievements": ["did ]"]}],
+    "metrics": [{"value": "30%", "context": "latency"}],
+    "soft_skills": ["communication"],
+    "keywords": ["backend"],
+})
+
+def _chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_parser_emits_items_as_they_close():
+    parser = IncrementalJSONParser(("skills", "experiences", "metrics"))
+    seen = []
+    for chunk in _chunks("```json\n" + RESUME_JSON):
+        seen.extend(parser.feed(chunk))
+    assert [field for field, _ in seen] == ["skills", "experiences", "metrics"]
+    assert seen[0][1]["source"] == 'a "quoted" [line]'
+    assert seen[1][1]["achievements"] == ["did ]"]
+
+def test_parser_emits_first_item_before_the_document_ends():
+    parser = IncrementalJSONParser(("skills",))
+    text = '{"skills": [{"name": "A"}, {"name": "B"'
+    assert parser.feed(text) == [("skills", {"name": "A"})]
+    assert parser.feed("}], \"keywords\": [\"x\"]}") == [("skills", {"name": "B"})]
+
+def test_parser_emits_string_items():
+    parser = IncrementalJSONParser(("keywords",))
+    assert parser.feed('{"keywords": ["a", "b\\"c"]}') == [("keywords", "a"), ("keywords", 'b"c')]
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setenv("PARSE_CACHE_SHARED", "false")
+    _reset_parse_cache()
+    yield
+    _reset_parse_cache()
+
+def _fake_stream(mocker, text):
+    async def stream_json(prompt):
+        for chunk in _chunks(text):
+            yield chunk
+    mocker.patch("core.llm.stream_json", stream_json)
+
+def test_stream_resume_matches_non_streaming_result(mocker, no_cache):
+    _fake_stream(mocker, RESUME_JSON)
+
+    async def run():
+        return [event async for event in stream_resume_with_llm("resume text")]
+
+    events = asyncio.run(run())
+    assert [e["type"] for e in events] == ["item"] * 3 + ["parsed"]
+    assert events[-1]["parsed"] == parse_llm_resume_response(RESUME_JSON)
+
+def test_upload_resume_stream_sends_items_then_resume(mocker, monkeypatch, no_cache):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    headers = {"Authorization": f"Bearer {create_access_token('user-1', 'JOBSEEKER', 10)}"}
+    mocker.patch("main.read_upload", return_value=b"%PDF")
+    mocker.patch("main.extract_pdf_text", return_value="resume text")
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.list_for_user.return_value = []
+    repo.resumes.create.return_value = {"id": "r1", "created_at": "now"}
+    _fake_stream(mocker, RESUME_JSON)
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/resumes?stream=true",
+        files={"file": ("cv.pdf", b"%PDF", "application/pdf")},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events == ["item", "item", "item", "resume"]
+    saved = repo.resumes.create.await_args.args[0]["parsed_data"]
+    assert saved["skills"][0]["name"] == "Python"
+    assert saved["experience_total"]["months"] == 24
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from logic.matching_index import CandidateIndex, bitset_names, to_bitset
+from logic.scoring import get_profile
+from logic.skill_index import annotate_resume, get_skill_index
+
+def _ids(*names):
+    return get_skill_index().ids(names)
+
+def _index_with(resumes):
+    index = CandidateIndex()
+    index.load(
+        {"id": rid, "parsed_data": annotate_resume({"skills": [{"name": n} for n in skills]})}
+        for rid, skills in resumes.items()
+    )
+    return index
+
+def test_bitset_roundtrip():
+    mask = to_bitset(_ids("Python", "Postgres"))
+    assert sorted(bitset_names(mask)) == ["PostgreSQL", "Python"]
+
+def test_top_k_ranks_by_weighted_overlap():
+    index = _index_with(
+        {
+            "full": ["Python", "PostgreSQL", "Docker"],
+            "required-only": ["python", "Postgres"],
+            "preferred-only": ["Docker"],
+            "none": ["Java"],
+        }
+    )
+    # engineering@v1 weighs required:preferred skills 0.6:0.1.
+    results = index.top_k(_ids("Python", "PostgreSQL"), _ids("Docker"), k=10, profile=get_profile("engineering@v1"))
+    assert [r["resume_id"] for r in results] == ["full", "required-only", "preferred-only"]
+    assert [r["score"] for r in results] == [100, 86, 14]
+    assert results[2]["missing_required"] != []
+
+def test_top_k_default_profile_ignores_preferred_skills():
+    index = _index_with({"required-only": ["Python"], "preferred-only": ["Docker"]})
+    results = index.top_k(_ids("Python"), _ids("Docker"), k=10)
+    assert [(r["resume_id"], r["score"]) for r in results] == [("required-only", 100)]
+
+def test_top_k_limits_results():
+    index = _index_with({f"r{i}": ["Python"] for i in range(10)})
+    assert len(index.top_k(_ids("Python"), frozenset(), k=3)) == 3
+
+def test_incremental_updates():
+    index = _index_with({"a": ["Python"], "b": ["Java"]})
+    index.remove("a")
+    assert index.top_k(_ids("Python"), frozenset()) == []
+    index.upsert_parsed("c", {"skills": [{"name": "Python"}]})
+    index.upsert_parsed("b", {"skills": [{"name": "Python"}, {"name": "Java"}]})
+    assert {r["resume_id"] for r in index.top_k(_ids("Python"), frozenset())} == {"b", "c"}
+    assert len(index) == 2
+
+def test_ensure_loaded_respects_ttl():
+    index = CandidateIndex(ttl_seconds=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return [{"id": "a", "parsed_data": {"skills": ["Python"]}}]
+
+    asyncio.run(index.ensure_loaded(fetch))
+    asyncio.run(index.ensure_loaded(fetch))
+    assert len(calls) == 1
+    assert index.loaded
+
+def test_ensure_loaded_reloads_once_for_concurrent_callers():
+    index = CandidateIndex(ttl_seconds=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{"id": "a", "parsed_data": {"skills": ["Python"]}}]
+
+    async def run():
+        await asyncio.gather(*(index.ensure_loaded(fetch) for _ in range(5)))
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert len(index) == 1
@@ -0,0 +1,108 @@
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from main import app
+from core.security import create_access_token
+
+client = TestClient(app)
+
+@pytest.fixture
+def company_auth(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("company-1", "COMPANY", 10)
+    return {"Authorization": f"Bearer {token}"}
+
+def test_mypage_reads_aggregate_and_adds_signals(mocker, company_auth):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.users.get_mypage.return_value = {
+        "user": {"id": "company-1", "role": "COMPANY"},
+        "profile": {"company_name": "Co", "biz_verified": True},
+        "resumes": [],
+        "postings": [
+            {"id": "p1", "company_name": "Co", "latest_analysis": {"analysis_id": "a1", "overall_score": 85}},
+            {"id": "p2", "company_name": "Co", "latest_analysis": None},
+        ],
+    }
+
+    response = client.get("/api/mypage", headers=company_auth)
+
+    assert response.status_code == 200
+    postings = response.json()["data"]["postings"]
+    assert postings[0]["latest_analysis"]["signal"] == "green"
+    assert postings[1]["latest_analysis"] is None
+    repo.users.get_mypage.assert_awaited_once_with("company-1")
+
+def test_mypage_missing_user(mocker, company_auth):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.users.get_mypage.return_value = None
+    response = client.get("/api/mypage", headers=company_auth)
+    assert response.status_code == 404
+
+def test_get_posting_projects_requested_fields(mocker, company_auth):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.get.return_value = {"posting_id": "p1", "company_name": "Co"}
+
+    response = client.get("/api/v1/postings/6f1c5a4e-1111-4111-8111-111111111111?fields=posting_id,company_name", headers=company_auth)
+
+    assert response.status_code == 200
+    assert response.json()["data"] == {"posting_id": "p1", "company_name": "Co"}
+    assert repo.postings.get.await_args.kwargs["columns"] == "posting_id:id, company_name"
+
+def test_get_posting_rejects_unknown_fields(mocker, company_auth):
+    mocker.patch("main.get_repository", return_value=mocker.AsyncMock())
+    response = client.get("/api/v1/postings/6f1c5a4e-1111-4111-8111-111111111111?fields=created_by", headers=company_auth)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_REQUEST"
+
+def test_latest_analyses_batch(mocker, company_auth):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    p1, p2, other = (str(uuid4()) for _ in range(3))
+    repo.resumes.latest_analyses.return_value = []
+    repo.postings.latest_analyses.return_value = [
+        {"id": p1, "latest_analysis": {"id": "a1", "overall_score": 50, "created_at": "now"}},
+        {"id": p2, "latest_analysis": None},
+    ]
+
+    response = client.post(
+        "/api/v1/analyze/session/latest",
+        json={"posting_ids": [p1, p2, other, p1]},
+        headers=company_auth,
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["postings"][p1] == {"analysis_id": "a1", "overall_score": 50, "signal": "yellow", "created_at": "now"}
+    assert data["postings"][p2] is None
+    assert data["missing_ids"] == [other]
+    ids, owner = repo.postings.latest_analyses.await_args.args
+    assert ids == [p1, p2, other]
+    assert owner == "company-1"
+
+def test_latest_analysis_by_posting_uses_pointer(mocker, company_auth):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.latest_analyses.return_value = []
+    response = client.get(f"/api/v1/analyze/session/by-posting/{uuid4()}", headers=company_auth)
+    assert response.status_code == 404
+    repo.analyses.latest_for.assert_not_called()
+
+def test_put_resume_text_invalidates_analyses(mocker, monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    auth = {"Authorization": f"Bearer {create_access_token('user-1', 'JOBSEEKER', 10)}"}
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    invalidate = mocker.patch("main._invalidate_analyses")
+    repo.resumes.list_for_user.return_value = [{"id": "r1"}]
+    repo.resumes.update.return_value = {"id": "r1"}
+
+    response = client.put("/api/mypage/resume", json={"raw_text": "New resume"}, headers=auth)
+
+    assert response.status_code == 200
+    repo.resumes.update.assert_awaited_once_with(
+        "r1", {"raw_text": "New resume", "parsed_data": {}}, columns="id"
+    )
+    invalidate.assert_awaited_once_with("resume_id", "r1", {}, "user-1")
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from core.parse_cache import ParseCache, make_cache_key, _reset_parse_cache
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    _reset_parse_cache()
+    yield
+    _reset_parse_cache()
+
+def test_make_cache_key_normalizes_whitespace():
+    a = make_cache_key("resume", "Python  developer\n\n5 years ", "resume-v1", "m")
+    b = make_cache_key("resume", " Python developer 5 years", "resume-v1", "m")
+    assert a == b
+
+def test_make_cache_key_depends_on_prompt_version_and_model():
+    base = make_cache_key("resume", "text", "resume-v1", "m")
+    assert base != make_cache_key("resume", "text", "resume-v2", "m")
+    assert base != make_cache_key("resume", "text", "resume-v1", "other")
+    assert base != make_cache_key("posting", "text", "resume-v1", "m")
+
+def test_lru_evicts_least_recently_used():
+    cache = ParseCache(max_entries=2, max_bytes=1024 * 1024)
+    cache.put_local("a", {"v": 1})
+    cache.put_local("b", {"v": 2})
+    assert cache.get_local("a") == {"v": 1}
+    cache.put_local("c", {"v": 3})
+    assert cache.get_local("b") is None
+    assert cache.get_local("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_respects_byte_budget():
+    cache = ParseCache(max_entries=100, max_bytes=50)
+    cache.put_local("a", {"v": "x" * 20})
+    cache.put_local("b", {"v": "y" * 20})
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= 50
+
+def test_cached_payload_is_a_copy():
+    cache = ParseCache(max_entries=10, max_bytes=1024)
+    cache.put_local("a", {"skills": []})
+    cache.get_local("a")["skills"].append("mutated")
+    assert cache.get_local("a") == {"skills": []}
+
+def test_shared_tier_fills_local(mocker):
+    mock_db = mocker.MagicMock()
+    mocker.patch("core.parse_cache.get_async_supabase_client", new=mocker.AsyncMock(return_value=mock_db))
+    mock_db.table().select().eq().limit().execute = mocker.AsyncMock(
+        return_value=mocker.MagicMock(data=[{"parsed_data": {"v": 1}}])
+    )
+    cache = ParseCache(max_entries=10, max_bytes=1024, shared=True)
+    assert asyncio.run(cache.get("k")) == {"v": 1}
+    assert asyncio.run(cache.get("k")) == {"v": 1}
+    stats = cache.stats()
+    assert stats["shared_hits"] == 1
+    assert stats["local_hits"] == 1
+
+def test_parse_resume_with_llm_serves_repeat_from_cache(mocker):
+    import core.llm as llm
+    mock_generate = mocker.patch(
+        "core.llm.generate_json",
+        new=mocker.AsyncMock(
+            return_value='{"skills": [], "experiences": [], "metrics": [], "soft_skills": [], "keywords": ["k"]}'
+        ),
+    )
+    first = asyncio.run(llm.parse_resume_with_llm("Same resume text"))
+    second = asyncio.run(llm.parse_resume_with_llm("Same   resume text\n"))
+    assert first == second
+    assert mock_generate.await_count == 1
@@ -14,3 +14,187 @@ def test_extract_text_file_not_found():
 def test_extract_text_unsupported_extension():
     with pytest.raises(ValueError, match="Unsupported file type"):
         extract_text_from_pdf("test.txt")
+
+def _make_pdf(pages):
+    import fitz
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i} text")
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+class _AsyncReader:
+    def __init__(self, data):
+        import io
+        self._buf = io.BytesIO(data)
+        self.reads = 0
+
+    async def read(self, size=-1):
+        self.reads += 1
+        return self._buf.read(size)
+
+def test_engine_extracts_pages_in_order():
+    import asyncio
+    from core.pdf import PdfExtractionEngine
+    text = asyncio.run(PdfExtractionEngine(workers=0).extract_text(_make_pdf(3)))
+    assert text.index("Page 0") < text.index("Page 1") < text.index("Page 2")
+
+def test_engine_page_limit():
+    import asyncio
+    from core.pdf import PdfExtractionEngine, PdfTooManyPagesError
+    with pytest.raises(PdfTooManyPagesError):
+        asyncio.run(PdfExtractionEngine(workers=0).extract_text(_make_pdf(3), max_pages=2))
+
+def test_engine_rejects_invalid_data():
+    import asyncio
+    from core.pdf import PdfExtractionEngine, InvalidPdfError
+    with pytest.raises(InvalidPdfError):
+        asyncio.run(PdfExtractionEngine(workers=0).extract_text(b"not a pdf"))
+
+def test_read_upload_stops_at_byte_limit():
+    import asyncio
+    from core.pdf import read_upload, PdfTooLargeError
+    reader = _AsyncReader(b"x" * (1024 * 1024))
+    with pytest.raises(PdfTooLargeError):
+        asyncio.run(read_upload(reader, max_bytes=300 * 1024))
+    assert reader.reads == 2
+
+def test_read_upload_returns_full_content():
+    import asyncio
+    from core.pdf import read_upload
+    data = _make_pdf(1)
+    assert asyncio.run(read_upload(_AsyncReader(data))) == data
+
+def test_engine_thread_fallback_extracts_text():
+    import asyncio
+    from core.pdf import PdfExtractionEngine
+    engine = PdfExtractionEngine(workers=0)
+    text = asyncio.run(engine.extract_text(_make_pdf(2)))
+    assert "Page 0" in text and "Page 1" in text
+    assert engine.stats()["documents"] == 1
+
+def test_engine_splits_large_documents_across_workers():
+    import asyncio
+    from core.pdf import PdfExtractionEngine, PdfTooManyPagesError
+    engine = PdfExtractionEngine(workers=2, split_pages=3, timeout=60)
+    try:
+        text = asyncio.run(engine.extract_text(_make_pdf(8)))
+        positions = [text.index(f"Page {i} text") for i in range(8)]
+        assert positions == sorted(positions)
+        with pytest.raises(PdfTooManyPagesError):
+            asyncio.run(engine.extract_text(_make_pdf(3), max_pages=2))
+        stats = engine.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["jobs"] >= 3
+    finally:
+        engine.shutdown()
+
+def test_engine_timeout(mocker):
+    import asyncio
+    import time
+    from core.pdf import PdfExtractionEngine, PdfExtractionTimeoutError
+    engine = PdfExtractionEngine(workers=0, timeout=0.05)
+    mocker.patch("core.pdf._extract_job", side_effect=lambda *a: time.sleep(0.3))
+    with pytest.raises(PdfExtractionTimeoutError):
+        asyncio.run(engine.extract_text(b"%PDF"))
+    assert engine.stats()["timeouts"] == 1
+
+def _slow_or_extract(data, max_pages, split_pages):
+    # Runs in the pool workers, which import this module by name.
+    import time
+    from core.pdf import _extract_job
+    if data == b"slow":
+        time.sleep(60)
+    return _extract_job(data, max_pages, split_pages)
+
+def test_engine_timeout_resubmits_other_documents(mocker):
+    import asyncio
+    from core.pdf import PdfExtractionEngine, PdfExtractionTimeoutError
+    mocker.patch("core.pdf._extract_job", _slow_or_extract)
+    engine = PdfExtractionEngine(workers=1, timeout=6)
+
+    async def run():
+        slow = asyncio.create_task(engine.extract_text(b"slow"))
+        await asyncio.sleep(3)
+        # Queued behind the slow document when its timeout kills the pool.
+        quick = [asyncio.create_task(engine.extract_text(_make_pdf(1))) for _ in range(4)]
+        with pytest.raises(PdfExtractionTimeoutError):
+            await slow
+        return await asyncio.gather(*quick)
+
+    try:
+        texts = asyncio.run(run())
+    finally:
+        engine.shutdown()
+    assert all("Page 0 text" in text for text in texts)
+    assert engine.stats()["timeouts"] == 1
+    assert engine.stats()["pool_restarts"] == 1
+
+def test_engine_worker_crash_raises_extraction_error(mocker):
+    import asyncio
+    from concurrent.futures.process import BrokenProcessPool
+    from core.pdf import PdfExtractionEngine, PdfExtractionError
+    mocker.patch("core.pdf.ProcessPoolExecutor", _FakePool)
+    engine = PdfExtractionEngine(workers=1)
+    pool = engine.start()
+    mocker.patch.object(pool, "submit", side_effect=BrokenProcessPool("worker died"))
+    with pytest.raises(PdfExtractionError):
+        asyncio.run(engine.extract_text(b"%PDF"))
+    assert engine.start() is not pool
+    engine.shutdown()
+
+class _FakePool:
+    """Stands in for ProcessPoolExecutor; submitted jobs never finish."""
+    def __init__(self, *args, **kwargs):
+        from unittest.mock import Mock
+        self._processes = {1: Mock()}
+        self.shutdown_calls = 0
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        return Future()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls += 1
+
+def test_engine_timeout_kills_and_replaces_pool(mocker):
+    import asyncio
+    from core.pdf import PdfExtractionEngine, PdfExtractionTimeoutError
+    mocker.patch("core.pdf.ProcessPoolExecutor", _FakePool)
+    engine = PdfExtractionEngine(workers=1, timeout=0.05)
+    pool = engine.start()
+    with pytest.raises(PdfExtractionTimeoutError):
+        asyncio.run(engine.extract_text(b"%PDF"))
+    pool._processes[1].kill.assert_called_once()
+    assert pool.shutdown_calls == 1
+    assert engine.stats()["pool_restarts"] == 1
+    assert engine.start() is not pool
+    engine.shutdown()
+
+def test_engine_replaces_broken_pool_once(mocker):
+    from core.pdf import PdfExtractionEngine
+    mocker.patch("core.pdf.ProcessPoolExecutor", _FakePool)
+    engine = PdfExtractionEngine(workers=1)
+    broken = engine.start()
+    engine._recycle(broken)
+    replacement = engine.start()
+    # A second caller that saw the same broken pool leaves the new one alone.
+    engine._recycle(broken)
+    assert engine.start() is replacement
+    assert broken.shutdown_calls == 1
+    assert engine.stats()["pool_restarts"] == 1
+    engine.shutdown()
+
+def test_engine_settings_from_env(monkeypatch):
+    from core.pdf import _reset_pdf_engine, get_pdf_engine
+    monkeypatch.delenv("PDF_WORKERS", raising=False)
+    monkeypatch.setenv("PDF_TIMEOUT_SECONDS", "2.5")
+    _reset_pdf_engine()
+    try:
+        engine = get_pdf_engine()
+        assert engine.workers == 1
+        assert engine.timeout == 2.5
+    finally:
+        _reset_pdf_engine()
@@ -17,10 +17,11 @@ def test_post_posting_success(mocker, mock_auth):
     mock_parsed_data.dict.return_value = {"required_skills": []}
     mocker.patch("main.parse_posting_with_llm", return_value=mock_parsed_data)
     
-    # Mock Supabase
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().insert().execute.return_value = mocker.MagicMock(data=[{"id": str(uuid4()), "created_at": "now"}])
+    # Mock repository
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.list_for_owner.return_value = []
+    repo.postings.create.return_value = {"id": str(uuid4()), "created_at": "now"}
     
     payload = {
         "company_name": "Tech Startup A",
@@ -39,9 +40,9 @@ def test_post_posting_missing_raw_text(mock_auth):
 
 def test_get_posting_success(mocker, mock_auth):
     posting_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().select().eq().single().execute.return_value = mocker.MagicMock(data={"id": posting_id, "company_name": "Test Co", "parsed_data": {}})
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.get.return_value = {"posting_id": posting_id, "company_name": "Test Co", "parsed_data": {}}
     
     response = client.get(f"/api/v1/postings/{posting_id}", headers=mock_auth)
     assert response.status_code == 200
@@ -49,8 +50,9 @@ def test_get_posting_success(mocker, mock_auth):
 
 def test_patch_posting_success(mocker, mock_auth):
     posting_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.get.return_value = {"id": posting_id, "raw_text": "Old text"}
     
     # Mock LLM re-parsing
     mock_parsed_data = mocker.MagicMock()
@@ -58,7 +60,7 @@ def test_patch_posting_success(mocker, mock_auth):
     mocker.patch("main.parse_posting_with_llm", return_value=mock_parsed_data)
     
     # Mock update
-    mock_db_instance.table().update().eq().execute.return_value = mocker.MagicMock(data=[{"id": posting_id, "parsed_data": {"required_skills": ["New Skill"]}}])
+    repo.postings.update.return_value = {"id": posting_id, "parsed_data": {"required_skills": ["New Skill"]}}
     
     payload = {"raw_text": "Updated long text..." * 10}
     response = client.patch(f"/api/v1/postings/{posting_id}", json=payload, headers=mock_auth)
@@ -68,9 +70,9 @@ def test_patch_posting_success(mocker, mock_auth):
 
 def test_delete_posting_success(mocker, mock_auth):
     posting_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().delete().eq().execute.return_value = mocker.MagicMock(data=[{"id": posting_id}])
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.postings.delete.return_value = {"id": posting_id}
     
     response = client.delete(f"/api/v1/postings/{posting_id}", headers=mock_auth)
     assert response.status_code == 200
@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+import main
+from core.security import create_access_token
+from logic.reanalysis import changed_components, input_hashes, memo_key, recompute_analysis, resume_hashes
+from logic.scoring import DEFAULT_PROFILE
+
+RESUME = {"skills": [{"name": "Python"}], "experience": [{"years": 3}]}
+POSTING = {"required_skills": [{"name": "Python"}, {"name": "SQL"}], "min_experience": 2}
+
+client = TestClient(main.app)
+
+@pytest.fixture
+def auth(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("user-1", "JOBSEEKER", 10)
+    return {"Authorization": f"Bearer {token}"}
+
+def _analysis(resume, posting, **fields):
+    row = {
+        "fit_items": ["Python"],
+        "gap_items": ["SQL"],
+        "category_scores": {"experience_alignment": "Exceeds"},
+        "input_hashes": input_hashes(resume, posting),
+    }
+    row.update(fields)
+    return row
+
+def test_hashes_ignore_unrelated_fields():
+    assert resume_hashes(RESUME) == resume_hashes({**RESUME, "summary": "new summary"})
+    assert resume_hashes(RESUME)["skills"] == resume_hashes({**RESUME, "experience": []})["skills"]
+
+def test_changed_components_follow_inputs():
+    recorded = input_hashes(RESUME, POSTING)
+    assert changed_components(recorded, input_hashes(RESUME, POSTING)) == set()
+    assert changed_components(recorded, input_hashes(RESUME, {**POSTING, "min_experience": 5})) == {"experience"}
+    assert changed_components(recorded, input_hashes({**RESUME, "skills": ["SQL"]}, POSTING)) == {"skill_fit"}
+    assert changed_components(None, recorded) == {"skill_fit", "experience"}
+
+def test_recompute_skips_untouched_pair():
+    assert recompute_analysis(_analysis(RESUME, POSTING), RESUME, POSTING) is None
+
+def test_recompute_experience_only_reuses_skill_fit():
+    # Stored fit items are reused as-is, even ones a fresh skill match would drop.
+    analysis = _analysis(RESUME, POSTING, fit_items=["Python", "Semantic match"], gap_items=[])
+    posting = {**POSTING, "min_experience": 10}
+    fields = recompute_analysis(analysis, RESUME, posting)
+    assert fields["fit_items"] == ["Python", "Semantic match"]
+    assert fields["category_scores"]["experience_alignment"] == "Below"
+    assert fields["overall_score"] == 70
+    assert fields["stale"] is False
+    assert fields["input_hashes"] == input_hashes(RESUME, posting)
+    assert fields["memo_key"] == memo_key(input_hashes(RESUME, posting), DEFAULT_PROFILE)
+
+def test_recompute_skill_change():
+    resume = {**RESUME, "skills": [{"name": "Python"}, {"name": "SQL"}]}
+    fields = recompute_analysis(_analysis(RESUME, POSTING), resume, POSTING)
+    assert fields["gap_items"] == []
+    assert fields["category_scores"]["experience_alignment"] == "Exceeds"
+    assert fields["overall_score"] == 100
+
+def test_update_posting_marks_changed_pairs_stale(mocker):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    queue = mocker.AsyncMock()
+    mocker.patch("main.get_job_queue", return_value=queue)
+    new_posting = {**POSTING, "min_experience": 5}
+    repo.analyses.list_current_for.return_value = [
+        {"id": "a3", "resume_id": "r1", "posting_id": "p1", "input_hashes": input_hashes(RESUME, POSTING)},
+        {"id": "a2", "resume_id": "r1", "posting_id": "p1", "input_hashes": None},
+        {"id": "a1", "resume_id": "r2", "posting_id": "p1", "input_hashes": input_hashes(RESUME, new_posting)},
+        {"id": "a0", "resume_id": None, "posting_id": "p1", "input_hashes": None},
+    ]
+
+    asyncio.run(main._invalidate_analyses("posting_id", "p1", new_posting, "company-1"))
+
+    repo.analyses.mark_stale.assert_awaited_once_with(["a3", "a2"])
+    queue.submit.assert_awaited_once_with("reanalyze", {"analysis_ids": ["a3"]}, owner="company-1")
+
+def test_reanalyze_job_updates_only_changed(mocker):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    new_posting = {**POSTING, "min_experience": 10}
+    repo.analyses.get_many.return_value = [
+        {"id": "a1", "resume_id": "r1", "posting_id": "p1", **_analysis(RESUME, POSTING)},
+        {"id": "a2", "resume_id": "gone", "posting_id": "p1", **_analysis(RESUME, POSTING)},
+    ]
+    repo.resumes.get_many.return_value = [{"id": "r1", "parsed_data": RESUME}]
+    repo.postings.get_many.return_value = [{"id": "p1", "parsed_data": new_posting}]
+
+    result = asyncio.run(main._reanalyze_job({"analysis_ids": ["a1", "a2"]}))
+
+    assert result == {"reanalyzed": 1}
+    analysis_id, fields = repo.analyses.update.await_args.args
+    assert analysis_id == "a1"
+    assert fields["overall_score"] == 35
+
+def _session_repo(mocker, resume_id, posting_id):
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.get.return_value = {"id": resume_id, "parsed_data": RESUME}
+    repo.postings.get.return_value = {"id": posting_id, "parsed_data": POSTING}
+    repo.analyses.create.return_value = {"id": "new"}
+    return repo
+
+def test_repeat_analysis_returns_memoized_row(mocker, auth):
+    resume_id, posting_id = str(uuid4()), str(uuid4())
+    repo = _session_repo(mocker, resume_id, posting_id)
+    repo.analyses.find_memoized.return_value = {
+        "id": "a1", "overall_score": 65, "fit_items": ["Python"], "gap_items": ["SQL"],
+        "category_scores": {"experience_alignment": "Exceeds"},
+    }
+
+    response = client.post(
+        "/api/v1/analyze/session", json={"resume_id": resume_id, "posting_id": posting_id}, headers=auth
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["analysis_id"] == "a1"
+    assert data["memoized"] is True
+    assert data["missing_skills"] == ["SQL"]
+    repo.analyses.create.assert_not_called()
+    key = repo.analyses.find_memoized.await_args.args[2]
+    assert key == memo_key(input_hashes(RESUME, POSTING), DEFAULT_PROFILE)
+
+def test_force_bypasses_memo(mocker, auth):
+    resume_id, posting_id = str(uuid4()), str(uuid4())
+    repo = _session_repo(mocker, resume_id, posting_id)
+
+    response = client.post(
+        "/api/v1/analyze/session",
+        json={"resume_id": resume_id, "posting_id": posting_id, "force": True},
+        headers=auth,
+    )
+
+    assert response.status_code == 201
+    assert response.json()["data"]["memoized"] is False
+    repo.analyses.find_memoized.assert_not_called()
+    inserted = repo.analyses.create.await_args.args[0]
+    assert inserted["memo_key"] == memo_key(input_hashes(RESUME, POSTING), DEFAULT_PROFILE)
+
+def test_session_matches_on_stored_skill_index(mocker, auth):
+    from logic.skill_index import VOCAB_VERSION
+    resume_id, posting_id = str(uuid4()), str(uuid4())
+    repo = _session_repo(mocker, resume_id, posting_id)
+    repo.analyses.find_memoized.return_value = None
+    # Only the stored keys name the skill, so a match proves they were used.
+    repo.resumes.get.return_value = {
+        "id": resume_id,
+        "parsed_data": {"skills": [], "skill_index": {"version": VOCAB_VERSION, "skills": ["postgresql"]}},
+    }
+    repo.postings.get.return_value = {
+        "id": posting_id,
+        "parsed_data": {"required_skills": [{"name": "Postgres"}, {"name": "SQL"}]},
+    }
+
+    response = client.post(
+        "/api/v1/analyze/session", json={"resume_id": resume_id, "posting_id": posting_id}, headers=auth
+    )
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["matched_skills"] == ["Postgres"]
+    assert data["missing_skills"] == ["SQL"]
@@ -0,0 +1,68 @@
+import asyncio
+from core.repository import Repository
+from core.database import build_http_client
+
+def _client(mocker, data):
+    client = mocker.MagicMock()
+    query = mocker.MagicMock()
+    for name in ("select", "eq", "in_", "limit", "order", "range", "insert", "update", "delete", "upsert"):
+        getattr(query, name).return_value = query
+    query.execute = mocker.AsyncMock(return_value=mocker.MagicMock(data=data))
+    client.table.return_value = query
+    mocker.patch("core.repository.get_async_supabase_client", new=mocker.AsyncMock(return_value=client))
+    return client, query
+
+def test_get_returns_first_row_or_none(mocker):
+    client, query = _client(mocker, [{"id": "r1"}])
+    repo = Repository()
+    assert asyncio.run(repo.resumes.get("r1", user_id="u1", columns="id")) == {"id": "r1"}
+    client.table.assert_called_with("resumes")
+    query.select.assert_called_with("id")
+    query.limit.assert_called_with(1)
+
+    query.execute.return_value = mocker.MagicMock(data=[])
+    assert asyncio.run(repo.postings.get("p1")) is None
+
+def test_get_many_skips_query_for_empty_ids(mocker):
+    client, query = _client(mocker, [])
+    assert asyncio.run(Repository().resumes.get_many([])) == []
+    query.execute.assert_not_called()
+
+def test_delete_account_is_one_rpc_call(mocker):
+    client, query = _client(mocker, [])
+    result = {"resume_ids": ["r1"], "deleted": {"resumes": 1, "users": 1}}
+    client.rpc.return_value.execute = mocker.AsyncMock(return_value=mocker.MagicMock(data=result))
+    assert asyncio.run(Repository().users.delete_account("u1")) == result
+    client.rpc.assert_called_once_with("delete_account", {"p_user_id": "u1"})
+    client.table.assert_not_called()
+
+    client.rpc.return_value.execute.return_value = mocker.MagicMock(data=None)
+    assert asyncio.run(Repository().users.delete_account("missing")) is None
+
+def test_http_client_is_pooled(monkeypatch):
+    monkeypatch.setenv("SUPABASE_MAX_CONNECTIONS", "7")
+    client = build_http_client()
+    try:
+        assert client._transport._pool._max_connections == 7
+    finally:
+        asyncio.run(client.aclose())
+
+def test_get_mypage_is_one_rpc_call(mocker):
+    client, query = _client(mocker, [])
+    page = {"user": {"id": "u1"}, "profile": None, "resumes": [], "postings": []}
+    client.rpc.return_value.execute = mocker.AsyncMock(return_value=mocker.MagicMock(data=page))
+    assert asyncio.run(Repository().users.get_mypage("u1")) == page
+    client.rpc.assert_called_once_with("get_mypage", {"p_user_id": "u1"})
+    client.table.assert_not_called()
+
+def test_latest_analyses_embeds_pointer_with_owner_filter(mocker):
+    client, query = _client(mocker, [{"id": "p1", "latest_analysis": None}])
+    rows = asyncio.run(Repository().postings.latest_analyses(["p1"], "u1", columns="id"))
+    assert rows == [{"id": "p1", "latest_analysis": None}]
+    query.select.assert_called_with("id, latest_analysis:analyses!job_postings_latest_analysis_id_fkey(id)")
+    query.in_.assert_called_with("id", ["p1"])
+    query.eq.assert_called_with("created_by", "u1")
+
+    query.execute.reset_mock()
+    assert asyncio.run(Repository().resumes.latest_analyses([], "u1", columns="id")) == []
+    query.execute.assert_not_called()
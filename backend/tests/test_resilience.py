@@ -0,0 +1,65 @@
+import asyncio
+from core.resilience import AdaptiveLimiter, CircuitBreaker, TokenBucket, backoff_delay
+
+def test_adaptive_limiter_decreases_on_overload_and_recovers():
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=2, latency_target=1.0)
+    limiter.on_overload()
+    assert limiter.stats()["limit"] == 4
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.stats()["limit"] == 2
+    limiter.on_success(5.0)  # slow calls count as overload
+    assert limiter.stats()["limit"] == 2
+    for _ in range(40):
+        limiter.on_success(0.1)
+    assert limiter.stats()["limit"] == 8
+
+def test_adaptive_limiter_times_out_waiters():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=1)
+        assert await limiter.acquire(1)
+        got = await limiter.acquire(0.01)
+        waiting = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+        limiter.release()
+        return got, await waiting, limiter.stats()
+
+    got, handed_over, stats = asyncio.run(run())
+    assert got is False
+    assert handed_over is True
+    assert stats["in_flight"] == 1
+    assert stats["waiting"] == 0
+
+def test_token_bucket_refuses_waits_past_timeout():
+    async def run():
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        first = await bucket.acquire(0)
+        second = await bucket.acquire(0.1)
+        return first, second
+
+    assert asyncio.run(run()) == (True, False)
+
+def test_circuit_breaker_opens_and_probes(mocker):
+    clock = mocker.patch("core.resilience.time.monotonic", return_value=100.0)
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.return_value = 131.0
+    assert breaker.allow()  # the single half-open probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.return_value = 162.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.stats()["state"] == "closed"
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(10, 0.5, cap=2.0) for _ in range(50)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 1
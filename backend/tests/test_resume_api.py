@@ -23,17 +23,18 @@ def valid_pdf_content():
 
 def test_post_resume_success(mocker, mock_auth, valid_pdf_content):
     # Mock PDF extraction
-    mocker.patch("main.extract_text_from_pdf", return_value="Mock Resume Text")
+    mocker.patch("main.extract_pdf_text", return_value="Mock Resume Text")
     
     # Mock LLM parsing (async)
     mock_parsed_data = mocker.MagicMock()
     mock_parsed_data.dict.return_value = {"skills": []}
     mocker.patch("main.parse_resume_with_llm", return_value=mock_parsed_data)
     
-    # Mock Supabase
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().insert().execute.return_value = mocker.MagicMock(data=[{"id": str(uuid4()), "created_at": "now"}])
+    # Mock repository
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.list_for_user.return_value = []
+    repo.resumes.create.return_value = {"id": str(uuid4()), "created_at": "now"}
     
     files = {"file": ("resume.pdf", valid_pdf_content, "application/pdf")}
     
@@ -52,9 +53,9 @@ def test_post_resume_invalid_file_type(mock_auth):
 
 def test_get_resume_success(mocker, mock_auth):
     resume_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().select().eq().single().execute.return_value = mocker.MagicMock(data={"id": resume_id, "parsed_data": {}})
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.get.return_value = {"resume_id": resume_id, "parsed_data": {}}
     
     response = client.get(f"/api/v1/resumes/{resume_id}", headers=mock_auth)
     assert response.status_code == 200
@@ -62,13 +63,13 @@ def test_get_resume_success(mocker, mock_auth):
 
 def test_patch_resume_success(mocker, mock_auth):
     resume_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
     
     # Mock current data
-    mock_db_instance.table().select().eq().single().execute.return_value = mocker.MagicMock(data={"id": resume_id, "parsed_data": {"old": "data"}})
+    repo.resumes.get.return_value = {"id": resume_id, "parsed_data": {"old": "data"}}
     # Mock update
-    mock_db_instance.table().update().eq().execute.return_value = mocker.MagicMock(data=[{"id": resume_id, "parsed_data": {"old": "data", "new": "data"}}])
+    repo.resumes.update.return_value = {"id": resume_id, "parsed_data": {"old": "data", "new": "data"}}
     
     payload = {"parsed_data": {"new": "data"}}
     response = client.patch(f"/api/v1/resumes/{resume_id}", json=payload, headers=mock_auth)
@@ -78,9 +79,9 @@ def test_patch_resume_success(mocker, mock_auth):
 
 def test_delete_resume_success(mocker, mock_auth):
     resume_id = str(uuid4())
-    mock_db_instance = mocker.MagicMock()
-    mocker.patch("main.get_supabase_client", return_value=mock_db_instance)
-    mock_db_instance.table().delete().eq().execute.return_value = mocker.MagicMock(data=[{"id": resume_id}])
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.delete.return_value = {"id": resume_id}
     
     response = client.delete(f"/api/v1/resumes/{resume_id}", headers=mock_auth)
     assert response.status_code == 200
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from logic.scoring import (
+    DEFAULT_PROFILE,
+    WeightProfile,
+    criteria_row,
+    evaluate,
+    fit_fraction,
+    get_profile,
+    posting_completeness_score,
+    register_profile,
+    resume_completeness_score,
+    select_profile,
+    to_scores,
+)
+from logic.screening import screen_resumes
+
+def test_default_profile_keeps_original_formula():
+    assert fit_fraction(0.5, None, "Matches") == pytest.approx(0.5 * 0.7 + 0.3)
+    assert fit_fraction(1.0, 0.0, "Below") == pytest.approx(0.7)
+
+def test_batch_evaluation_matches_single_rows():
+    profile = get_profile("engineering@v1")
+    rows = [criteria_row(r, p, a, profile) for r, p, a in [(1.0, 0.5, "Exceeds"), (0.5, None, "Partial"), (0.0, 0.0, "Below")]]
+    batch = evaluate(rows, profile)
+    single = [fit_fraction(r[0], r[1], a, profile) for r, a in zip(rows, ["Exceeds", "Partial", "Below"])]
+    assert np.allclose(batch, single)
+    assert to_scores(batch) == [95, 50, 0]
+
+def test_missing_preferred_skills_fold_into_required():
+    profile = get_profile("engineering@v1")
+    assert fit_fraction(0.5, None, "Below", profile) == pytest.approx(0.5 * 0.7)
+
+def test_profile_selection(monkeypatch):
+    assert select_profile({"job_family": "Software"}).key == "engineering@v1"
+    assert select_profile({}) is DEFAULT_PROFILE
+    monkeypatch.setenv("SCORING_PROFILE", "engineering@v1")
+    assert select_profile({}).key == "engineering@v1"
+    with pytest.raises(ValueError):
+        get_profile("missing@v1")
+
+def test_profile_weights_must_sum_to_one():
+    with pytest.raises(ValueError):
+        register_profile(WeightProfile("broken", 1, 0.5, 0.5, 0.5))
+
+def test_screening_records_profile_in_category_scores():
+    posting = {
+        "required_skills": [{"name": "Python"}, {"name": "SQL"}],
+        "preferred_skills": [{"name": "Docker"}],
+        "job_family": "engineering",
+    }
+    [result] = screen_resumes(posting, [{"skills": ["Python", "Docker"], "experience": []}])
+    assert result["category_scores"] == {
+        "profile": "engineering@v1",
+        "required_skills": 0.5,
+        "preferred_skills": 1.0,
+        "experience_alignment": "Exceeds",
+    }
+    assert result["overall_score"] == 70
+
+def test_completeness_scores():
+    assert posting_completeness_score(5, 500, True) == 90
+    assert resume_completeness_score(0, False, 0) == 40
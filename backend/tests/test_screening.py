@@ -0,0 +1,32 @@
+import pytest
+from logic.skills import compare_skills_many
+from logic.skill_index import skill_names
+from logic.screening import score_signal, screen_resumes
+
+def test_skill_names_accepts_strings_and_objects():
+    skills = ["Python", {"name": "SQL", "level": "Mid"}, {"level": "no name"}, ""]
+    assert skill_names(skills) == ["Python", "SQL"]
+
+def test_compare_skills_many_matches_each_resume():
+    results = compare_skills_many([["python"], ["SQL", "Docker"]], ["Python", "SQL"])
+    assert results[0] == (["python"], ["SQL"])
+    assert results[1] == (["SQL"], ["Python"])
+
+def test_score_signal_thresholds():
+    assert score_signal(80) == "green"
+    assert score_signal(40) == "yellow"
+    assert score_signal(39) == "red"
+
+def test_screen_resumes_keeps_input_order():
+    posting = {
+        "required_skills": [{"name": "Python"}, {"name": "SQL"}],
+        "min_experience": 2,
+    }
+    resumes = [
+        {"skills": [{"name": "Java"}], "experience": [{"years": 1}]},
+        {"skills": [{"name": "python"}, {"name": "SQL"}], "experience": [{"years": 3}]},
+    ]
+    results = screen_resumes(posting, resumes)
+    assert results[0]["missing_skills"] == ["Python", "SQL"]
+    assert results[1]["overall_score"] == 100
+    assert results[1]["signal"] == "green"
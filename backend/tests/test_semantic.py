@@ -0,0 +1,96 @@
+import asyncio
+import numpy as np
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+import main
+from core.security import create_access_token
+from logic.semantic import EmbeddingStore, HashingEmbedder, resume_phrases, semantic_matches
+
+client = TestClient(main.app)
+
+@pytest.fixture
+def auth(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test-secret-with-enough-length-for-hs256")
+    token = create_access_token("user-1", "JOBSEEKER", 10)
+    return {"Authorization": f"Bearer {token}"}
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def embed(self, phrases):
+        self.calls.append(list(phrases))
+        return super().embed(phrases)
+
+def test_store_memoizes_phrases():
+    embedder = CountingEmbedder()
+    store = EmbeddingStore(embedder)
+    store.vectors(["Python", "Docker"])
+    store.vectors(["Docker", "Kubernetes"])
+    assert embedder.calls == [["Python", "Docker"], ["Kubernetes"]]
+    assert len(store) == 3
+
+def test_store_vectors_are_unit_length_and_grow():
+    store = EmbeddingStore(HashingEmbedder(), initial_capacity=2)
+    vectors = store.vectors([f"skill {i}" for i in range(5)])
+    assert vectors.shape == (5, store.embedder.dim)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+def test_store_resets_when_full():
+    store = EmbeddingStore(HashingEmbedder(), max_phrases=3)
+    store.vectors(["a", "b", "c"])
+    vectors = store.vectors(["d", "e"])
+    assert len(store) == 2
+    assert vectors.shape[0] == 2
+
+def test_semantic_matches_uses_threshold():
+    store = EmbeddingStore(HashingEmbedder())
+    results = semantic_matches(
+        store,
+        ["CI/CD pipeline", "Spring Boot"],
+        ["built CI/CD pipelines", "Django"],
+        threshold=0.6,
+    )
+    assert results[0]["matched"] is True
+    assert results[0]["evidence"] == "built CI/CD pipelines"
+    assert results[1]["matched"] is False
+
+def test_semantic_matches_without_resume_phrases():
+    results = semantic_matches(EmbeddingStore(HashingEmbedder()), ["Redis"], [], threshold=0.5)
+    assert results == [{"item": "Redis", "evidence": None, "similarity": 0.0, "matched": False}]
+
+def test_resume_phrases_collects_evidence():
+    parsed = {
+        "skills": [{"name": "Python"}],
+        "keywords": ["MSA"],
+        "experiences": [{"title": "Backend dev", "achievements": ["Built CI/CD pipelines"]}],
+    }
+    assert resume_phrases(parsed) == ["Python", "MSA", "Backend dev", "Built CI/CD pipelines"]
+
+def test_semantic_matching_runs_off_event_loop(mocker, auth):
+    resume_id, posting_id = str(uuid4()), str(uuid4())
+    repo = mocker.AsyncMock()
+    mocker.patch("main.get_repository", return_value=repo)
+    repo.resumes.get.return_value = {"id": resume_id, "parsed_data": {"skills": [{"name": "Python"}]}}
+    repo.postings.get.return_value = {"id": posting_id, "parsed_data": {"required_skills": [{"name": "Python"}, {"name": "SQL"}]}}
+    repo.analyses.create.return_value = {"id": "new"}
+    loops = []
+    def fake_results(job_phrases, resume_parsed):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return []
+    mocker.patch("main._semantic_results", side_effect=fake_results)
+
+    response = client.post(
+        "/api/v1/analyze/session",
+        json={"resume_id": resume_id, "posting_id": posting_id, "semantic": True},
+        headers=auth,
+    )
+
+    assert response.status_code == 201
+    assert loops == [None]
+    repo.analyses.find_memoized.assert_not_called()
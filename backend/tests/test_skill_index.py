@@ -0,0 +1,59 @@
+import pytest
+from logic.skill_index import (
+    VOCAB_VERSION,
+    SkillIndex,
+    annotate_posting,
+    annotate_resume,
+    get_skill_index,
+    normalize_skill,
+    resume_skill_ids,
+    stored_skill_ids,
+)
+from logic.skills import compare_skills
+
+def test_normalize_skill_collapses_spelling_variants():
+    assert normalize_skill("Node.js") == normalize_skill("NodeJS") == normalize_skill("node js")
+    assert normalize_skill("C++") != normalize_skill("C#")
+
+def test_aliases_share_an_id():
+    index = get_skill_index()
+    assert index.skill_id("Postgres") == index.skill_id("PostgreSQL")
+    assert index.skill_id("k8s") == index.skill_id("Kubernetes")
+    assert index.skill_id("파이썬") == index.skill_id("python")
+    assert index.skill_id("Java") != index.skill_id("JavaScript")
+
+def test_unknown_skills_are_interned_once():
+    index = SkillIndex({"Python": []})
+    first = index.skill_id("Haskell", intern=True)
+    assert index.skill_id("haskell", intern=True) == first
+    assert index.skill_id("HASKELL") == first
+    assert index.canonical_name(first) == "Haskell"
+    assert len(index) == 2
+
+def test_ad_hoc_skills_match_by_key_without_growing_the_index():
+    index = SkillIndex({"Python": []})
+    assert index.skill_id("Elixir") == index.skill_id("elixir") == "elixir"
+    assert index.ids(["Elixir", "Python"]) == {"elixir", index.skill_id("python")}
+    assert len(index) == 1
+
+def test_compare_skills_matches_aliases():
+    matched, missing = compare_skills(["Postgres", "NodeJS"], ["PostgreSQL", "Node.js", "Redis"])
+    assert matched == ["Postgres", "NodeJS"]
+    assert missing == ["Redis"]
+
+def test_annotate_resume_stores_canonical_keys():
+    parsed = annotate_resume({"skills": [{"name": "Postgres"}, {"name": "postgresql"}, {"name": "React.js"}]})
+    assert parsed["skill_index"] == {"version": VOCAB_VERSION, "skills": ["postgresql", "react"]}
+    assert resume_skill_ids(parsed) == get_skill_index().ids(["PostgreSQL", "React"])
+
+def test_annotate_posting_splits_required_and_preferred():
+    parsed = annotate_posting(
+        {"required_skills": [{"name": "Golang"}], "preferred_skills": [{"name": "k8s"}]}
+    )
+    assert parsed["skill_index"]["required"] == ["go"]
+    assert parsed["skill_index"]["preferred"] == ["kubernetes"]
+
+def test_stale_stored_keys_are_ignored():
+    parsed = {"skills": [{"name": "Python"}], "skill_index": {"version": -1, "skills": ["java"]}}
+    assert stored_skill_ids(parsed, "skills") is None
+    assert resume_skill_ids(parsed) == get_skill_index().ids(["Python"])
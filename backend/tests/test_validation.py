@@ -0,0 +1,51 @@
+import pytest
+from core.validation import InvalidFieldsError, load_json, merge_repair, parse_document
+from models.posting import PostingParsedData
+from models.resume import ResumeParsedData
+
+def test_load_json_strips_fences_and_prose():
+    assert load_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert load_json('```\n{"a": 1}```') == {"a": 1}
+    assert load_json('Here you go: {"a": [1, 2]} Hope this helps.') == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        load_json("not json")
+
+def test_parse_document_coerces_common_deviations():
+    parsed = parse_document(ResumeParsedData, """{
+        "skills": ["Python", {"name": "SQL", "level": 3}],
+        "experiences": [{"title": "Dev", "duration": "2020-2023", "description": null, "achievements": "Shipped v2"}],
+        "metrics": null,
+        "soft_skills": "communication",
+        "keywords": [{"name": "fintech"}, 42]
+    }""")
+    assert [(s.name, s.level, s.source) for s in parsed.skills] == [("Python", "", ""), ("SQL", "3", "")]
+    assert parsed.experiences[0].description == ""
+    assert parsed.experiences[0].achievements == ["Shipped v2"]
+    assert parsed.metrics == []
+    assert parsed.soft_skills == ["communication"]
+    assert parsed.keywords == ["fintech", "42"]
+
+def test_parse_document_keeps_defaults_and_reports_missing_fields():
+    parsed = parse_document(
+        PostingParsedData,
+        '{"required_skills": [], "preferred_skills": [], "responsibilities": [], "culture_keywords": []}',
+    )
+    assert parsed.required_experience == []
+
+    with pytest.raises(InvalidFieldsError) as exc:
+        parse_document(
+            PostingParsedData,
+            '{"required_skills": [{"detail": {"x": 1}}], "responsibilities": [], "culture_keywords": []}',
+        )
+    assert exc.value.fields == ["required_skills", "preferred_skills"]
+    assert "responsibilities" in exc.value.data
+
+def test_merge_repair_takes_only_invalid_fields():
+    with pytest.raises(InvalidFieldsError) as exc:
+        parse_document(
+            PostingParsedData,
+            '{"required_skills": [], "preferred_skills": [], "responsibilities": ["Build"]}',
+        )
+    repaired = merge_repair(exc.value, '{"culture_keywords": ["Fast"], "responsibilities": ["Other"]}')
+    assert repaired.culture_keywords == ["Fast"]
+    assert repaired.responsibilities == ["Build"]